@@ -3,7 +3,7 @@ AI Crop Recommendation API with Profit-Based Ranking
 Integrates real AGMARKNET prices for profitability analysis
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context, send_file, url_for, has_request_context
 from flask_cors import CORS
 import requests
 import random
@@ -11,6 +11,15 @@ import os
 from dotenv import load_dotenv
 import logging
 import base64
+import json
+import re
+import uuid
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+
+import metrics
+import responses
+import tracing
+from src.utils.log_pipeline import configure_logging, log_payload
 
 # Load environment variables
 load_dotenv()
@@ -24,15 +33,27 @@ ALLOWED_ORIGINS = [
     'https://*.vercel.app'  # Allow all Vercel preview deployments
 ]
 
-CORS(app, origins=ALLOWED_ORIGINS, supports_credentials=True)
+CORS(app, origins=ALLOWED_ORIGINS, supports_credentials=True,
+     expose_headers=['X-Language', 'X-Request-ID', 'Server-Timing'])
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+configure_logging(context=lambda: {'request_id': tracing.request_id(),
+                                   'endpoint': request.endpoint if has_request_context() else None})
 logger = logging.getLogger(__name__)
 
+# Prometheus /metrics (no-op when prometheus-flask-exporter isn't installed)
+metrics.init_app(app)
+# Request ids and X-Debug-Timings breakdowns (only with TRACING_ENABLED=True)
+tracing.init_app(app)
+
 # Configuration
 OPENWEATHER_API_KEY = os.getenv('OPENWEATHER_API_KEY', 'demo_key')
-PRICE_API_URL = "http://127.0.0.1:5000/request"  # AgMarket scraper API
+PRICE_API_URL = os.getenv('PRICE_API_URL', "http://127.0.0.1:5000/request")  # AgMarket scraper API
+
+# Upstream base URLs (point them at benchmarks/fake_upstreams.py for offline load tests)
+NOMINATIM_URL = os.getenv('NOMINATIM_URL', "https://nominatim.openstreetmap.org")
+BIGDATACLOUD_URL = os.getenv('BIGDATACLOUD_URL', "https://api.bigdatacloud.net")
+OPENWEATHER_URL = os.getenv('OPENWEATHER_URL', "https://api.openweathermap.org")
 
 # ============================================================================
 # HELPER FUNCTIONS - LOCATION
@@ -43,15 +64,17 @@ def get_location_info(lat, lon):
     
     # Try Method 1: Nominatim (OpenStreetMap) - Most accurate for India
     try:
-        url = f"https://nominatim.openstreetmap.org/reverse?format=json&lat={lat}&lon={lon}&zoom=18&addressdetails=1"
+        url = f"{NOMINATIM_URL}/reverse?format=json&lat={lat}&lon={lon}&zoom=18&addressdetails=1"
         headers = {'User-Agent': 'CropRecommendationApp/1.0'}
-        response = requests.get(url, headers=headers, timeout=10)
+        with metrics.upstream('nominatim') as call:
+            response = requests.get(url, headers=headers, timeout=10)
+            call.outcome = 'ok' if response.status_code == 200 else 'error'
         
         if response.status_code == 200:
             data = response.json()
             if 'address' in data:
                 address = data['address']
-                logger.info(f"Nominatim response: {address}")
+                log_payload(logger, "Nominatim response", address)
                 
                 area = (address.get('village') or
                        address.get('suburb') or
@@ -81,12 +104,14 @@ def get_location_info(lat, lon):
     
     # Try Method 2: BigDataCloud (Free, accurate for India)
     try:
-        url = f"https://api.bigdatacloud.net/data/reverse-geocode-client?latitude={lat}&longitude={lon}&localityLanguage=en"
-        response = requests.get(url, timeout=10)
+        url = f"{BIGDATACLOUD_URL}/data/reverse-geocode-client?latitude={lat}&longitude={lon}&localityLanguage=en"
+        with metrics.upstream('bigdatacloud') as call:
+            response = requests.get(url, timeout=10)
+            call.outcome = 'ok' if response.status_code == 200 else 'error'
         
         if response.status_code == 200:
             data = response.json()
-            logger.info(f"BigDataCloud response: {data}")
+            log_payload(logger, "BigDataCloud response", data)
             
             area = (data.get('locality') or 
                    data.get('city') or 
@@ -136,8 +161,10 @@ def get_location_info(lat, lon):
 def get_weather_data(lat, lon):
     """Get weather data from OpenWeatherMap"""
     try:
-        url = f"https://api.openweathermap.org/data/2.5/weather?lat={lat}&lon={lon}&appid={OPENWEATHER_API_KEY}&units=metric"
-        response = requests.get(url, timeout=10)
+        url = f"{OPENWEATHER_URL}/data/2.5/weather?lat={lat}&lon={lon}&appid={OPENWEATHER_API_KEY}&units=metric"
+        with metrics.upstream('openweather') as call:
+            response = requests.get(url, timeout=10)
+            call.outcome = 'ok' if response.status_code == 200 else 'error'
         
         if response.status_code == 200:
             data = response.json()
@@ -433,7 +460,9 @@ def get_current_price(crop, state, district):
             "state": state,
             "market": district
         }
-        response = requests.get(PRICE_API_URL, params=params, timeout=10)
+        with metrics.upstream('agmarknet') as call:
+            response = requests.get(PRICE_API_URL, params=params, timeout=10)
+            call.outcome = 'ok' if response.status_code == 200 else 'error'
         
         if response.status_code == 200:
             data = response.json()
@@ -698,9 +727,9 @@ def generate_crop_predictions(state, district, soil_type="Mixed Soil"):
     season_crops = get_season_crops()[current_season]
     soil_suitable_crops = get_soil_suitable_crops(soil_type)
     
-    logger.info(f"Generating predictions - Season: {current_season}, Soil: {soil_type}")
-    logger.info(f"Season-appropriate crops: {season_crops}")
-    logger.info(f"Soil-suitable crops for {soil_type}: {soil_suitable_crops}")
+    logger.debug("Generating predictions - Season: %s, Soil: %s", current_season, soil_type)
+    log_payload(logger, "Season-appropriate crops", season_crops, logging.DEBUG)
+    log_payload(logger, f"Soil-suitable crops for {soil_type}", soil_suitable_crops, logging.DEBUG)
     
     # Get location-specific crop data
     state_crops = get_state_crop_data(state)
@@ -778,8 +807,8 @@ def generate_crop_predictions(state, district, soil_type="Mixed Soil"):
     
     # Log soil-matched crops
     soil_matched = [p["crop"] for p in predictions if p["soil_match"]]
-    logger.info(f"Filtered {len(predictions)} crops for {current_season} season with {soil_type}")
-    logger.info(f"Soil-matched crops in results: {soil_matched[:5]}")
+    logger.info("Filtered %d crops for %s season with %s (soil-matched: %s)",
+                len(predictions), current_season, soil_type, soil_matched[:5])
     
     return {
         "success": True,
@@ -801,6 +830,8 @@ def generate_crop_predictions(state, district, soil_type="Mixed Soil"):
 @app.after_request
 def add_no_cache_headers(response):
     """Add cache-control headers to all responses"""
+    if request.endpoint == 'chatbot_audio':
+        return response  # content-addressed audio is immutable and may be cached
     response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate, public, max-age=0'
     response.headers['Pragma'] = 'no-cache'
     response.headers['Expires'] = '0'
@@ -817,7 +848,10 @@ def health_check():
 
 @app.route('/predict', methods=['POST'])
 def predict_crop():
-    """Main prediction endpoint with profit-based ranking"""
+    """
+    Main prediction endpoint with profit-based ranking
+    ?schema=compact returns top_recommendations as indexes into all_crops
+    """
     try:
         data = request.get_json()
         latitude = data.get('latitude')
@@ -829,27 +863,32 @@ def predict_crop():
                 "error": "Missing latitude or longitude"
             }), 400
         
-        logger.info(f"Processing prediction request for: {latitude}, {longitude}")
+        logger.info("Processing prediction request for: %s, %s", latitude, longitude)
         
         # 1. Get location info
-        location_info = get_location_info(latitude, longitude)
+        with metrics.stage('geocoding'):
+            location_info = get_location_info(latitude, longitude)
         state = location_info.get('state', 'Unknown')
         district = location_info.get('district', 'Unknown')
         
-        logger.info(f"Location: {state}, {district}")
+        logger.info("Location: %s, %s", state, district)
         
         # 2. Get weather data
-        weather_data = get_weather_data(latitude, longitude)
+        with metrics.stage('weather'):
+            weather_data = get_weather_data(latitude, longitude)
         
         # 3. Generate soil data with district-aware soil type
-        soil_data = generate_soil_data(state, district, latitude, longitude)
+        with metrics.stage('soil'):
+            soil_data = generate_soil_data(state, district, latitude, longitude)
         soil_type = soil_data.get('soil_type', 'Mixed Soil')
         
         # 4. Get current season
         current_season = get_current_season()
         
         # 5. Generate crop predictions with SEASON, SOIL, and MARKET-BASED FILTERING
-        crop_predictions = generate_crop_predictions(state, district, soil_type)
+        # (includes the per-crop AGMARKNET price lookups, also timed as upstream calls)
+        with metrics.stage('scoring'):
+            crop_predictions = generate_crop_predictions(state, district, soil_type)
         
         # 6. Generate market summary
         market_data = {
@@ -863,7 +902,10 @@ def predict_crop():
             "season": current_season
         }
         
-        return jsonify({
+        if request.args.get('schema') == 'compact':
+            crop_predictions = responses.compact_predictions(crop_predictions)
+        
+        return responses.json_response({
             "success": True,
             "location": location_info,
             "weather_data": weather_data,
@@ -892,9 +934,203 @@ except Exception as e:
     CHATBOT_ENABLED = False
     logger.warning(f"Chatbot service not available: {e}")
 
+from chat_sessions import SessionExpired
+from chatbot_executor import ChatbotExecutor, ChatbotOverloaded
+
+# Chatbot calls run on their own bounded pool so they can't tie up every server thread
+chatbot_executor = ChatbotExecutor.from_env()
+CHATBOT_REQUEST_TIMEOUT = float(os.getenv('CHATBOT_REQUEST_TIMEOUT', '90'))
+
+def run_chatbot(fn, *args, **kwargs):
+    """Run a chatbot call on the bounded executor and wait for its result"""
+    return chatbot_executor.submit(fn, *args, **kwargs).result(timeout=CHATBOT_REQUEST_TIMEOUT)
+
+def chatbot_busy_response(error):
+    """429 with Retry-After when every chatbot slot is taken, 504 when a call ran too long"""
+    if isinstance(error, ChatbotOverloaded):
+        response = jsonify({
+            "success": False,
+            "error": "Chatbot is busy, please try again shortly",
+            "retry_after": error.retry_after
+        })
+        response.status_code = 429
+        response.headers['Retry-After'] = str(error.retry_after)
+        return response
+    return jsonify({
+        "success": False,
+        "error": f"Chatbot did not answer within {CHATBOT_REQUEST_TIMEOUT:.0f} seconds"
+    }), 504
+
+def build_chat_context(data):
+    """Farming context for the chatbot from the request's location data"""
+    return {
+        'state': data.get('state', 'Unknown'),
+        'district': data.get('district', 'Unknown'),
+        'soil_type': data.get('soil_type', 'Unknown'),
+        'season': data.get('season', 'Unknown'),
+        'top_crops': data.get('top_crops', []),
+        'temperature': data.get('temperature'),
+        'humidity': data.get('humidity')
+    }
+
+# Request fields that make up the chat context
+CHAT_CONTEXT_FIELDS = ('state', 'district', 'soil_type', 'season', 'top_crops', 'temperature', 'humidity')
+
+def chat_session_for(data):
+    """
+    Chat session for a request: the one named by session_id (context replaced
+    if the request sends context fields), a new one when 'session' is set, or
+    None for stateless requests. An unknown or expired session_id raises
+    SessionExpired; the client then starts over with its context
+    """
+    if not chatbot.sessions or not (data.get('session_id') or data.get('session')):
+        return None
+    
+    if not data.get('session_id'):
+        return chatbot.sessions.create(build_chat_context(data))
+    session = chatbot.sessions.get(data['session_id'])
+    if session is None:
+        # Expired or evicted; never swap in an empty context
+        raise SessionExpired(data['session_id'])
+    if any(field in data for field in CHAT_CONTEXT_FIELDS):
+        session.context = build_chat_context(data)
+    return session
+
+def sse_response(events):
+    """Wrap an iterator of (event, data) pairs in a text/event-stream response"""
+    def generate():
+        try:
+            for event, payload in events:
+                yield f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+        except Exception as e:
+            logger.error(f"Chatbot stream error: {str(e)}", exc_info=True)
+            error = {"success": False, "error": f"Server error: {str(e)}"}
+            yield f"event: error\ndata: {json.dumps(error)}\n\n"
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # stop reverse proxies from buffering the stream
+    })
+
+# Largest recording accepted as a raw or multipart upload
+VOICE_MAX_UPLOAD_BYTES = int(float(os.getenv('VOICE_MAX_UPLOAD_MB', '10')) * 1024 * 1024)
+
+def form_chat_data(fields):
+    """Chat fields from a form or query string (top_crops may repeat or be comma-separated)"""
+    data = fields.to_dict()
+    data['top_crops'] = [crop.strip() for value in fields.getlist('top_crops')
+                         for crop in value.split(',') if crop.strip()]
+    return data
+
+def read_audio_upload():
+    """
+    Recording from a multipart 'audio' file or the raw request body, read in
+    chunks up to VOICE_MAX_UPLOAD_BYTES; None when the upload is too large
+    """
+    if request.content_length and request.content_length > VOICE_MAX_UPLOAD_BYTES + 64 * 1024:
+        return None
+    
+    upload = request.files.get('audio')
+    stream = upload.stream if upload else request.stream
+    audio = bytearray()
+    while len(audio) <= VOICE_MAX_UPLOAD_BYTES:
+        chunk = stream.read(64 * 1024)
+        if not chunk:
+            return bytes(audio)
+        audio += chunk
+    return None
+
+def send_cached_audio(key, **kwargs):
+    """
+    send_file() for a TTS cache entry, or None on a miss, including a file
+    evicted (possibly by another worker) between the lookup and the open
+    """
+    path = chatbot.tts_cache.get_path(key)
+    if not path:
+        return None
+    try:
+        return send_file(path, mimetype='audio/mpeg', **kwargs)
+    except FileNotFoundError:
+        return None
+
+def voice_multipart_response(answer, audio=None):
+    """
+    multipart/mixed answer: a small JSON part with the texts, then the MP3 as an
+    audio/mpeg part, from bytes or streamed from an open TTS cache file
+    """
+    boundary = uuid.uuid4().hex
+    head = (f"--{boundary}\r\nContent-Type: application/json; charset=utf-8\r\n\r\n".encode()
+            + responses.dumps(answer) + b"\r\n")
+    tail = f"--{boundary}--\r\n".encode()
+    if audio is None:
+        return Response([head, tail], content_type=f'multipart/mixed; boundary={boundary}')
+
+    size = len(audio) if isinstance(audio, bytes) else os.fstat(audio.fileno()).st_size
+    audio_head = f"--{boundary}\r\nContent-Type: audio/mpeg\r\nContent-Length: {size}\r\n\r\n".encode()
+
+    def generate():
+        yield head + audio_head
+        if isinstance(audio, bytes):
+            yield audio
+        else:
+            for chunk in iter(lambda: audio.read(64 * 1024), b''):
+                yield chunk
+        yield b"\r\n" + tail
+
+    response = Response(generate(), content_type=f'multipart/mixed; boundary={boundary}')
+    response.content_length = len(head) + len(audio_head) + size + 2 + len(tail)
+    if not isinstance(audio, bytes):
+        response.call_on_close(audio.close)
+    return response
+
+def voice_binary_response():
+    """
+    /chatbot/voice for raw (audio/*, application/octet-stream) or multipart bodies:
+    answers multipart/mixed with the transcript and answer as a JSON part and the
+    MP3 itself as an audio/mpeg part (left out when no audio could be synthesized)
+    """
+    audio_content = read_audio_upload()
+    if audio_content is None:
+        return jsonify({
+            "success": False,
+            "error": f"Audio larger than {VOICE_MAX_UPLOAD_BYTES // (1024 * 1024)} MB"
+        }), 413
+    if not audio_content:
+        return jsonify({
+            "success": False,
+            "error": "No audio data provided"
+        }), 400
+    
+    # Context comes from the multipart form fields, or the query string for raw bodies
+    context = build_chat_context(form_chat_data(request.form if request.files else request.args))
+    logger.info(f"Processing binary voice query with context: {context['state']}, {context['district']}")
+    
+    # With the TTS cache the MP3 is streamed from disk rather than held in memory
+    audio_as_key = chatbot.tts_cache is not None
+    result = run_chatbot(chatbot.process_voice_query, audio_content, context, audio_as_key=audio_as_key)
+    if not result.get('success'):
+        return jsonify(result), 400
+    
+    answer = {
+        "success": True,
+        "user_text": result['user_text'],
+        "language": result['language'],
+        "response_text": result['response_text']
+    }
+    # None when the cached file was evicted (possibly by another worker) since synthesis
+    audio = chatbot.tts_cache.open(result['audio_key']) if result.get('audio_key') else None
+    if audio is None:
+        audio = result.get('audio_response')
+    if audio is None:
+        answer['tts_error'] = result.get('error', 'TTS unavailable')
+    
+    response = voice_multipart_response(answer, audio)
+    response.headers['X-Language'] = result['language']
+    return response
+
 @app.route('/chatbot/voice', methods=['POST'])
 def chatbot_voice():
-    """Handle voice input chatbot query"""
+    """Handle voice input chatbot query (base64 in JSON, or raw/multipart audio)"""
     if not CHATBOT_ENABLED:
         return jsonify({
             "success": False,
@@ -902,6 +1138,9 @@ def chatbot_voice():
         }), 503
     
     try:
+        if not request.is_json:
+            return voice_binary_response()
+        
         data = request.get_json()
         audio_base64 = data.get('audio')
         
@@ -921,20 +1160,15 @@ def chatbot_voice():
             }), 400
         
         # Build context from user's current location data
-        context = {
-            'state': data.get('state', 'Unknown'),
-            'district': data.get('district', 'Unknown'),
-            'soil_type': data.get('soil_type', 'Unknown'),
-            'season': data.get('season', 'Unknown'),
-            'top_crops': data.get('top_crops', []),
-            'temperature': data.get('temperature'),
-            'humidity': data.get('humidity')
-        }
+        context = build_chat_context(data)
         
         logger.info(f"Processing voice query with context: {context['state']}, {context['district']}")
         
+        # audio_delivery='url' returns a link to the cached MP3 instead of inline base64
+        audio_as_key = data.get('audio_delivery') == 'url' and chatbot.tts_cache is not None
+        
         # Process voice query
-        result = chatbot.process_voice_query(audio_content, context)
+        result = run_chatbot(chatbot.process_voice_query, audio_content, context, audio_as_key=audio_as_key)
         
         if not result.get('success'):
             return jsonify(result), 400
@@ -949,9 +1183,12 @@ def chatbot_voice():
             "user_text": result['user_text'],
             "language": result['language'],
             "response_text": result['response_text'],
-            "audio_response": audio_response_base64
+            "audio_response": audio_response_base64,
+            "audio_url": url_for('chatbot_audio', key=result['audio_key']) if result.get('audio_key') else None
         })
         
+    except (ChatbotOverloaded, FuturesTimeoutError) as e:
+        return chatbot_busy_response(e)
     except Exception as e:
         logger.error(f"Chatbot voice error: {str(e)}", exc_info=True)
         return jsonify({
@@ -959,6 +1196,60 @@ def chatbot_voice():
             "error": f"Server error: {str(e)}"
         }), 500
 
+@app.route('/chatbot/voice/stream', methods=['POST'])
+def chatbot_voice_stream():
+    """Handle voice query with sentence-by-sentence audio streamed over Server-Sent Events"""
+    if not CHATBOT_ENABLED:
+        return jsonify({
+            "success": False,
+            "error": "Chatbot service not configured. Please set up Google Cloud credentials and GEMINI_API_KEY."
+        }), 503
+    
+    try:
+        data = request.get_json()
+        audio_base64 = data.get('audio')
+        
+        if not audio_base64:
+            return jsonify({
+                "success": False,
+                "error": "No audio data provided"
+            }), 400
+        
+        try:
+            audio_content = base64.b64decode(audio_base64)
+        except Exception as e:
+            return jsonify({
+                "success": False,
+                "error": f"Invalid audio data: {str(e)}"
+            }), 400
+        
+        context = build_chat_context(data)
+        logger.info(f"Streaming voice query with context: {context['state']}, {context['district']}")
+        
+        audio_as_key = data.get('audio_delivery') == 'url' and chatbot.tts_cache is not None
+        return sse_response(chatbot_executor.stream(
+            chatbot.process_voice_query_stream(audio_content, context, audio_as_key=audio_as_key)))
+        
+    except ChatbotOverloaded as e:
+        return chatbot_busy_response(e)
+    except Exception as e:
+        logger.error(f"Chatbot voice stream error: {str(e)}", exc_info=True)
+        return jsonify({
+            "success": False,
+            "error": f"Server error: {str(e)}"
+        }), 500
+
+@app.route('/chatbot/audio/<key>', methods=['GET'])
+def chatbot_audio(key):
+    """Stream a synthesized answer from the TTS cache"""
+    if not CHATBOT_ENABLED or chatbot.tts_cache is None or not re.fullmatch(r'[0-9a-f]{64}', key):
+        return jsonify({"success": False, "error": "Audio not found"}), 404
+    
+    response = send_cached_audio(key, conditional=True, etag=key, max_age=7 * 24 * 3600)
+    if response is None:
+        return jsonify({"success": False, "error": "Audio not found"}), 404
+    return response
+
 @app.route('/chatbot/text', methods=['POST'])
 def chatbot_text():
     """Handle text-only chatbot query"""
@@ -978,24 +1269,29 @@ def chatbot_text():
                 "error": "No message provided"
             }), 400
         
-        # Build context
-        context = {
-            'state': data.get('state', 'Unknown'),
-            'district': data.get('district', 'Unknown'),
-            'soil_type': data.get('soil_type', 'Unknown'),
-            'season': data.get('season', 'Unknown'),
-            'top_crops': data.get('top_crops', []),
-            'temperature': data.get('temperature'),
-            'humidity': data.get('humidity')
-        }
+        # Build context (a session keeps it server-side between questions)
+        context = build_chat_context(data)
+        session = chat_session_for(data)
+        
+        # Stream tokens over Server-Sent Events when the client asks for it
+        if data.get('stream') or 'text/event-stream' in request.headers.get('Accept', ''):
+            return sse_response(chatbot_executor.stream(chatbot.stream_text_query(user_message, context, session)))
         
         logger.info(f"Processing text query: {user_message[:50]}...")
         
         # Process text query
-        result = chatbot.process_text_query(user_message, context)
+        result = run_chatbot(chatbot.process_text_query, user_message, context, session)
         
         return jsonify(result)
         
+    except SessionExpired:
+        return jsonify({
+            "success": False,
+            "error": "Chat session expired or unknown; resend the farm context with \"session\": true",
+            "session_expired": True
+        }), 410
+    except (ChatbotOverloaded, FuturesTimeoutError) as e:
+        return chatbot_busy_response(e)
     except Exception as e:
         logger.error(f"Chatbot text error: {str(e)}", exc_info=True)
         return jsonify({
@@ -1009,11 +1305,19 @@ def chatbot_status():
     return jsonify({
         "chatbot_enabled": CHATBOT_ENABLED,
         "services": {
-            "speech_to_text": chatbot.speech_client is not None if CHATBOT_ENABLED else False,
-            "text_to_speech": chatbot.tts_client is not None if CHATBOT_ENABLED else False,
+            "speech_to_text": chatbot.clients.available('speech') if CHATBOT_ENABLED else False,
+            "text_to_speech": chatbot.clients.available('tts') if CHATBOT_ENABLED else False,
             "ai_model": chatbot.model is not None if CHATBOT_ENABLED else False
         },
-        "supported_languages": list(chatbot.language_codes.keys()) if CHATBOT_ENABLED else []
+        "clients": chatbot.clients.status() if CHATBOT_ENABLED else {},
+        "supported_languages": list(chatbot.language_codes.keys()) if CHATBOT_ENABLED else [],
+        "tts_cache": chatbot.tts_cache.stats() if CHATBOT_ENABLED and chatbot.tts_cache else None,
+        "answer_cache": chatbot.answer_cache.stats() if CHATBOT_ENABLED and chatbot.answer_cache else None,
+        "faq_entries": len(chatbot.clients.peek('faq_index').entries) if CHATBOT_ENABLED and chatbot.clients.peek('faq_index') else 0,
+        "audio_preprocess": chatbot.audio_preprocessor.stats() if CHATBOT_ENABLED and chatbot.audio_preprocessor else None,
+        "sessions": chatbot.sessions.stats() if CHATBOT_ENABLED and chatbot.sessions else None,
+        "executor": chatbot_executor.stats(),
+        "quotas": chatbot.rate_governor.stats() if CHATBOT_ENABLED and chatbot.rate_governor else None
     })
 
 # ============================================================================
@@ -0,0 +1,218 @@
+"""
+Audio preparation before speech-to-text
+Decodes the recording to mono PCM at the STT sample rate, trims leading and
+trailing silence with an energy-based voice-activity detector, caps the
+duration and re-encodes, recording bytes saved and time spent per stage.
+WAV input is handled natively; WEBM/Opus and other codecs need ffmpeg, taken
+from PATH or else from the imageio-ffmpeg wheel (the deployed Python runtime
+has no system packages), and are passed through unchanged without it.
+"""
+
+import io
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+import wave
+from math import gcd
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# What browsers' MediaRecorder sends; used when the audio cannot be decoded
+PASSTHROUGH_ENCODING = 'WEBM_OPUS'
+PASSTHROUGH_SAMPLE_RATE = 48000
+
+def find_ffmpeg():
+    """ffmpeg on PATH, else the static build bundled with imageio-ffmpeg, else None"""
+    path = shutil.which('ffmpeg')
+    if path:
+        return path
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except (ImportError, RuntimeError):  # not installed / no binary for this platform
+        return None
+
+class AudioPreprocessor:
+    """Trims, downmixes, resamples and caps recordings for Google STT"""
+
+    def __init__(self, sample_rate=16000, max_seconds=55, frame_ms=30, padding_ms=300,
+                 min_speech_ms=90, output='ogg_opus', ffmpeg=None):
+        self.sample_rate = sample_rate
+        self.max_seconds = max_seconds  # synchronous recognize accepts up to 60 s
+        self.frame_ms = frame_ms
+        self.padding_ms = padding_ms    # kept around speech so word edges aren't clipped
+        self.min_speech_ms = min_speech_ms
+        self.output = output            # 'ogg_opus' (needs ffmpeg) or 'linear16'
+        self.ffmpeg = ffmpeg or find_ffmpeg()
+        self.lock = threading.Lock()
+        self.totals = {'recordings': 0, 'passthrough': 0, 'input_bytes': 0, 'output_bytes': 0,
+                       'trimmed_seconds': 0.0, 'decode_ms': 0.0, 'vad_ms': 0.0, 'encode_ms': 0.0}
+
+    @classmethod
+    def from_env(cls):
+        """Build from AUDIO_PREPROCESS_* settings (AUDIO_PREPROCESS_ENABLED=False disables it)"""
+        if os.getenv('AUDIO_PREPROCESS_ENABLED', 'True').lower() != 'true':
+            return None
+        preprocessor = cls(sample_rate=int(os.getenv('AUDIO_PREPROCESS_SAMPLE_RATE', '16000')),
+                           max_seconds=float(os.getenv('AUDIO_PREPROCESS_MAX_SECONDS', '55')),
+                           output=os.getenv('AUDIO_PREPROCESS_OUTPUT', 'ogg_opus'))
+        if preprocessor.ffmpeg is None:
+            logger.warning("ffmpeg not found (install it or imageio-ffmpeg): WEBM/Opus recordings "
+                           "will reach speech-to-text without trimming or resampling")
+        else:
+            logger.info(f"Audio preprocessing with {preprocessor.ffmpeg}")
+        return preprocessor
+
+    def process(self, audio_content):
+        """
+        Prepared audio as {'content', 'encoding', 'sample_rate', 'stats'}; the
+        encoding is a RecognitionConfig.AudioEncoding name
+        """
+        stats = {'input_bytes': len(audio_content)}
+        start = time.perf_counter()
+        samples = self.decode(audio_content)
+        stats['decode_ms'] = round((time.perf_counter() - start) * 1000, 2)
+
+        if samples is None:
+            stats.update(output_bytes=len(audio_content), bytes_saved=0, passthrough=True)
+            self._record(stats)
+            return {'content': audio_content, 'encoding': PASSTHROUGH_ENCODING,
+                    'sample_rate': PASSTHROUGH_SAMPLE_RATE, 'stats': stats}
+
+        start = time.perf_counter()
+        begin, end = self.speech_bounds(samples)
+        end = min(end, begin + int(self.max_seconds * self.sample_rate))
+        trimmed = samples[begin:end]
+        stats['vad_ms'] = round((time.perf_counter() - start) * 1000, 2)
+        stats['input_seconds'] = round(len(samples) / self.sample_rate, 2)
+        stats['output_seconds'] = round(len(trimmed) / self.sample_rate, 2)
+
+        start = time.perf_counter()
+        content, encoding = self.encode(trimmed)
+        stats['encode_ms'] = round((time.perf_counter() - start) * 1000, 2)
+
+        # Nothing trimmed and no smaller after re-encoding: the original is better
+        if len(trimmed) == len(samples) and len(content) >= len(audio_content) and not is_wav(audio_content):
+            stats.update(output_bytes=len(audio_content), bytes_saved=0, passthrough=True)
+            self._record(stats)
+            return {'content': audio_content, 'encoding': PASSTHROUGH_ENCODING,
+                    'sample_rate': PASSTHROUGH_SAMPLE_RATE, 'stats': stats}
+
+        stats.update(output_bytes=len(content), bytes_saved=len(audio_content) - len(content),
+                     encoding=encoding)
+        self._record(stats)
+        return {'content': content, 'encoding': encoding, 'sample_rate': self.sample_rate, 'stats': stats}
+
+    def decode(self, audio_content):
+        """Mono float32 samples at self.sample_rate, or None when the format can't be decoded"""
+        try:
+            if is_wav(audio_content):
+                samples, rate = read_wav(audio_content)
+                return to_mono_rate(samples, rate, self.sample_rate)
+            if self.ffmpeg:
+                pcm = self._ffmpeg(['-i', 'pipe:0', '-ac', '1', '-ar', str(self.sample_rate),
+                                    '-f', 's16le', 'pipe:1'], audio_content)
+                return np.frombuffer(pcm, dtype='<i2').astype(np.float32) / 32768
+        except Exception as e:
+            logger.warning(f"Audio decode failed, sending recording unchanged: {e}")
+        return None
+
+    def speech_bounds(self, samples):
+        """
+        (start, end) sample indices of the speech, padded; frames count as speech
+        when their energy is well above the recording's own noise floor
+        """
+        frame = int(self.sample_rate * self.frame_ms / 1000)
+        count = len(samples) // frame
+        if count < 3:
+            return 0, len(samples)
+
+        energy = np.mean(samples[:count * frame].reshape(count, frame) ** 2, axis=1)
+        noise_floor = np.percentile(energy, 10)
+        threshold = max(noise_floor * 10, 1e-5)  # 10 dB over the floor, -50 dBFS at least
+        voiced = energy > threshold
+
+        # Ignore clicks: speech needs min_speech_ms of consecutive voiced frames
+        run = max(int(self.min_speech_ms / self.frame_ms), 1)
+        runs = np.convolve(voiced.astype(np.int32), np.ones(run, dtype=np.int32), mode='valid') >= run
+        if not runs.any():
+            return 0, len(samples)  # no clear speech: let STT decide
+        first = int(np.argmax(runs))
+        last = len(runs) - 1 - int(np.argmax(runs[::-1])) + run - 1
+
+        padding = int(self.sample_rate * self.padding_ms / 1000)
+        return max(first * frame - padding, 0), min((last + 1) * frame + padding, len(samples))
+
+    def encode(self, samples):
+        """(bytes, encoding name) for the trimmed samples"""
+        pcm = (np.clip(samples, -1, 1) * 32767).astype('<i2').tobytes()
+        if self.output == 'ogg_opus' and self.ffmpeg:
+            try:
+                return self._ffmpeg(['-f', 's16le', '-ar', str(self.sample_rate), '-ac', '1', '-i', 'pipe:0',
+                                     '-c:a', 'libopus', '-b:a', '24k', '-f', 'ogg', 'pipe:1'], pcm), 'OGG_OPUS'
+            except Exception as e:
+                logger.warning(f"Opus encode failed, sending LINEAR16: {e}")
+        return pcm, 'LINEAR16'
+
+    def _ffmpeg(self, args, data):
+        result = subprocess.run([self.ffmpeg, '-hide_banner', '-loglevel', 'error', *args],
+                                input=data, capture_output=True, timeout=30, check=True)
+        return result.stdout
+
+    def _record(self, stats):
+        with self.lock:
+            totals = self.totals
+            totals['recordings'] += 1
+            totals['passthrough'] += bool(stats.get('passthrough'))
+            totals['input_bytes'] += stats['input_bytes']
+            totals['output_bytes'] += stats['output_bytes']
+            totals['trimmed_seconds'] += stats.get('input_seconds', 0) - stats.get('output_seconds', 0)
+            for stage in ('decode_ms', 'vad_ms', 'encode_ms'):
+                totals[stage] += stats.get(stage, 0)
+
+    def stats(self):
+        with self.lock:
+            totals = dict(self.totals)
+        count = max(totals['recordings'], 1)
+        return {
+            'recordings': totals['recordings'],
+            'passthrough': totals['passthrough'],
+            'bytes_saved': totals['input_bytes'] - totals['output_bytes'],
+            'trimmed_seconds': round(totals['trimmed_seconds'], 1),
+            'mean_decode_ms': round(totals['decode_ms'] / count, 2),
+            'mean_vad_ms': round(totals['vad_ms'] / count, 2),
+            'mean_encode_ms': round(totals['encode_ms'] / count, 2),
+            'ffmpeg': self.ffmpeg is not None
+        }
+
+def is_wav(audio_content):
+    return audio_content[:4] == b'RIFF' and audio_content[8:12] == b'WAVE'
+
+def read_wav(audio_content):
+    """(float32 samples shaped (frames, channels), sample rate) from PCM WAV bytes"""
+    with wave.open(io.BytesIO(audio_content)) as wav:
+        channels, width, rate = wav.getnchannels(), wav.getsampwidth(), wav.getframerate()
+        raw = wav.readframes(wav.getnframes())
+    if width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 2:
+        samples = np.frombuffer(raw, dtype='<i2').astype(np.float32) / 32768
+    elif width == 4:
+        samples = np.frombuffer(raw, dtype='<i4').astype(np.float32) / 2147483648
+    else:
+        raise ValueError(f"Unsupported WAV sample width: {width}")
+    return samples.reshape(-1, channels), rate
+
+def to_mono_rate(samples, rate, target_rate):
+    """Downmix (frames, channels) samples and resample with a polyphase filter"""
+    mono = samples.mean(axis=1) if samples.ndim == 2 else samples
+    if rate != target_rate:
+        from scipy.signal import resample_poly  # scipy.signal is slow to import
+        factor = gcd(rate, target_rate)
+        mono = resample_poly(mono, target_rate // factor, rate // factor)
+    return mono.astype(np.float32)
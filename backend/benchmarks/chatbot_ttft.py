@@ -0,0 +1,111 @@
+"""
+Time-to-first-token of /chatbot/text, blocking JSON versus SSE streaming
+
+Boots the Flask app on a local port with the chatbot pointed at the fake LLM
+server, then times each mode over real HTTP: when the first answer byte
+reaches the client (the whole JSON body for blocking requests, the first
+``token`` event when streaming) and when the response completes.
+
+Usage (from backend/):
+    python -m benchmarks.chatbot_ttft
+    python -m benchmarks.chatbot_ttft --requests 20 --first-token-ms 600 --token-ms 50
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import requests
+from werkzeug.serving import make_server
+
+from benchmarks.fake_llm import start_fake_llm
+
+QUESTION = {
+    'message': 'Which crop should I grow on black soil this Kharif season?',
+    'state': 'Maharashtra', 'district': 'Nagpur', 'soil_type': 'Black',
+    'season': 'Kharif', 'top_crops': ['Cotton', 'Soybean'], 'temperature': 29, 'humidity': 70
+}
+
+
+def start_app():
+    # Import after GROQ_* are set so the chatbot client targets the fake server
+    from app import app
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def time_blocking(url: str) -> dict:
+    start = time.perf_counter()
+    response = requests.post(url, json=QUESTION, timeout=60)
+    elapsed = time.perf_counter() - start
+    response.raise_for_status()
+    return {'first_token': elapsed, 'total': elapsed}
+
+
+def time_streaming(url: str) -> dict:
+    start = time.perf_counter()
+    first_token = None
+    with requests.post(url, json={**QUESTION, 'stream': True}, stream=True, timeout=60,
+                       headers={'Accept': 'text/event-stream'}) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if first_token is None and line.startswith(b'event: token'):
+                first_token = time.perf_counter() - start
+            elif line.startswith(b'event: done'):
+                break
+    return {'first_token': first_token, 'total': time.perf_counter() - start}
+
+
+def summarize(samples: list) -> dict:
+    summary = {}
+    for key in ('first_token', 'total'):
+        values = np.array([s[key] for s in samples]) * 1000
+        summary[key] = {'p50_ms': round(float(np.percentile(values, 50)), 1),
+                        'p95_ms': round(float(np.percentile(values, 95)), 1)}
+    return summary
+
+
+def run(n_requests: int = 10, first_token_ms: float = 800, token_ms: float = 40) -> dict:
+    llm = start_fake_llm(0, first_token_ms, token_ms)
+    os.environ['GROQ_API_KEY'] = 'fake-key'
+    os.environ['GROQ_BASE_URL'] = f"http://127.0.0.1:{llm.server_port}"
+    # Every request must reach the LLM (not the answer cache or the FAQ) unpaced by the quota governor
+    os.environ['ANSWER_CACHE_MAX_ENTRIES'] = '0'
+    os.environ['FAQ_MIN_SCORE'] = '0'
+    os.environ['RATE_LIMIT_ENABLED'] = 'False'
+
+    server = start_app()
+    url = f"http://127.0.0.1:{server.server_port}/chatbot/text"
+    try:
+        time_streaming(url)  # warm up connections and language detection
+        return {
+            'fake_llm': {'first_token_ms': first_token_ms, 'token_ms': token_ms},
+            'blocking': summarize([time_blocking(url) for _ in range(n_requests)]),
+            'streaming': summarize([time_streaming(url) for _ in range(n_requests)])
+        }
+    finally:
+        server.shutdown()
+        llm.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--requests', type=int, default=10)
+    parser.add_argument('--first-token-ms', type=float, default=800)
+    parser.add_argument('--token-ms', type=float, default=40)
+    parser.add_argument('--json', help="Also write results to this file")
+    args = parser.parse_args()
+
+    results = run(args.requests, args.first_token_ms, args.token_ms)
+    print(f"{'mode':<12}{'TTFT p50':>10}{'TTFT p95':>10}{'total p50':>11}{'total p95':>11}")
+    for mode in ('blocking', 'streaming'):
+        r = results[mode]
+        print(f"{mode:<12}{r['first_token']['p50_ms']:>8.0f}ms{r['first_token']['p95_ms']:>8.0f}ms"
+              f"{r['total']['p50_ms']:>9.0f}ms{r['total']['p95_ms']:>9.0f}ms")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
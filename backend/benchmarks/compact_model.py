@@ -0,0 +1,126 @@
+"""
+Compare the scikit-learn crop forest with its compact exports
+
+Reports holdout accuracy (and agreement with the sklearn model), artifact
+size, in-memory size, load time and single-row latency for each variant.
+
+Usage (from backend/):
+    python -m benchmarks.compact_model
+    python -m benchmarks.compact_model --model models/enhanced.pkl --json results.json
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import warnings
+
+import joblib
+import numpy as np
+
+from src.ml import EnhancedCropRecommendationModel
+from src.ml.compact import CompactForest, export_compact
+
+VARIANTS = [
+    # name, leaf dtype, max trees, prune tolerance
+    ('compact-uint16', 'uint16', None, 0.0),
+    ('compact-uint8', 'uint8', None, 0.0),
+    ('compact-uint8-pruned', 'uint8', None, 0.05),
+    ('compact-uint8-100trees', 'uint8', 100, 0.05),
+]
+
+
+def sklearn_nbytes(forest) -> int:
+    """Node table and value arrays held by every tree of a fitted forest"""
+    total = 0
+    for estimator in forest.estimators_:
+        state = estimator.tree_.__getstate__()
+        total += state['nodes'].nbytes + state['values'].nbytes
+    return total
+
+
+def time_load(loader, path: str, repeats: int = 3) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        loader(path)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def row_latency_ms(model, X: np.ndarray, rows: int = 200) -> float:
+    timings = []
+    for i in range(min(rows, len(X))):
+        start = time.perf_counter()
+        model.predict_proba(X[i:i + 1])
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000)
+
+
+def run(model_path: str = None, holdout_rows: int = 5000) -> list:
+    workdir = tempfile.mkdtemp(prefix='compact-bench-')
+    wrapper = EnhancedCropRecommendationModel(model_path or os.path.join(workdir, 'model.pkl'))
+    forest = wrapper.model
+    sklearn_path = wrapper.model_path
+
+    # Different seed from training so the holdout rows are unseen
+    holdout = wrapper.generate_enhanced_training_data(holdout_rows, random_state=2024)
+    X, y = holdout['features'], holdout['labels']
+    reference = forest.predict(X)
+
+    results = [{
+        'variant': 'sklearn',
+        'accuracy': float(np.mean(reference == y)),
+        'agreement': 1.0,
+        'artifact_bytes': os.path.getsize(sklearn_path),
+        'memory_bytes': sklearn_nbytes(forest),
+        'load_seconds': time_load(joblib.load, sklearn_path),
+        'row_latency_ms': row_latency_ms(forest, X)
+    }]
+
+    for name, leaf_dtype, max_trees, tolerance in VARIANTS:
+        path = os.path.join(workdir, f'{name}.npz')
+        stats = export_compact(forest, path, leaf_dtype, max_trees, tolerance)
+        compact = CompactForest.load(path)
+        predicted = compact.predict(X)
+        results.append({
+            'variant': name,
+            'accuracy': float(np.mean(predicted == y)),
+            'agreement': float(np.mean(predicted == reference)),
+            'artifact_bytes': os.path.getsize(path),
+            'memory_bytes': compact.nbytes,
+            'load_seconds': time_load(CompactForest.load, path),
+            'row_latency_ms': row_latency_ms(compact, X),
+            'nodes': stats['nodes'],
+            'original_nodes': stats['original_nodes']
+        })
+
+    return results
+
+
+def print_table(results: list):
+    base = results[0]
+    print(f"{'variant':<26}{'acc':>8}{'Δacc':>8}{'agree':>8}{'artifact':>11}"
+          f"{'memory':>11}{'load ms':>9}{'row ms':>8}")
+    for r in results:
+        print(f"{r['variant']:<26}{r['accuracy']:>8.4f}{r['accuracy'] - base['accuracy']:>+8.4f}"
+              f"{r['agreement']:>8.4f}{r['artifact_bytes'] / 1e6:>9.2f}MB"
+              f"{r['memory_bytes'] / 1e6:>9.2f}MB{r['load_seconds'] * 1000:>9.1f}"
+              f"{r['row_latency_ms']:>8.3f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--model', help="Fitted 10-feature forest (default: train a fresh one)")
+    parser.add_argument('--rows', type=int, default=5000, help="Holdout rows")
+    parser.add_argument('--json', help="Also write results to this file")
+    args = parser.parse_args()
+
+    # sklearn warns on every row about missing feature names
+    warnings.filterwarnings('ignore', category=UserWarning)
+    results = run(args.model, args.rows)
+    print_table(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
@@ -0,0 +1,24 @@
+"""
+app:app wired to benchmarks.fake_upstreams for load tests
+
+The flat backend reaches every HTTP upstream through base-URL variables
+(see fake_upstreams.upstream_env), but Google Speech-to-Text and
+Text-to-Speech are gRPC clients. This module imports the real app and puts
+the fake server's RemoteSpeechClient / RemoteTTSClient into the chatbot's
+client pool when GOOGLE_CLOUD_FAKE_URL is set, so the serving code never
+imports benchmarks/.
+
+Usage (from backend/):
+    GOOGLE_CLOUD_FAKE_URL=http://127.0.0.1:8090/google gunicorn benchmarks.fake_app:app
+"""
+
+import os
+
+import app as backend
+from benchmarks.fake_upstreams import RemoteSpeechClient, RemoteTTSClient
+
+app = backend.app
+
+if backend.CHATBOT_ENABLED and os.getenv('GOOGLE_CLOUD_FAKE_URL'):
+    backend.chatbot.clients.set('speech', RemoteSpeechClient(os.getenv('GOOGLE_CLOUD_FAKE_URL')))
+    backend.chatbot.clients.set('tts', RemoteTTSClient(os.getenv('GOOGLE_CLOUD_FAKE_URL')))
@@ -0,0 +1,108 @@
+"""
+Local stand-in for the Groq chat completions API
+
+Serves ``POST /openai/v1/chat/completions`` with a canned answer, both as a
+single JSON completion and as a ``stream=True`` Server-Sent Events stream,
+with configurable time-to-first-token and per-token delay. Point the chatbot
+at it with ``GROQ_BASE_URL=http://127.0.0.1:<port>`` (the Groq SDK reads that
+variable) and any non-empty ``GROQ_API_KEY``.
+
+Usage (from backend/):
+    python -m benchmarks.fake_llm --port 8089 --first-token-ms 800 --token-ms 40
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ANSWER = ("For black soil in Kharif, cotton and soybean do well. Sow after the first "
+          "70-100 mm of monsoon rain, keep 60 cm row spacing and apply 25 kg/ha of "
+          "nitrogen at sowing. Watch for pink bollworm from 45 days after sowing.")
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    first_token_delay = 0.8
+    token_delay = 0.04
+    answer = ANSWER
+
+    def log_message(self, format, *args):
+        pass
+
+    def _tokens(self, max_tokens: int):
+        # Roughly one token per word, keeping the separating spaces
+        words = self.answer.split(' ')
+        return [w if i == 0 else ' ' + w for i, w in enumerate(words)][:max_tokens]
+
+    def do_POST(self):
+        if not self.path.endswith('/chat/completions'):
+            self.send_error(404)
+            return
+
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        model = body.get('model', 'fake-model')
+        tokens = self._tokens(body.get('max_tokens') or 300)
+        created = int(time.time())
+
+        if body.get('stream'):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.end_headers()
+            time.sleep(self.first_token_delay)
+            for i, token in enumerate(tokens):
+                if i:
+                    time.sleep(self.token_delay)
+                self._write_chunk(model, created, {'content': token}, None)
+            self._write_chunk(model, created, {}, 'stop')
+            self.wfile.write(b'data: [DONE]\n\n')
+            self.wfile.flush()
+            return
+
+        time.sleep(self.first_token_delay + self.token_delay * max(len(tokens) - 1, 0))
+        payload = json.dumps({
+            'id': 'chatcmpl-fake', 'object': 'chat.completion', 'created': created, 'model': model,
+            'choices': [{'index': 0, 'finish_reason': 'stop',
+                         'message': {'role': 'assistant', 'content': ''.join(tokens)}}],
+            'usage': {'prompt_tokens': 0, 'completion_tokens': len(tokens), 'total_tokens': len(tokens)}
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _write_chunk(self, model, created, delta, finish_reason):
+        chunk = {
+            'id': 'chatcmpl-fake', 'object': 'chat.completion.chunk', 'created': created, 'model': model,
+            'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}]
+        }
+        self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        self.wfile.flush()
+
+
+def start_fake_llm(port: int = 0, first_token_ms: float = 800, token_ms: float = 40) -> ThreadingHTTPServer:
+    """Start the fake server on a background thread; ``server.server_port`` has the bound port"""
+    handler = type('ConfiguredFakeLLMHandler', (FakeLLMHandler,), {
+        'first_token_delay': first_token_ms / 1000,
+        'token_delay': token_ms / 1000
+    })
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--first-token-ms', type=float, default=800)
+    parser.add_argument('--token-ms', type=float, default=40)
+    args = parser.parse_args()
+
+    server = start_fake_llm(args.port, args.first_token_ms, args.token_ms)
+    print(f"Fake LLM listening on http://127.0.0.1:{server.server_port}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
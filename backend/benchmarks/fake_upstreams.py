@@ -0,0 +1,310 @@
+"""
+Local stand-ins for every upstream the backend calls
+
+One HTTP server mimics the response shapes of Nominatim, BigDataCloud,
+OpenWeatherMap, the AGMARKNET scraper, data.gov.in, SoilGrids, Bhuvan, the
+Groq chat completions API and (through RemoteSpeechClient/RemoteTTSClient)
+Google Speech-to-Text and Text-to-Speech. Each service has its own latency
+distribution (log-normal around a median), error rate and payload padding,
+drawn from a seeded generator so runs are repeatable.
+
+Point the backend at it with the variables printed by --print-env, e.g.
+    OPENWEATHER_URL=http://127.0.0.1:8090/openweather
+    GROQ_BASE_URL=http://127.0.0.1:8090/groq  GROQ_API_KEY=fake
+    GOOGLE_CLOUD_FAKE_URL=http://127.0.0.1:8090/google
+
+Usage (from backend/):
+    python -m benchmarks.fake_upstreams --port 8090 --print-env
+    python -m benchmarks.fake_upstreams --latency-ms 80 --sigma 0.6 --error-rate 0.02
+    python -m benchmarks.fake_upstreams --profile profile.json
+
+A profile is JSON with per-service overrides of the defaults, e.g.
+    {"openweather": {"latency_ms": 250, "error_rate": 0.1},
+     "groq": {"first_token_ms": 900, "token_ms": 45, "error_status": 429}}
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from benchmarks.fake_llm import FakeLLMHandler
+
+SERVICES = ['nominatim', 'bigdatacloud', 'openweather', 'agmarknet', 'datagov', 'soilgrids',
+            'bhuvan', 'groq', 'google_stt', 'google_tts']
+
+DEFAULT_PROFILE = {
+    'latency_ms': 50,     # median response time
+    'sigma': 0.5,         # log-normal spread (0 = fixed latency)
+    'error_rate': 0.0,    # share of requests answered with error_status
+    'error_status': 503,
+    'payload_kb': 0,      # pad JSON bodies (or audio) to at least this size
+}
+
+# (lat, lon, village, district, state) for deterministic reverse geocoding
+PLACES = [
+    (21.15, 79.09, 'Wadi', 'Nagpur', 'Maharashtra'),
+    (30.90, 75.85, 'Dugri', 'Ludhiana', 'Punjab'),
+    (17.39, 78.49, 'Shamshabad', 'Rangareddy', 'Telangana'),
+    (26.85, 80.95, 'Chinhat', 'Lucknow', 'Uttar Pradesh'),
+    (23.02, 72.57, 'Sanand', 'Ahmedabad', 'Gujarat'),
+    (12.97, 77.59, 'Hebbal', 'Bengaluru Urban', 'Karnataka'),
+]
+
+PRICES = {'rice': 2300, 'wheat': 2275, 'cotton': 7020, 'maize': 2090, 'soybean': 4600,
+          'sugarcane': 340, 'groundnut': 6370, 'mustard': 5650, 'chickpea': 5440}
+
+
+def nearest_place(query):
+    try:
+        lat = float((query.get('lat') or query.get('latitude'))[0])
+        lon = float((query.get('lon') or query.get('longitude'))[0])
+    except (TypeError, ValueError):
+        return PLACES[0]
+    return min(PLACES, key=lambda p: (p[0] - lat) ** 2 + (p[1] - lon) ** 2)
+
+
+class FakeUpstreamHandler(FakeLLMHandler):
+    """Routes /<service>/... to a fake of that service; /groq/... is the fake LLM"""
+    profiles = {name: dict(DEFAULT_PROFILE) for name in SERVICES}
+    rng = random.Random(0)
+    rng_lock = threading.Lock()
+    counts = {name: 0 for name in SERVICES}
+
+    def _service(self):
+        return self.path.lstrip('/').split('/', 1)[0]
+
+    def _delay_or_error(self, service):
+        """Sleep for this request's latency; True when it should fail instead"""
+        profile = self.profiles[service]
+        with self.rng_lock:
+            self.counts[service] += 1
+            latency = profile['latency_ms'] * math.exp(self.rng.gauss(0, profile['sigma'])) if profile['sigma'] \
+                else profile['latency_ms']
+            failed = self.rng.random() < profile['error_rate']
+        time.sleep(latency / 1000)
+        if failed:
+            self.send_response(profile['error_status'])
+            if profile['error_status'] == 429:
+                self.send_header('Retry-After', '2')
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(json.dumps({'error': f'fake {service} failure'}).encode())
+        return failed
+
+    def _json(self, service, payload):
+        padding = self.profiles[service]['payload_kb'] * 1024
+        body = json.dumps(payload).encode()
+        if len(body) < padding and isinstance(payload, dict):
+            payload['_padding'] = 'x' * (padding - len(body))
+            body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        service = self._service()
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        route = getattr(self, f'_get_{service}', None)
+        if service not in self.profiles or route is None:
+            self.send_error(404)
+            return
+        if not self._delay_or_error(service):
+            self._json(service, route(url.path, query))
+
+    def do_POST(self):
+        service = self._service()
+        if service == 'groq':
+            # The fake LLM has its own token timing; only errors are added here
+            profile = self.profiles['groq']
+            self.first_token_delay = profile.get('first_token_ms', 800) / 1000
+            self.token_delay = profile.get('token_ms', 40) / 1000
+            with self.rng_lock:
+                self.counts['groq'] += 1
+                failed = self.rng.random() < profile['error_rate']
+            if failed:
+                self.send_response(profile['error_status'])
+                if profile['error_status'] == 429:
+                    self.send_header('Retry-After', '2')
+                self.end_headers()
+                return
+            super().do_POST()
+            return
+
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.path.startswith('/google/speech'):
+            if not self._delay_or_error('google_stt'):
+                self._json('google_stt', {'transcript': 'कपास की बुवाई कब करें?', 'language_code': 'hi-IN',
+                                          'audio_bytes': len(body)})
+        elif self.path.startswith('/google/tts'):
+            if not self._delay_or_error('google_tts'):
+                audio = b'\xff\xf3' * max(self.profiles['google_tts']['payload_kb'] * 512, 10 * 1024)
+                self.send_response(200)
+                self.send_header('Content-Type', 'audio/mpeg')
+                self.send_header('Content-Length', str(len(audio)))
+                self.end_headers()
+                self.wfile.write(audio)
+        else:
+            self.send_error(404)
+
+    def _get_nominatim(self, path, query):
+        _, _, village, district, state = nearest_place(query)
+        return {'place_id': 1, 'display_name': f"{village}, {district}, {state}, India",
+                'address': {'village': village, 'state_district': district, 'state': state,
+                            'country': 'India', 'country_code': 'in'}}
+
+    def _get_bigdatacloud(self, path, query):
+        _, _, village, district, state = nearest_place(query)
+        return {'locality': village, 'city': district, 'principalSubdivision': state, 'countryName': 'India',
+                'localityInfo': {'administrative': [
+                    {'adminLevel': 2, 'name': state}, {'adminLevel': 4, 'name': district}]}}
+
+    def _get_openweather(self, path, query):
+        lat = float(query.get('lat', ['21'])[0])
+        temperature = round(38 - abs(lat - 10) * 0.5, 1)
+        return {'main': {'temp': temperature, 'feels_like': temperature + 1.5, 'humidity': 62, 'pressure': 1009},
+                'wind': {'speed': 3.4}, 'clouds': {'all': 40}, 'visibility': 8000, 'dt': int(time.time()),
+                'weather': [{'main': 'Clouds', 'description': 'scattered clouds'}]}
+
+    def _get_agmarknet(self, path, query):
+        commodity = query.get('commodity', ['rice'])[0]
+        price = PRICES.get(commodity.lower(), 3000)
+        return [{'Commodity': commodity, 'Market': query.get('market', ['Unknown'])[0],
+                 'Min Price': f"{int(price * 0.9):,}", 'Max Price': f"{int(price * 1.1):,}",
+                 'Modal Price': f"{price:,}", 'Price Date': time.strftime('%d %b %Y')}]
+
+    def _get_datagov(self, path, query):
+        state = query.get('filters[state]', ['Maharashtra'])[0]
+        records = [{'state': state, 'district': 'Nagpur', 'market': 'Nagpur', 'commodity': crop.title(),
+                    'min_price': str(int(price * 0.9)), 'max_price': str(int(price * 1.1)),
+                    'modal_price': str(price), 'arrival_date': time.strftime('%d/%m/%Y')}
+                   for crop, price in PRICES.items()]
+        return {'status': 'ok', 'total': len(records), 'count': len(records), 'records': records}
+
+    def _get_soilgrids(self, path, query):
+        prop = query.get('property', ['phh2o'])[0]
+        value = {'phh2o': 68, 'nitrogen': 120, 'soc': 95, 'sand': 380, 'clay': 310, 'silt': 310}.get(prop, 100)
+        return {'type': 'Feature', 'properties': {'layers': [
+            {'name': prop, 'depths': [{'label': '0-5cm', 'values': {'mean': value}}]}]}}
+
+    def _get_bhuvan(self, path, query):
+        return {'district': query.get('district', ['Unknown'])[0],
+                'lulc': {'agriculture': 61.2, 'forest': 12.4, 'built_up': 8.1, 'water': 3.3, 'other': 15.0}}
+
+
+class FakeUpstreamError(Exception):
+    """Non-200 answer from a fake Google endpoint (status_code mirrors the API error)"""
+
+    def __init__(self, status_code):
+        super().__init__(f"Fake upstream returned {status_code}")
+        self.status_code = status_code
+        self.code = status_code
+
+
+class RemoteSpeechClient:
+    """Speech-to-Text client shape backed by the fake server's /google/speech route"""
+
+    def __init__(self, base_url):
+        self.url = f"{base_url.rstrip('/')}/speech:recognize"
+        self.session = requests.Session()
+
+    def recognize(self, config, audio, timeout=None, **kwargs):
+        response = self.session.post(self.url, data=audio.content, timeout=timeout)
+        if response.status_code != 200:
+            raise FakeUpstreamError(response.status_code)
+        data = response.json()
+        alternative = SimpleNamespace(transcript=data['transcript'])
+        return SimpleNamespace(results=[SimpleNamespace(alternatives=[alternative],
+                                                        language_code=data['language_code'])])
+
+
+class RemoteTTSClient:
+    """Text-to-Speech client shape backed by the fake server's /google/tts route"""
+
+    def __init__(self, base_url):
+        self.url = f"{base_url.rstrip('/')}/tts:synthesize"
+        self.session = requests.Session()
+
+    def synthesize_speech(self, input, voice, audio_config, timeout=None, **kwargs):
+        response = self.session.post(self.url, json={'text': input.text, 'voice': voice.name}, timeout=timeout)
+        if response.status_code != 200:
+            raise FakeUpstreamError(response.status_code)
+        return SimpleNamespace(audio_content=response.content)
+
+
+def start_fake_upstreams(port: int = 0, profiles: dict = None, seed: int = 0) -> ThreadingHTTPServer:
+    """Start the fake server on a background thread; ``server.server_port`` has the bound port"""
+    merged = {name: dict(DEFAULT_PROFILE) for name in SERVICES}
+    profiles = profiles or {}
+    for name in SERVICES:
+        merged[name].update(profiles.get('default', {}))
+        merged[name].update(profiles.get(name, {}))
+    handler = type('ConfiguredFakeUpstreamHandler', (FakeUpstreamHandler,), {
+        'profiles': merged,
+        'rng': random.Random(seed),
+        'rng_lock': threading.Lock(),
+        'counts': {name: 0 for name in SERVICES}
+    })
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    server.handler = handler  # for request counts
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def upstream_env(base_url: str) -> dict:
+    """Environment variables that point the backend at a fake server"""
+    return {
+        'NOMINATIM_URL': f"{base_url}/nominatim",
+        'BIGDATACLOUD_URL': f"{base_url}/bigdatacloud",
+        'OPENWEATHER_URL': f"{base_url}/openweather",
+        'OPENWEATHER_BASE_URL': f"{base_url}/openweather/data/2.5",
+        'PRICE_API_URL': f"{base_url}/agmarknet/request",
+        'DATA_GOV_BASE_URL': f"{base_url}/datagov/resource",
+        'SOILGRIDS_BASE_URL': f"{base_url}/soilgrids",
+        'BHUVAN_BASE_URL': f"{base_url}/bhuvan",
+        'GROQ_BASE_URL': f"{base_url}/groq",
+        'GROQ_API_KEY': 'fake',
+        'GOOGLE_CLOUD_FAKE_URL': f"{base_url}/google"
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--latency-ms', type=float, default=DEFAULT_PROFILE['latency_ms'])
+    parser.add_argument('--sigma', type=float, default=DEFAULT_PROFILE['sigma'])
+    parser.add_argument('--error-rate', type=float, default=DEFAULT_PROFILE['error_rate'])
+    parser.add_argument('--payload-kb', type=int, default=DEFAULT_PROFILE['payload_kb'])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--profile', help="JSON file with per-service overrides")
+    parser.add_argument('--print-env', action='store_true', help="Print the backend environment to use")
+    args = parser.parse_args()
+
+    profiles = {'default': {'latency_ms': args.latency_ms, 'sigma': args.sigma,
+                            'error_rate': args.error_rate, 'payload_kb': args.payload_kb}}
+    if args.profile:
+        with open(args.profile) as f:
+            for name, overrides in json.load(f).items():
+                profiles.setdefault(name, {}).update(overrides)
+
+    server = start_fake_upstreams(args.port, profiles, args.seed)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    print(f"Fake upstreams listening on {base_url}")
+    if args.print_env:
+        for name, value in upstream_env(base_url).items():
+            print(f"export {name}={value}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,136 @@
+"""
+FAQ index lookup latency and hit rate
+
+Runs a labelled set of farmer questions (paraphrases of FAQ entries, which
+should hit the expected entry, and out-of-scope questions, which should fall
+through to the LLM) against the FAQ index at several score thresholds.
+
+Usage (from backend/):
+    python -m benchmarks.faq_lookup
+    python -m benchmarks.faq_lookup --thresholds 0.4 0.5 0.6 --json faq.json
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from faq_index import FAQIndex
+
+# (question, expected FAQ id or None when the LLM should answer)
+QUERIES = [
+    ("when to sow wheat", 'wheat_sowing_time'),
+    ("what is the right time to sow wheat crop", 'wheat_sowing_time'),
+    ("when should i plant wheat this year", 'wheat_sowing_time'),
+    ("गेहूं कब बोएं", 'wheat_sowing_time'),
+    ("which fertiliser should I use for cotton", 'cotton_fertilizer'),
+    ("how much urea to put in paddy", 'rice_fertilizer'),
+    ("धान में यूरिया कितना डालना चाहिए", 'rice_fertilizer'),
+    ("వరికి ఏ ఎరువు వేయాలి", 'rice_fertilizer'),
+    ("పత్తి ఎప్పుడు విత్తాలి", 'cotton_sowing_time'),
+    ("कपास की बुवाई का समय", 'cotton_sowing_time'),
+    ("when to sow cotton in punjab", 'cotton_sowing_time'),
+    ("rice nursery sowing time", 'rice_transplanting_time'),
+    ("how many times should I water wheat", 'wheat_irrigation'),
+    ("pm kisan money how much", 'pm_kisan'),
+    ("पीएम किसान का पैसा कितना मिलता है", 'pm_kisan'),
+    ("how to test soil", 'soil_testing'),
+    ("मिट्टी जांच कैसे करें", 'soil_testing'),
+    ("how to control pink bollworm", 'pink_bollworm'),
+    ("kisan credit card interest", 'kisan_credit_card'),
+    ("fasal bima premium", 'crop_insurance'),
+    ("subsidy for drip irrigation", 'drip_subsidy'),
+    ("how to do seed treatment", 'seed_treatment'),
+    ("how much vermicompost per acre", 'organic_manure'),
+    ("where to check mandi price", 'mandi_prices'),
+    ("when should I sow mustard", None),
+    ("which fertilizer for maize", None),
+    ("what is the weather tomorrow", None),
+    ("my tomato leaves are curling what to do", None),
+    ("best crop for black soil in my district", None),
+    ("how to get loan for tractor", None),
+    ("when should I sow", None),
+    ("सरसों में कौन सी खाद डालें", None),
+    ("why are my cotton leaves turning red", None),
+    ("how to store onions after harvest", None),
+    # Same crop as an FAQ entry, different action or negated
+    ("When should I harvest wheat?", None),
+    ("When should I sell wheat?", None),
+    ("When should I spray wheat?", None),
+    ("When should I not sow wheat?", None),
+    ("cotton picking time", None),
+    ("गेहूं की कटाई कब करें", None),
+    ("धान कब बेचें", None),
+    ("when to harvest paddy", None),
+    ("how much water for cotton", None),
+]
+
+
+def evaluate(index: FAQIndex, repeats: int = 20) -> dict:
+    correct = wrong = false_hits = misses = 0
+    timings = []
+    for question, expected in QUERIES:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            match = index.lookup(question)
+            timings.append(time.perf_counter() - start)
+
+        found = match['id'] if match else None
+        if expected is None:
+            false_hits += found is not None
+        elif found == expected:
+            correct += 1
+        elif found is None:
+            misses += 1
+        else:
+            wrong += 1
+
+    answerable = sum(1 for _, expected in QUERIES if expected)
+    timings = np.array(timings) * 1000
+    return {
+        'threshold': index.min_score,
+        'hit_rate': round(correct / answerable, 3),
+        'wrong_answers': wrong,
+        'missed': misses,
+        'false_hits': false_hits,
+        'out_of_scope': len(QUERIES) - answerable,
+        'p50_ms': round(float(np.percentile(timings, 50)), 3),
+        'p99_ms': round(float(np.percentile(timings, 99)), 3)
+    }
+
+
+def run(thresholds) -> dict:
+    start = time.perf_counter()
+    index = FAQIndex(min_score=thresholds[0])
+    build_ms = (time.perf_counter() - start) * 1000
+
+    results = []
+    for threshold in thresholds:
+        index.min_score = threshold
+        results.append(evaluate(index))
+    return {
+        'entries': len(index.entries),
+        'questions': index.matrix.shape[0],
+        'features': index.matrix.shape[1],
+        'build_ms': round(build_ms, 1),
+        'results': results
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--thresholds', type=float, nargs='+', default=[0.4, 0.45, 0.5, 0.55, 0.6])
+    parser.add_argument('--json', help="Also write results to this file")
+    args = parser.parse_args()
+
+    report = run(args.thresholds)
+    print(f"{report['entries']} entries, {report['questions']} questions, "
+          f"{report['features']} n-gram features, built in {report['build_ms']} ms")
+    print(f"{'threshold':>10}{'hit rate':>10}{'wrong':>7}{'missed':>8}{'false hits':>12}{'p50 ms':>9}{'p99 ms':>9}")
+    for r in report['results']:
+        print(f"{r['threshold']:>10.2f}{r['hit_rate']:>10.1%}{r['wrong_answers']:>7}{r['missed']:>8}"
+              f"{r['false_hits']:>8}/{r['out_of_scope']:<3}{r['p50_ms']:>9.3f}{r['p99_ms']:>9.3f}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
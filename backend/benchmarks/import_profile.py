@@ -0,0 +1,88 @@
+"""
+Worker startup import profile
+
+Imports the app in fresh interpreters (as each gunicorn worker does) and
+reports the median wall time, the self time per top-level package from
+python -X importtime, and which chatbot provider packages were loaded.
+
+Usage (from backend/):
+    python -m benchmarks.import_profile
+    python -m benchmarks.import_profile --module app --runs 7 --json imports.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import Counter
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded only by the chatbot; none of them should be needed to serve /predict
+PROVIDER_MODULES = ['google.cloud.speech_v1p1beta1', 'google.cloud.texttospeech', 'groq',
+                    'langdetect', 'sklearn', 'scipy.signal']
+
+WALL_TIME_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'ms': elapsed * 1000, 'loaded': [m for m in {providers!r} if m in sys.modules]}}))
+"""
+
+
+def run_python(args):
+    return subprocess.run([sys.executable, *args], cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+
+
+def wall_time(module, runs):
+    results = []
+    for _ in range(runs):
+        output = run_python(['-c', WALL_TIME_SCRIPT.format(module=module, providers=PROVIDER_MODULES)])
+        results.append(json.loads(output.stdout.strip().splitlines()[-1]))
+    return statistics.median(r['ms'] for r in results), results[-1]['loaded']
+
+
+def self_time_by_package(module):
+    """Microseconds of self import time per top-level package"""
+    output = run_python(['-X', 'importtime', '-c', f'import {module}'])
+    totals = Counter()
+    for line in output.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        totals[name.strip().split('.')[0]] += int(self_us)
+    return totals
+
+
+def run(module, runs, top) -> dict:
+    median_ms, loaded = wall_time(module, runs)
+    totals = self_time_by_package(module)
+    return {
+        'module': module,
+        'median_import_ms': round(median_ms, 1),
+        'provider_modules_loaded': loaded,
+        'top_packages_ms': {name: round(us / 1000, 1) for name, us in totals.most_common(top)},
+        'total_self_ms': round(sum(totals.values()) / 1000, 1)
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--module', default='app')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=12)
+    parser.add_argument('--json', help="Also write results to this file")
+    args = parser.parse_args()
+
+    report = run(args.module, args.runs, args.top)
+    print(f"import {report['module']}: median {report['median_import_ms']} ms over {args.runs} fresh interpreters")
+    print(f"provider modules loaded at import: {', '.join(report['provider_modules_loaded']) or 'none'}")
+    print(f"{'package':>28}{'self ms':>10}")
+    for name, ms in report['top_packages_ms'].items():
+        print(f"{name:>28}{ms:>10.1f}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
@@ -0,0 +1,76 @@
+"""
+Language detection latency and accuracy: script-based detector vs langdetect
+
+Runs the labelled sample questions from test_language_detection through both
+detectors and reports per-call latency and how many samples each gets right.
+
+Usage (from backend/):
+    python -m benchmarks.language_detect
+    python -m benchmarks.language_detect --repeats 500 --json langdetect.json
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+from langdetect import DetectorFactory, detect
+
+from language_detect import detect_language
+from test_language_detection import SAMPLES
+
+
+def langdetect_language(text):
+    try:
+        return detect(text)
+    except Exception:
+        return 'en'
+
+
+def measure(name, detector, repeats):
+    timings = []
+    correct = 0
+    for text, expected in SAMPLES:
+        correct += detector(text) == expected
+        for _ in range(repeats):
+            start = time.perf_counter()
+            detector(text)
+            timings.append(time.perf_counter() - start)
+
+    timings = np.array(timings) * 1e6
+    return {
+        'detector': name,
+        'accuracy': round(correct / len(SAMPLES), 3),
+        'correct': correct,
+        'p50_us': round(float(np.percentile(timings, 50)), 1),
+        'p99_us': round(float(np.percentile(timings, 99)), 1),
+        'mean_us': round(float(timings.mean()), 1)
+    }
+
+
+def run(repeats) -> dict:
+    DetectorFactory.seed = 0
+    langdetect_language(SAMPLES[0][0])  # load the profiles outside the timing
+    return {
+        'samples': len(SAMPLES),
+        'results': [
+            measure('script', detect_language, repeats),
+            measure('langdetect', langdetect_language, max(repeats // 10, 1))
+        ]
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeats', type=int, default=200)
+    parser.add_argument('--json', help="Also write results to this file")
+    args = parser.parse_args()
+
+    report = run(args.repeats)
+    print(f"{report['samples']} labelled samples")
+    print(f"{'detector':>12}{'accuracy':>10}{'p50 µs':>10}{'p99 µs':>10}{'mean µs':>10}")
+    for r in report['results']:
+        print(f"{r['detector']:>12}{r['accuracy']:>10.1%}{r['p50_us']:>10.1f}{r['p99_us']:>10.1f}{r['mean_us']:>10.1f}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
@@ -0,0 +1,288 @@
+"""
+End-to-end load test of the Flask backends under gunicorn
+
+Starts benchmarks.fake_upstreams, boots ``app:app`` (the live backend, via
+benchmarks.fake_app so the Google clients are faked too) and/or
+``src.app:app`` under gunicorn pointed at the fakes, and drives closed-loop
+traffic from --concurrency client threads at each endpoint for --duration
+seconds. Records p50/p95/p99 latency, throughput, error rate and the peak RSS
+of the gunicorn master and workers, and writes everything (with the git
+commit) to JSON so runs can be compared between commits with --compare.
+
+Usage (from backend/):
+    python -m benchmarks.load_test --json results/load.json
+    python -m benchmarks.load_test --target flat --endpoints /chatbot/text --concurrency 16 --duration 30
+    python -m benchmarks.load_test --fake-latency-ms 200 --fake-profile profile.json --workers 4 --threads 2
+    python -m benchmarks.load_test --json new.json --compare results/load.json
+
+Client and provider rate limits, the chatbot answer cache and the FAQ are
+turned off unless --keep-rate-limits / --keep-answer-caches are given, so
+every /chatbot/text request takes the LLM path.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+from benchmarks.fake_upstreams import PLACES, start_fake_upstreams, upstream_env
+
+TARGETS = {
+    'flat': {'module': 'benchmarks.fake_app:app', 'endpoints': ['/predict', '/chatbot/text']},
+    'src': {'module': 'src.app:app', 'endpoints': ['/api/crop/recommendations', '/api/analysis/comprehensive']}
+}
+
+QUESTIONS = [
+    "When should I sow cotton?",
+    "Explain crop rotation benefits for my farm in detail",
+    "How much urea for one acre of wheat?",
+    "What is the PM-KISAN installment amount?",
+    "Which pesticide controls pink bollworm safely?",
+]
+
+
+def payloads(endpoint: str):
+    """Endless, varied request bodies for an endpoint"""
+    if endpoint == '/predict':
+        return ({'latitude': lat, 'longitude': lon} for lat, lon, *_ in itertools.cycle(PLACES))
+    if endpoint == '/api/analysis/comprehensive':
+        return ({'lat': lat, 'lon': lon} for lat, lon, *_ in itertools.cycle(PLACES))
+    if endpoint == '/api/crop/recommendations':
+        return ({'N': 40 + i % 80, 'P': 20 + i % 50, 'K': 20 + i % 60, 'temperature': 18 + i % 15,
+                 'humidity': 40 + i % 50, 'ph': 5.5 + (i % 30) / 10, 'rainfall': 50 + i % 250,
+                 'state': place[4]}
+                for i, place in enumerate(itertools.cycle(PLACES)))
+    if endpoint == '/chatbot/text':
+        return ({'message': question, 'language': 'en', 'state': place[4], 'district': place[3]}
+                for question, place in zip(itertools.cycle(QUESTIONS), itertools.cycle(PLACES)))
+    raise ValueError(f"No payloads for {endpoint}")
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def process_tree_rss(pid: int) -> dict:
+    """RSS in MB of pid and its direct children (gunicorn master and workers), from /proc"""
+    def rss(p):
+        try:
+            with open(f'/proc/{p}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        return int(line.split()[1]) / 1024
+        except OSError:
+            pass
+        return 0.0
+
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as f:
+            children = [int(c) for c in f.read().split()]
+    except OSError:
+        children = []
+    return {'master': rss(pid), 'workers': [rss(c) for c in children]}
+
+
+class Gunicorn:
+    """One gunicorn server for a target, with an RSS sampler"""
+
+    def __init__(self, module: str, env: dict, workers: int, threads: int, timeout: int = 120):
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        # App logs go to a file: a pipe nobody reads would fill up and block the workers
+        self.log = tempfile.NamedTemporaryFile('w+', prefix='load_test_', suffix='.log')
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', module, '--bind', f'127.0.0.1:{self.port}',
+             '--workers', str(workers), '--worker-class', 'gthread', '--threads', str(threads),
+             '--timeout', str(timeout), '--log-level', 'warning'],
+            env=env, stdout=self.log, stderr=subprocess.STDOUT)
+        self.peak = {'master': 0.0, 'worker': 0.0, 'total': 0.0}
+        self.stopped = threading.Event()
+
+    def wait_ready(self, timeout: float = 120):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                self.log.seek(0)
+                raise RuntimeError(f"gunicorn exited:\n{self.log.read()[-2000:]}")
+            try:
+                if requests.get(f"{self.url}/health", timeout=5).status_code < 500:
+                    threading.Thread(target=self._sample_rss, daemon=True).start()
+                    return
+            except requests.RequestException:
+                pass
+            time.sleep(0.5)
+        raise TimeoutError(f"gunicorn not ready after {timeout} s")
+
+    def _sample_rss(self):
+        while not self.stopped.wait(0.5):
+            usage = process_tree_rss(self.process.pid)
+            self.peak['master'] = max(self.peak['master'], usage['master'])
+            self.peak['worker'] = max([self.peak['worker'], *usage['workers']])
+            self.peak['total'] = max(self.peak['total'], usage['master'] + sum(usage['workers']))
+
+    def stop(self):
+        self.stopped.set()
+        self.process.send_signal(signal.SIGTERM)
+        try:
+            self.process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        self.log.close()
+
+
+def drive(url: str, bodies, concurrency: int, duration: float) -> dict:
+    """Closed loop: each client thread sends its next request as soon as the last returns"""
+    lock = threading.Lock()
+    latencies, statuses = [], []
+    deadline = time.monotonic() + duration
+
+    def client():
+        session = requests.Session()
+        while time.monotonic() < deadline:
+            with lock:
+                body = next(bodies)
+            start = time.perf_counter()
+            try:
+                status = session.post(url, json=body, timeout=120).status_code
+            except requests.RequestException:
+                status = 0
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                statuses.append(status)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(client)
+    wall = time.perf_counter() - started
+
+    values = np.array(latencies) * 1000
+    errors = sum(1 for s in statuses if s == 0 or s >= 500)
+    return {
+        'requests': len(statuses),
+        'throughput_rps': round(len(statuses) / wall, 1),
+        'error_rate': round(errors / max(len(statuses), 1), 4),
+        'throttled': sum(1 for s in statuses if s == 429),
+        'p50_ms': round(float(np.percentile(values, 50)), 1) if len(values) else None,
+        'p95_ms': round(float(np.percentile(values, 95)), 1) if len(values) else None,
+        'p99_ms': round(float(np.percentile(values, 99)), 1) if len(values) else None,
+    }
+
+
+def run(targets=('flat', 'src'), endpoints=None, concurrency=8, duration=20.0, warmup=3.0,
+        workers=2, threads=8, fake_profiles=None, keep_rate_limits=False, keep_answer_caches=False) -> dict:
+    fakes = start_fake_upstreams(0, fake_profiles)
+    env = {**os.environ, **upstream_env(f"http://127.0.0.1:{fakes.server_port}")}
+    if not keep_rate_limits:
+        # Per-client and provider quotas would turn most of the load into 429s / busy answers
+        env.update({'RATELIMIT_ENABLED': 'False', 'RATE_LIMIT_ENABLED': 'False'})
+    if not keep_answer_caches:
+        # QUESTIONS repeat, so /chatbot/text would time answer-cache and FAQ hits instead of the LLM path
+        env.update({'ANSWER_CACHE_MAX_ENTRIES': '0', 'FAQ_MIN_SCORE': '0'})
+
+    results = {'commit': git_commit(), 'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+               'settings': {'concurrency': concurrency, 'duration': duration, 'workers': workers,
+                            'threads': threads, 'answer_caches': keep_answer_caches,
+                            'fake_profiles': fake_profiles or {}},
+               'targets': {}}
+    try:
+        for target in targets:
+            server = Gunicorn(TARGETS[target]['module'], env, workers, threads)
+            try:
+                server.wait_ready()
+                target_results = {}
+                for endpoint in TARGETS[target]['endpoints']:
+                    if endpoint not in (endpoints or TARGETS[target]['endpoints']):
+                        continue
+                    if warmup:
+                        drive(server.url + endpoint, payloads(endpoint), concurrency, warmup)
+                    target_results[endpoint] = drive(server.url + endpoint, payloads(endpoint), concurrency, duration)
+                target_results['rss_mb'] = {k: round(v, 1) for k, v in server.peak.items()}
+                results['targets'][target] = target_results
+            finally:
+                server.stop()
+    finally:
+        fakes.shutdown()
+    results['upstream_requests'] = dict(fakes.handler.counts)
+    return results
+
+
+def print_results(results: dict, baseline: dict = None):
+    print(f"commit {results['commit']}  " + ', '.join(f"{k}={v}" for k, v in results['settings'].items()
+                                                        if k != 'fake_profiles'))
+    header = f"{'endpoint':<32}{'req/s':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'errors':>8}"
+    print(header if not baseline else header + f"{'Δ req/s':>10}{'Δ p95':>9}")
+    for target, endpoints in results['targets'].items():
+        for endpoint, r in endpoints.items():
+            if endpoint == 'rss_mb':
+                continue
+            line = (f"{endpoint:<32}{r['throughput_rps']:>8.1f}{r['p50_ms']:>7.0f}ms{r['p95_ms']:>7.0f}ms"
+                    f"{r['p99_ms']:>7.0f}ms{r['error_rate']:>8.1%}")
+            old = (baseline or {}).get('targets', {}).get(target, {}).get(endpoint)
+            if old:
+                line += (f"{(r['throughput_rps'] / old['throughput_rps'] - 1) if old['throughput_rps'] else 0:>+10.1%}"
+                         f"{(r['p95_ms'] / old['p95_ms'] - 1) if old['p95_ms'] else 0:>+9.1%}")
+            print(line)
+        rss = endpoints['rss_mb']
+        print(f"  {target} peak RSS: {rss['total']:.0f} MB total, {rss['worker']:.0f} MB per worker")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--target', choices=['flat', 'src', 'both'], default='both')
+    parser.add_argument('--endpoints', nargs='+', help="Subset of endpoints (default: all of the target's)")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=20, help="Seconds of load per endpoint")
+    parser.add_argument('--warmup', type=float, default=3)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--fake-latency-ms', type=float, default=50)
+    parser.add_argument('--fake-error-rate', type=float, default=0.0)
+    parser.add_argument('--fake-profile', help="JSON file with per-service fake upstream overrides")
+    parser.add_argument('--keep-rate-limits', action='store_true')
+    parser.add_argument('--keep-answer-caches', action='store_true',
+                        help="Leave the answer cache and FAQ on (repeated questions then mostly hit them)")
+    parser.add_argument('--json', help="Also write results to this file")
+    parser.add_argument('--compare', help="Earlier --json results to compare against")
+    args = parser.parse_args()
+
+    profiles = {'default': {'latency_ms': args.fake_latency_ms, 'error_rate': args.fake_error_rate}}
+    if args.fake_profile:
+        with open(args.fake_profile) as f:
+            for name, overrides in json.load(f).items():
+                profiles.setdefault(name, {}).update(overrides)
+
+    results = run(['flat', 'src'] if args.target == 'both' else [args.target], args.endpoints,
+                  args.concurrency, args.duration, args.warmup, args.workers, args.threads,
+                  profiles, args.keep_rate_limits, args.keep_answer_caches)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    if args.json:
+        os.makedirs(os.path.dirname(args.json) or '.', exist_ok=True)
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
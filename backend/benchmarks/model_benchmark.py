@@ -0,0 +1,56 @@
+"""
+Benchmark the served crop model on the cached holdout set
+
+Writes a JSON report (accuracy, top-k accuracy, single-row p50/p99 latency,
+batch throughput, peak memory) per model version so regressions between
+versions show up when reports are compared.
+
+Usage (from backend/):
+    python -m benchmarks.model_benchmark
+    python -m benchmarks.model_benchmark --registry models/registry --baseline benchmarks/results/model-<old>.json
+"""
+
+import argparse
+import json
+import os
+import warnings
+
+from src.ml import EnhancedCropRecommendationModel
+from src.ml.evaluation import benchmark_model, compare, load_holdout
+from src.ml.registry import ModelRegistry
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the served crop model on a cached holdout set")
+    parser.add_argument('--model', default=os.getenv('MODEL_PATH', 'models/crop_recommendation_model.pkl'))
+    parser.add_argument('--registry', help="Registry directory; evaluates its active version instead of --model")
+    parser.add_argument('--holdout', default='models/holdout.npz')
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--output', help="JSON report path (default: benchmarks/results/model-<version>.json)")
+    parser.add_argument('--baseline', help="Earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    # sklearn warns on every unnamed single-row prediction
+    warnings.filterwarnings('ignore', category=UserWarning)
+    registry = ModelRegistry(args.registry) if args.registry else None
+    wrapper = EnhancedCropRecommendationModel(args.model, registry=registry)
+    version = wrapper.model_version or os.path.splitext(os.path.basename(args.model))[0]
+
+    X, y = load_holdout(wrapper.generate_enhanced_training_data, args.holdout, args.rows,
+                        wrapper.feature_columns)
+    report = benchmark_model(wrapper.model, X, y, version)
+    if args.baseline:
+        with open(args.baseline) as f:
+            report['comparison'] = compare(report, json.load(f))
+
+    output = args.output or os.path.join('benchmarks', 'results', f'model-{version}.json')
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(json.dumps(report, indent=2))
+    print(f"Report written to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+/predict response size and serialisation time
+
+Builds typical /predict bodies for several states (crop scoring with the
+fallback price table, fixed weather and generated soil data, so no network
+is involved) and reports, for the full and the ?schema=compact predictions,
+the raw/gzip/brotli body size and the time to serialise with the standard
+library (what jsonify does) and with orjson, plus the compression time.
+
+Usage (from backend/):
+    python -m benchmarks.response_payload
+    python -m benchmarks.response_payload --repeats 500 --json payload.json
+"""
+
+import argparse
+import gzip
+import json
+import time
+
+import app
+import responses
+
+STATES = [("Maharashtra", "Vidarbha"), ("Punjab", "Ludhiana"), ("Telangana", "Nalgonda"),
+          ("Uttar Pradesh", "Bundelkhand"), ("Tamil Nadu", "Western Tamil Nadu"), ("Kerala", "Kochi")]
+
+WEATHER = {"success": True,
+           "current": {"temperature": 31.4, "feels_like": 34.2, "humidity": 62, "pressure": 1012,
+                       "wind_speed": 4.1, "visibility": 10000, "description": "Clear Sky"},
+           "agricultural_metrics": {"growing_degree_days": 21.4,
+                                    "crop_stress_factors": {"temperature_stress": "Medium"},
+                                    "optimal_for_crops": ["Cotton", "Sugarcane", "Rice"]}}
+
+
+def typical_bodies(schema):
+    app.get_current_price = lambda crop, state, district: app.get_fallback_price(crop)
+    bodies = []
+    for state, district in STATES:
+        soil_data = app.generate_soil_data(state, district, 20.0, 78.0)
+        predictions = app.generate_crop_predictions(state, district, soil_data.get('soil_type', 'Mixed Soil'))
+        if schema == 'compact':
+            predictions = responses.compact_predictions(predictions)
+        bodies.append({
+            "success": True,
+            "location": {"area": "Village", "district": district, "state": state, "country": "India"},
+            "weather_data": WEATHER,
+            "soil_data": soil_data,
+            "market_data": {"success": True, "season": predictions['season'],
+                            "market_analysis": {"market_status": "Active", "data_source": "AGMARKNET",
+                                                "state": state, "district": district}},
+            "predictions": predictions
+        })
+    return bodies
+
+
+def per_call_us(fn, bodies, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for body in bodies:
+            fn(body)
+    return round((time.perf_counter() - start) / (repeats * len(bodies)) * 1e6, 1)
+
+
+def measure(schema, repeats):
+    bodies = typical_bodies(schema)
+    encoded = [responses.dumps(body) for body in bodies]
+    result = {
+        'schema': schema,
+        'raw_bytes': round(sum(map(len, encoded)) / len(encoded)),
+        'gzip_bytes': round(sum(len(responses.compress(e, 'gzip')) for e in encoded) / len(encoded)),
+        'stdlib_us': per_call_us(lambda body: json.dumps(body, separators=(',', ':')).encode(), bodies, repeats),
+        'orjson_us': per_call_us(responses.dumps, bodies, repeats) if responses.orjson else None,
+        'gzip_us': per_call_us(lambda e: gzip.compress(e, compresslevel=responses.GZIP_LEVEL), encoded, repeats)
+    }
+    if responses.brotli:
+        result['br_bytes'] = round(sum(len(responses.compress(e, 'br')) for e in encoded) / len(encoded))
+        result['br_us'] = per_call_us(lambda e: responses.compress(e, 'br'), encoded, repeats)
+    return result
+
+
+def run(repeats):
+    return {'orjson': responses.orjson is not None, 'brotli': responses.brotli is not None,
+            'results': [measure(schema, repeats) for schema in ('full', 'compact')]}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeats', type=int, default=200)
+    parser.add_argument('--json', help="Also write results to this file")
+    args = parser.parse_args()
+
+    report = run(args.repeats)
+    print(f"orjson {'installed' if report['orjson'] else 'missing'}, "
+          f"brotli {'installed' if report['brotli'] else 'missing'}; averages over {len(STATES)} states")
+    print(f"{'schema':>8}{'raw B':>8}{'gzip B':>8}{'br B':>7}{'stdlib us':>11}{'orjson us':>11}{'gzip us':>9}{'br us':>7}")
+    for r in report['results']:
+        print(f"{r['schema']:>8}{r['raw_bytes']:>8}{r['gzip_bytes']:>8}{r.get('br_bytes', '-'):>7}"
+              f"{r['stdlib_us']:>11}{r['orjson_us'] or '-':>11}{r['gzip_us']:>9}{r.get('br_us', '-'):>7}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
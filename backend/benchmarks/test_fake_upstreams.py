@@ -0,0 +1,57 @@
+"""
+Test the fake upstream server: response shapes the backend parses and
+repeatable error injection
+"""
+
+import requests
+
+from benchmarks.fake_upstreams import RemoteSpeechClient, FakeUpstreamError, start_fake_upstreams
+from market import MarketService
+
+
+def test_backend_parses_fake_responses(monkeypatch):
+    server = start_fake_upstreams(profiles={'default': {'latency_ms': 1, 'sigma': 0}})
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        weather = requests.get(f"{base_url}/openweather/data/2.5/weather?lat=21.1&lon=79.1").json()
+        assert weather['main']['temp'] and weather['weather'][0]['description']
+
+        monkeypatch.setattr('market.Config.DATA_GOV_BASE_URL', f"{base_url}/datagov/resource")
+        market = MarketService().process_market_data('Bihar', 'Patna')
+        assert market['success'] and market['current_prices']
+    finally:
+        server.shutdown()
+
+
+def test_error_rate_is_seeded():
+    def failures(seed):
+        server = start_fake_upstreams(profiles={'google_stt': {'latency_ms': 1, 'sigma': 0, 'error_rate': 0.3}},
+                                      seed=seed)
+        client = RemoteSpeechClient(f"http://127.0.0.1:{server.server_port}/google")
+        audio = type('Audio', (), {'content': b'\x00' * 320})()
+        outcome = []
+        for _ in range(20):
+            try:
+                client.recognize(config=None, audio=audio)
+                outcome.append(False)
+            except FakeUpstreamError as e:
+                assert e.status_code == 503
+                outcome.append(True)
+        server.shutdown()
+        return outcome
+
+    first = failures(seed=7)
+    assert first == failures(seed=7)
+    assert 0 < sum(first) < 20
+
+
+def test_fake_app_injects_google_clients(monkeypatch):
+    import importlib
+    import app as backend
+    monkeypatch.setenv('GOOGLE_CLOUD_FAKE_URL', 'http://127.0.0.1:1/google')
+    monkeypatch.setattr(backend.chatbot.clients, 'clients', {})
+    fake_app = importlib.reload(importlib.import_module('benchmarks.fake_app'))
+
+    assert fake_app.app is backend.app
+    assert type(backend.chatbot.speech_client).__name__ == 'RemoteSpeechClient'
+    assert type(backend.chatbot.tts_client).__name__ == 'RemoteTTSClient'
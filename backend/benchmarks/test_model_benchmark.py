@@ -0,0 +1,70 @@
+"""
+pytest-benchmark suite for the served crop model
+
+Runs against MODEL_PATH (or a freshly trained enhanced model when that file
+does not exist) and the cached holdout set used by ``src.ml.evaluation``.
+
+Usage (from backend/):
+    pytest benchmarks/test_model_benchmark.py --benchmark-autosave
+    pytest benchmarks/test_model_benchmark.py --benchmark-compare --benchmark-compare-fail=median:10%
+"""
+
+import os
+import warnings
+
+import numpy as np
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from src.ml import EnhancedCropRecommendationModel
+from src.ml.evaluation import accuracy_report, load_holdout
+
+
+@pytest.fixture(scope='module')
+def served_model(tmp_path_factory):
+    warnings.filterwarnings('ignore', category=UserWarning)
+    path = os.getenv('MODEL_PATH', 'models/crop_recommendation_model.pkl')
+    wrapper = EnhancedCropRecommendationModel(path)
+    if getattr(wrapper.model, 'n_features_in_', None) != len(wrapper.feature_columns):
+        # The checked-in artifact may be the 7-feature legacy model
+        wrapper = EnhancedCropRecommendationModel(str(tmp_path_factory.mktemp('model') / 'model.pkl'))
+    return wrapper
+
+
+@pytest.fixture(scope='module')
+def holdout(served_model):
+    path = os.getenv('HOLDOUT_PATH', 'models/holdout.npz')
+    return load_holdout(served_model.generate_enhanced_training_data, path, 5000,
+                        served_model.feature_columns)
+
+
+def test_holdout_accuracy(benchmark, served_model, holdout):
+    X, y = holdout
+    report = benchmark.pedantic(accuracy_report, args=(served_model.model, X, y), rounds=1, iterations=1)
+    benchmark.extra_info.update(report)
+    assert 0.0 <= report['accuracy'] <= report['top_3_accuracy'] <= report['top_5_accuracy'] <= 1.0
+
+
+def test_single_row_predict_proba(benchmark, served_model, holdout):
+    X, _ = holdout
+    row = X[:1]
+    probabilities = benchmark(served_model.model.predict_proba, row)
+    assert np.isclose(probabilities.sum(), 1.0, atol=1e-3)
+
+
+@pytest.mark.parametrize('batch_size', [100, 1000])
+def test_batch_predict_proba(benchmark, served_model, holdout, batch_size):
+    X, _ = holdout
+    batch = X[:batch_size]
+    probabilities = benchmark(served_model.model.predict_proba, batch)
+    benchmark.extra_info['rows'] = batch_size
+    assert probabilities.shape == (batch_size, len(served_model.model.classes_))
+
+
+def test_wrapper_predict(benchmark, served_model, holdout):
+    """End-to-end ``predict`` as called by the recommendation endpoints"""
+    X, _ = holdout
+    features = dict(zip(served_model.feature_columns, X[0].tolist()))
+    predictions = benchmark(served_model.predict, features)
+    assert len(predictions) == 5
@@ -0,0 +1,118 @@
+"""
+pytest-benchmark suite for the pure scoring functions behind /predict
+
+Covers crop prediction and profit scoring (with AGMARKNET prices replaced by
+the fallback table, so no network is involved), soil lookups, mandi price
+parsing/analysis and the weather-derived agricultural metrics, each over
+generated inputs at several sizes.
+
+Usage (from backend/):
+    pytest benchmarks/test_scoring_benchmark.py --benchmark-save=baseline
+    pytest benchmarks/test_scoring_benchmark.py --benchmark-compare=0001 --benchmark-compare-fail=median:10%
+    pytest-benchmark compare 0001 0002 --group-by=name --columns=min,median,max
+
+Saved runs land in .benchmarks/; --benchmark-compare-fail makes the run fail
+when any benchmark's median regresses by more than the given threshold.
+"""
+
+import random
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+import app
+from market import MarketService
+from weather import WeatherService
+
+SIZES = [10, 100, 1000]
+
+STATES = ["Maharashtra", "Gujarat", "Punjab", "Telangana", "Uttar Pradesh", "Karnataka",
+          "Tamil Nadu", "Rajasthan", "West Bengal", "Kerala", "Bihar", "Goa"]
+DISTRICTS = ["Vidarbha", "Saurashtra", "Ludhiana", "Nalgonda", "Bundelkhand", "Coastal Karnataka",
+             "Western Tamil Nadu", "Eastern Rajasthan", "North Bengal", "Kochi", "Patna", "Panaji"]
+COMMODITIES = ["Rice", "Wheat", "Cotton", "Maize", "Soybean", "Onion", "Tomato", "Groundnut",
+               "Bajra", "Jowar", "Turmeric", "Mustard"]
+
+
+@pytest.fixture(autouse=True)
+def offline_prices(monkeypatch):
+    monkeypatch.setattr(app, 'get_current_price', lambda crop, state, district: app.get_fallback_price(crop))
+
+
+def locations(n, seed=0):
+    rng = random.Random(seed)
+    return [(rng.choice(STATES), rng.choice(DISTRICTS)) for _ in range(n)]
+
+
+def mandi_records(n, seed=0):
+    """data.gov.in style payload: prices as strings, a few blank or malformed"""
+    rng = random.Random(seed)
+    records = []
+    for _ in range(n):
+        modal = rng.randint(800, 9000)
+        low, high = int(modal * rng.uniform(0.7, 0.95)), int(modal * rng.uniform(1.05, 1.4))
+        records.append({
+            'state': rng.choice(STATES), 'district': rng.choice(DISTRICTS), 'market': f"APMC {rng.randint(1, 60)}",
+            'commodity': rng.choice(COMMODITIES), 'variety': rng.choice(['', '', 'Local', 'Hybrid']),
+            'min_price': str(low), 'max_price': str(high) if rng.random() > 0.02 else 'NR',
+            'modal_price': str(modal), 'arrival_date': '15/10/2025'
+        })
+    return {'records': records}
+
+
+def weather_payloads(n, seed=0):
+    rng = random.Random(seed)
+    return [{'main': {'temp': rng.uniform(5, 45), 'humidity': rng.uniform(15, 100)}} for _ in range(n)]
+
+
+@pytest.mark.parametrize('n', SIZES)
+def test_generate_crop_predictions(benchmark, n):
+    inputs = [(state, district, app.get_soil_type_by_state_district(state, district))
+              for state, district in locations(n)]
+    results = benchmark(lambda: [app.generate_crop_predictions(*args) for args in inputs])
+    benchmark.extra_info['locations'] = n
+    assert all(r['success'] for r in results)
+
+
+@pytest.mark.parametrize('n', SIZES)
+def test_calculate_profit(benchmark, n):
+    rng = random.Random(0)
+    inputs = [(rng.choice(COMMODITIES), rng.uniform(10, 80), state, district) for state, district in locations(n)]
+    results = benchmark(lambda: [app.calculate_profit(*args) for args in inputs])
+    assert len(results) == n
+
+
+@pytest.mark.parametrize('n', SIZES)
+def test_generate_soil_data(benchmark, n):
+    inputs = locations(n)
+    results = benchmark(lambda: [app.generate_soil_data(state, district) for state, district in inputs])
+    assert all(r['success'] for r in results)
+
+
+@pytest.mark.parametrize('n', SIZES)
+def test_get_soil_type_by_state_district(benchmark, n):
+    inputs = locations(n)
+    results = benchmark(lambda: [app.get_soil_type_by_state_district(state, district) for state, district in inputs])
+    assert len(results) == n
+
+
+@pytest.mark.parametrize('n', SIZES)
+def test_parse_mandi_prices(benchmark, n):
+    service, data = MarketService(), mandi_records(n)
+    prices = benchmark(service.parse_mandi_prices, data)
+    assert sum(p['markets_count'] for p in prices.values()) == n
+
+
+@pytest.mark.parametrize('n', SIZES)
+def test_analyze_market_conditions(benchmark, n):
+    service, data = MarketService(), mandi_records(n)
+    analysis = benchmark(service.analyze_market_conditions, data)
+    assert analysis['market_status'] in ('Favorable', 'Moderate')
+
+
+@pytest.mark.parametrize('n', SIZES)
+def test_calculate_agricultural_metrics(benchmark, n):
+    service, inputs = WeatherService(), weather_payloads(n)
+    results = benchmark(lambda: [service.calculate_agricultural_metrics(w) for w in inputs])
+    assert all('growing_degree_days' in r for r in results)
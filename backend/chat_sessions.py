@@ -0,0 +1,195 @@
+"""
+Server-side chatbot sessions
+Each session holds the farm context and a rolling history of turns. Old turns
+are folded into a short summary of earlier questions once the history passes a
+token budget, so the prompt stays about the same size however long the
+conversation runs. Sessions are kept in a bounded LRU store with idle expiry,
+in a SQLite file that every gunicorn worker on the host opens, so a follow-up
+finds its session whichever worker it reaches.
+"""
+
+import json
+import logging
+import math
+import os
+import secrets
+import sqlite3
+import tempfile
+import threading
+import time
+import weakref
+
+logger = logging.getLogger(__name__)
+
+def estimate_tokens(text):
+    """Rough LLM token count: ~4 Latin characters per token, ~2 for Indic scripts"""
+    ascii_chars = sum(ch.isascii() for ch in text)
+    return math.ceil(ascii_chars / 4 + (len(text) - ascii_chars) / 2)
+
+class SessionExpired(Exception):
+    """A request named a session the store doesn't hold (expired, evicted or never created)"""
+
+class ChatSession:
+    """Context and history of one conversation"""
+
+    def __init__(self, session_id, context, turns=(), summary=(), history_tokens=0, last_used=None):
+        self.id = session_id
+        self.context = context
+        self.turns = list(turns)      # (question, answer), oldest first
+        self.summary = list(summary)  # earlier questions, shortened, oldest first
+        self.history_tokens = history_tokens
+        self.last_used = last_used or time.time()
+        self.lock = threading.Lock()
+
+    @property
+    def has_history(self):
+        return bool(self.turns or self.summary)
+
+    def history(self):
+        """(summary lines, turns) snapshot for building a prompt"""
+        with self.lock:
+            return list(self.summary), list(self.turns)
+
+class SessionStore:
+    """
+    Bounded set of chat sessions in a SQLite file shared by the workers on a
+    host, least recently used evicted first; without a path the file is a
+    private temporary one
+    """
+
+    def __init__(self, max_sessions=5000, ttl=30 * 60, history_tokens=800, summary_tokens=150,
+                 summary_chars=80, path=None):
+        self.max_sessions = max_sessions
+        self.ttl = ttl                        # idle seconds before a session expires
+        self.history_tokens = history_tokens  # budget for verbatim turns in the prompt
+        self.summary_tokens = summary_tokens  # budget for the summary of older questions
+        self.summary_chars = summary_chars    # each older question is cut to this length
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix='chat_sessions_', suffix='.db')
+            os.close(fd)
+            weakref.finalize(self, _remove_db, path)
+        elif os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.expired = 0  # counted by this process
+        self.evicted = 0
+        with self._db() as db:
+            db.execute("CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, context TEXT, turns TEXT, "
+                       "summary TEXT, history_tokens INTEGER, last_used REAL)")
+            db.execute("CREATE INDEX IF NOT EXISTS sessions_last_used ON sessions (last_used)")
+
+    @classmethod
+    def from_env(cls):
+        """Build the store from CHAT_SESSION_* settings (CHAT_SESSION_MAX=0 disables sessions)"""
+        max_sessions = int(os.getenv('CHAT_SESSION_MAX', '5000'))
+        if max_sessions <= 0:
+            return None
+        return cls(max_sessions,
+                   ttl=float(os.getenv('CHAT_SESSION_TTL', str(30 * 60))),
+                   history_tokens=int(os.getenv('CHAT_SESSION_HISTORY_TOKENS', '800')),
+                   path=os.getenv('CHAT_SESSION_DB', 'cache/chat_sessions.db'))
+
+    def _db(self):
+        """This thread's connection (sqlite3 connections can't be shared between threads)"""
+        db = getattr(self.local, 'db', None)
+        if db is None or self.local.pid != os.getpid():
+            db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self.local.db, self.local.pid = db, os.getpid()
+        return _Transaction(db)
+
+    def _save(self, db, session):
+        db.execute("INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?)",
+                   (session.id, json.dumps(session.context, default=str, ensure_ascii=False),
+                    json.dumps(session.turns, ensure_ascii=False), json.dumps(session.summary, ensure_ascii=False),
+                    session.history_tokens, session.last_used))
+
+    def create(self, context):
+        session = ChatSession(secrets.token_urlsafe(16), context)
+        with self._db() as db:
+            expired = db.execute("DELETE FROM sessions WHERE last_used < ?", (session.last_used - self.ttl,))
+            self._save(db, session)
+            evicted = db.execute("DELETE FROM sessions WHERE id IN (SELECT id FROM sessions ORDER BY last_used "
+                                 "LIMIT max(0, (SELECT count(*) FROM sessions) - ?))", (self.max_sessions,))
+        with self.lock:
+            self.expired += expired.rowcount
+            self.evicted += evicted.rowcount
+        return session
+
+    def get(self, session_id):
+        """The live session with this id, or None if unknown or expired"""
+        now = time.time()
+        with self._db() as db:
+            row = db.execute("SELECT context, turns, summary, history_tokens, last_used FROM sessions WHERE id = ?",
+                             (session_id,)).fetchone()
+            if row is None:
+                return None
+            if now - row[4] > self.ttl:
+                db.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+                with self.lock:
+                    self.expired += 1
+                return None
+            db.execute("UPDATE sessions SET last_used = ? WHERE id = ?", (now, session_id))
+        return ChatSession(session_id, json.loads(row[0]), [tuple(turn) for turn in json.loads(row[1])],
+                           json.loads(row[2]), row[3], now)
+
+    def add_turn(self, session, question, answer):
+        """Record a turn and compact the history back under the token budget"""
+        with session.lock, self._db() as db:
+            # Another worker may have added turns since this session was read
+            row = db.execute("SELECT turns, summary, history_tokens FROM sessions WHERE id = ?",
+                             (session.id,)).fetchone()
+            if row is not None:
+                session.turns = [tuple(turn) for turn in json.loads(row[0])]
+                session.summary, session.history_tokens = json.loads(row[1]), row[2]
+
+            session.turns.append((question, answer))
+            session.history_tokens += estimate_tokens(question) + estimate_tokens(answer)
+
+            # Keep the latest turn verbatim; older ones become summary lines
+            while session.history_tokens > self.history_tokens and len(session.turns) > 1:
+                old_question, old_answer = session.turns.pop(0)
+                session.history_tokens -= estimate_tokens(old_question) + estimate_tokens(old_answer)
+                line = old_question if len(old_question) <= self.summary_chars \
+                    else old_question[:self.summary_chars].rstrip() + '…'
+                session.summary.append(line)
+
+            while sum(estimate_tokens(line) for line in session.summary) > self.summary_tokens:
+                session.summary.pop(0)
+
+            session.last_used = time.time()
+            self._save(db, session)
+
+    def stats(self):
+        with self._db() as db:
+            sessions = db.execute("SELECT count(*) FROM sessions").fetchone()[0]
+        with self.lock:
+            return {
+                "sessions": sessions,
+                "max_sessions": self.max_sessions,
+                "expired": self.expired,
+                "evicted": self.evicted
+            }
+
+def _remove_db(path):
+    for name in (path, f"{path}-wal", f"{path}-shm"):
+        try:
+            os.remove(name)
+        except OSError:
+            pass
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT (ROLLBACK on error) on a connection, as a context manager"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        self.db.execute("BEGIN IMMEDIATE")
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb):
+        self.db.execute("ROLLBACK" if exc_type else "COMMIT")
@@ -0,0 +1,135 @@
+"""
+Bounded executor for chatbot work
+Chatbot requests (STT + LLM + TTS) run on a small dedicated thread pool with a
+fixed number of admission slots; once they are all taken new requests are
+rejected straight away with a retry-after estimate, so slow chatbot calls can
+never take every web server thread away from the prediction endpoints
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import logging
+import math
+import os
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class ChatbotOverloaded(Exception):
+    """All chatbot slots are busy; retry_after is a suggested wait in seconds"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Chatbot is busy, retry in {retry_after} s")
+        self.retry_after = retry_after
+
+class ChatbotExecutor:
+    """workers run chatbot calls; up to queue_limit more wait, the rest are rejected"""
+
+    def __init__(self, workers=2, queue_limit=2, item_timeout=30):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.item_timeout = item_timeout  # longest wait for the next streamed event
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='chatbot')
+        self.slots = threading.BoundedSemaphore(workers + queue_limit)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.mean_seconds = 5.0  # moving average of a request's duration
+
+    @classmethod
+    def from_env(cls):
+        return cls(workers=int(os.getenv('CHATBOT_WORKERS', '2')),
+                   queue_limit=int(os.getenv('CHATBOT_QUEUE_LIMIT', '2')),
+                   item_timeout=float(os.getenv('CHATBOT_STREAM_TIMEOUT', '30')))
+
+    def _admit(self):
+        if not self.slots.acquire(blocking=False):
+            with self.lock:
+                self.rejected += 1
+                # Time for the queue ahead to drain through the workers
+                retry_after = math.ceil(self.mean_seconds * (self.queue_limit / self.workers + 1))
+            logger.warning(f"Chatbot overloaded, rejecting request (retry after {retry_after} s)")
+            raise ChatbotOverloaded(max(retry_after, 1))
+        with self.lock:
+            self.in_flight += 1
+        return time.perf_counter()
+
+    def _release(self, started):
+        with self.lock:
+            self.in_flight -= 1
+            self.completed += 1
+            self.mean_seconds = 0.8 * self.mean_seconds + 0.2 * (time.perf_counter() - started)
+        self.slots.release()
+
+    def submit(self, fn, *args, **kwargs):
+        """Future for fn(*args, **kwargs); raises ChatbotOverloaded when no slot is free"""
+        started = self._admit()
+        try:
+            # Run in the caller's context so the request's trace and id follow the call
+            future = self.pool.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+        except Exception:
+            self._release(started)
+            raise
+        future.add_done_callback(lambda _: self._release(started))
+        return future
+
+    def stream(self, events):
+        """
+        Run an (event, data) generator on the pool and return an iterator over
+        its items for the response; admission happens now, not on first read
+        """
+        started = self._admit()
+        items = queue.Queue()
+        cancelled = threading.Event()
+        done = object()
+
+        def produce():
+            try:
+                for item in events:
+                    if cancelled.is_set():
+                        break
+                    items.put(item)
+            except Exception as e:
+                items.put(e)
+            finally:
+                if cancelled.is_set() and hasattr(events, 'close'):
+                    events.close()  # let the generator stop its own work (GeneratorExit)
+                items.put(done)
+                self._release(started)
+
+        try:
+            self.pool.submit(contextvars.copy_context().run, produce)
+        except Exception:
+            self._release(started)
+            raise
+
+        def consume():
+            try:
+                while True:
+                    try:
+                        item = items.get(timeout=self.item_timeout)
+                    except queue.Empty:
+                        raise TimeoutError(f"No chatbot output for {self.item_timeout} s")
+                    if item is done:
+                        return
+                    if isinstance(item, Exception):
+                        raise item
+                    yield item
+            finally:
+                cancelled.set()  # client went away or the stream ended
+
+        return consume()
+
+    def stats(self):
+        with self.lock:
+            return {
+                "workers": self.workers,
+                "queue_limit": self.queue_limit,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "mean_ms": round(self.mean_seconds * 1000, 1)
+            }
@@ -4,52 +4,126 @@ Supports: Hindi, Telugu, Tamil, Kannada, Marathi, Bengali, Gujarati, Malayalam,
 Uses: Google Cloud Speech-to-Text, Text-to-Speech, and Groq API (FREE)
 """
 
-from google.cloud import speech_v1p1beta1 as speech
-from google.cloud import texttospeech
-from groq import Groq
-from langdetect import detect
+from client_pool import ClientPool
+from language_detect import detect_language as detect_script_language
+from tts_cache import TTSCache
+from response_cache import ResponseCache
+from faq_index import FAQIndex
+from chat_sessions import SessionStore, estimate_tokens
+from rate_governor import RateGovernor
+from audio_preprocess import AudioPreprocessor, PASSTHROUGH_ENCODING, PASSTHROUGH_SAMPLE_RATE
+import metrics
+import tracing
+from concurrent.futures import ThreadPoolExecutor
+import base64
 import os
+import queue
+import re
+import threading
+import time
 import logging
 
 logger = logging.getLogger(__name__)
 
+GROQ_MODEL = 'llama-3.3-70b-versatile'  # Currently active model (Oct 2024+)
+
+# Per-stage timeouts in seconds, so one slow provider can't hold a chatbot worker indefinitely
+STT_TIMEOUT = float(os.getenv('STT_TIMEOUT', '20'))
+LLM_TIMEOUT = float(os.getenv('LLM_TIMEOUT', '30'))
+TTS_TIMEOUT = float(os.getenv('TTS_TIMEOUT', '15'))
+
+# When the LLM quota is exhausted, a looser FAQ match is better than no answer
+DEGRADED_FAQ_MIN_SCORE = float(os.getenv('DEGRADED_FAQ_MIN_SCORE', '0.45'))
+BUSY_MESSAGE = ("Many farmers are asking questions right now, so I can't answer this one immediately. "
+                "Please try again in a minute.")
+
+def groq_api_key():
+    groq_key = os.getenv('GROQ_API_KEY')
+    if groq_key and groq_key != 'your-groq-api-key-here':
+        return groq_key
+    return None
+
+def google_configured():
+    """Whether Google credentials are available for the speech clients"""
+    return os.path.exists(os.getenv('GOOGLE_APPLICATION_CREDENTIALS', 'google-credentials.json'))
+
+# Audio settings for every synthesized answer (part of the TTS cache key)
+TTS_AUDIO_SETTINGS = {
+    'speaking_rate': 0.9,  # Slightly slower for clarity
+    'pitch': 0.0,
+    'volume_gain_db': 0.0
+}
+
+# Sentence end: Latin punctuation or the Devanagari danda, followed by whitespace
+SENTENCE_END = re.compile(r'(?<=[.!?।॥])\s+')
+
+def iter_sentences(chunks, min_length=20):
+    """
+    Regroup streamed text chunks into sentences as soon as each one is complete
+    Very short sentences are merged into the next so TTS calls stay worthwhile
+    """
+    buffer = ''
+    for chunk in chunks:
+        buffer += chunk
+        parts = SENTENCE_END.split(buffer)
+        buffer = parts.pop()
+        pending = ''
+        for part in parts:
+            pending = f"{pending} {part}" if pending else part
+            if len(pending) >= min_length:
+                yield pending.strip()
+                pending = ''
+        if pending:
+            buffer = f"{pending} {buffer}"
+    if buffer.strip():
+        yield buffer.strip()
+
 class MultilingualChatbot:
     """Handles voice and text chatbot interactions in multiple Indian languages"""
     
-    def __init__(self):
-        # Set Google Cloud credentials path
-        credentials_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS', 'google-credentials.json')
-        if os.path.exists(credentials_path):
-            os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = credentials_path
-            logger.info(f"Using Google credentials: {credentials_path}")
-        else:
-            logger.warning(f"Google credentials not found at: {credentials_path}")
-        
-        try:
-            # Initialize Google Cloud clients
-            self.speech_client = speech.SpeechClient()
-            self.tts_client = texttospeech.TextToSpeechClient()
-            logger.info("Google Cloud clients initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize Google Cloud clients: {e}")
-            self.speech_client = None
-            self.tts_client = None
-        
-        # Initialize Groq (FREE API)
-        groq_key = os.getenv('GROQ_API_KEY')
-        if groq_key and groq_key != 'your-groq-api-key-here':
-            try:
-                self.client = Groq(api_key=groq_key)
-                self.model = 'llama-3.3-70b-versatile'  # Currently active model (Oct 2024+)
-                logger.info(f"Groq initialized successfully with model: {self.model}")
-            except Exception as e:
-                logger.error(f"Failed to initialize Groq: {e}")
-                self.client = None
-                self.model = None
+    def __init__(self, speech_client=None, tts_client=None, llm_client=None, llm_model=None,
+                 tts_cache=None, answer_cache=None, faq_index=None, audio_preprocessor=None,
+                 sessions=None, rate_governor=None):
+        """
+        Clients may be injected (e.g. local stand-ins); otherwise they are built
+        from the environment on first use, so importing this module stays cheap
+        """
+        if speech_client or tts_client or llm_client:
+            self.clients = ClientPool({
+                'speech': lambda: speech_client,
+                'tts': lambda: tts_client,
+                'llm': lambda: llm_client,
+                'faq_index': lambda: faq_index
+            }, configured={
+                'speech': lambda: speech_client is not None,
+                'tts': lambda: tts_client is not None,
+                'llm': lambda: llm_client is not None,
+                'faq_index': lambda: faq_index is not None
+            })
+            self.model = llm_model if llm_client else None
+            self.tts_cache = tts_cache
+            self.answer_cache = answer_cache
+            self.audio_preprocessor = audio_preprocessor
+            self.sessions = sessions
+            self.rate_governor = rate_governor
         else:
-            logger.warning("GROQ_API_KEY not found or not configured in environment")
-            self.client = None
-            self.model = None
+            self.clients = ClientPool({
+                'speech': self._create_speech_client,
+                'tts': self._create_tts_client,
+                'llm': self._create_groq_client,
+                'faq_index': (lambda: faq_index) if faq_index else FAQIndex.from_env
+            }, configured={
+                'speech': google_configured,
+                'tts': google_configured,
+                'llm': lambda: groq_api_key() is not None,
+                'faq_index': (lambda: True) if faq_index else FAQIndex.configured
+            })
+            self.model = GROQ_MODEL if groq_api_key() else None
+            self.tts_cache = tts_cache or TTSCache.from_env()
+            self.answer_cache = answer_cache or ResponseCache.from_env()
+            self.audio_preprocessor = audio_preprocessor or AudioPreprocessor.from_env()
+            self.sessions = sessions or SessionStore.from_env()
+            self.rate_governor = rate_governor or RateGovernor.from_env(GROQ_MODEL)
         
         # Language code mapping for Google Cloud
         self.language_codes = {
@@ -79,6 +153,52 @@ class MultilingualChatbot:
             'en-IN': 'en-IN-Wavenet-D',       # English male
         }
     
+    @property
+    def speech_client(self):
+        return self.clients.get('speech')
+    
+    @property
+    def tts_client(self):
+        return self.clients.get('tts')
+    
+    @property
+    def client(self):
+        return self.clients.get('llm')
+    
+    @property
+    def faq_index(self):
+        return self.clients.get('faq_index')
+    
+    @staticmethod
+    def _use_google_credentials():
+        """Point the Google client libraries at the credentials file"""
+        credentials_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS', 'google-credentials.json')
+        if os.path.exists(credentials_path):
+            os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = credentials_path
+            logger.info(f"Using Google credentials: {credentials_path}")
+        else:
+            logger.warning(f"Google credentials not found at: {credentials_path}")
+    
+    def _create_speech_client(self):
+        from google.cloud import speech_v1p1beta1 as speech
+        self._use_google_credentials()
+        return speech.SpeechClient()
+    
+    def _create_tts_client(self):
+        from google.cloud import texttospeech
+        self._use_google_credentials()
+        return texttospeech.TextToSpeechClient()
+    
+    def _create_groq_client(self):
+        """Groq (FREE API) client, or None when no key is configured"""
+        groq_key = groq_api_key()
+        if not groq_key:
+            logger.warning("GROQ_API_KEY not found or not configured in environment")
+            self.model = None
+            return None
+        from groq import Groq
+        return Groq(api_key=groq_key, timeout=LLM_TIMEOUT, max_retries=1)
+    
     def speech_to_text(self, audio_content, language_hint='en-IN'):
         """
         Convert speech audio to text using Google Cloud Speech-to-Text
@@ -87,13 +207,18 @@ class MultilingualChatbot:
         if not self.speech_client:
             return None, "Speech client not initialized"
         
+        if self.rate_governor and not self.rate_governor.acquire({'google:stt:requests': 1}):
+            return None, "Speech service is busy, please try again shortly"
+        
+        from google.cloud import speech_v1p1beta1 as speech
         try:
-            audio = speech.RecognitionAudio(content=audio_content)
+            prepared = self.prepare_audio(audio_content)
+            audio = speech.RecognitionAudio(content=prepared['content'])
             
             # Configure recognition with multiple language support
             config = speech.RecognitionConfig(
-                encoding=speech.RecognitionConfig.AudioEncoding.WEBM_OPUS,
-                sample_rate_hertz=48000,
+                encoding=getattr(speech.RecognitionConfig.AudioEncoding, prepared['encoding']),
+                sample_rate_hertz=prepared['sample_rate'],
                 language_code=language_hint,
                 alternative_language_codes=[
                     'hi-IN', 'te-IN', 'ta-IN', 'kn-IN', 'mr-IN',
@@ -104,7 +229,8 @@ class MultilingualChatbot:
             )
             
             # Recognize speech
-            response = self.speech_client.recognize(config=config, audio=audio)
+            with metrics.upstream('google_stt'):
+                response = self.speech_client.recognize(config=config, audio=audio, timeout=STT_TIMEOUT)
             
             if response.results:
                 transcript = response.results[0].alternatives[0].transcript
@@ -116,12 +242,25 @@ class MultilingualChatbot:
                 
         except Exception as e:
             logger.error(f"Speech-to-text error: {e}")
+            self._provider_rate_limited(e, 'google:stt')
             return None, str(e)
     
+    def prepare_audio(self, audio_content):
+        """Trimmed, resampled recording for STT (unchanged WEBM/Opus without a preprocessor)"""
+        if not self.audio_preprocessor:
+            return {'content': audio_content, 'encoding': PASSTHROUGH_ENCODING,
+                    'sample_rate': PASSTHROUGH_SAMPLE_RATE}
+        
+        with tracing.span('compute:prepare_audio'):
+            prepared = self.audio_preprocessor.process(audio_content)
+        logger.info(f"Audio prepared: {prepared['stats']}")
+        return prepared
+    
     def detect_language(self, text):
-        """Detect language of text using langdetect"""
+        """Detect language of text from its script (see language_detect)"""
         try:
-            lang = detect(text)
+            with tracing.span('compute:detect_language'):
+                lang = detect_script_language(text)
             language_code = self.language_codes.get(lang, 'en-IN')
             logger.info(f"Detected language: {lang} → {language_code}")
             return language_code
@@ -129,19 +268,15 @@ class MultilingualChatbot:
             logger.error(f"Language detection error: {e}")
             return 'en-IN'
     
-    def generate_response(self, user_message, context=None):
+    def _build_messages(self, user_message, context=None, session=None):
         """
-        Generate AI response using Groq with farming context
-        Context includes: location, soil, season, recommended crops
+        Build the chat messages for a farming question; with a session, earlier
+        turns go between the system prompt and the question
         """
-        if not self.client or not self.model:
-            return "AI service not available. Please configure GROQ_API_KEY in the .env file."
+        # Build context-aware prompt
+        context = context or {}
         
-        try:
-            # Build context-aware prompt
-            context = context or {}
-            
-            system_prompt = """You are an expert agricultural advisor helping Indian farmers with crop recommendations and farming questions.
+        system_prompt = """You are an expert agricultural advisor helping Indian farmers with crop recommendations and farming questions.
 
 Key Instructions:
 1. Answer in the SAME language as the user's question (support Hindi, Telugu, Tamil, Kannada, Marathi, Bengali, Gujarati, Malayalam, Punjabi, English)
@@ -150,8 +285,8 @@ Key Instructions:
 4. If asked about crops, reference the recommended crops from context
 5. Focus on actionable farming advice
 6. Be culturally sensitive to Indian farming practices"""
-            
-            user_prompt = f"""Context Information:
+        
+        user_prompt = f"""Context Information:
 - Location: {context.get('state', 'Unknown')}, {context.get('district', 'Unknown')}
 - Soil Type: {context.get('soil_type', 'Not specified')}
 - Current Season: {context.get('season', 'Not specified')}
@@ -160,35 +295,207 @@ Key Instructions:
 - Humidity: {context.get('humidity', 'Unknown')}%
 
 User Question: {user_message}"""
-
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_tokens=300,
-                temperature=0.7
-            )
+        
+        messages = [{"role": "system", "content": system_prompt}]
+        if session:
+            summary, turns = session.history()
+            if summary:
+                earlier = '\n'.join(f"- {question}" for question in summary)
+                messages.append({"role": "system", "content": f"Earlier in this conversation the farmer asked:\n{earlier}"})
+            for question, answer in turns:
+                messages.append({"role": "user", "content": question})
+                messages.append({"role": "assistant", "content": answer})
+        messages.append({"role": "user", "content": user_prompt})
+        return messages
+    
+    def remember_turn(self, session, question, answer):
+        """Add a completed question/answer to the session history"""
+        if session and self.sessions and answer:
+            self.sessions.add_turn(session, question, answer)
+    
+    def _llm_quota(self, messages, max_tokens):
+        """Reserve Groq request and token quota for a completion; False when it can't be had in time"""
+        if not self.rate_governor:
+            return True
+        tokens = sum(estimate_tokens(message['content']) for message in messages) + max_tokens
+        return self.rate_governor.acquire({f'groq:{self.model}:requests': 1, f'groq:{self.model}:tokens': tokens})
+    
+    def _provider_rate_limited(self, error, prefix):
+        """Hold back a provider's buckets when it answered 429 despite the governor"""
+        if not self.rate_governor:
+            return
+        if 429 not in (getattr(error, 'status_code', None), getattr(error, 'code', None)):
+            return
+        response = getattr(error, 'response', None)
+        try:
+            retry_after = float(response.headers.get('retry-after', 10))
+        except (AttributeError, TypeError, ValueError):
+            retry_after = 10.0
+        logger.warning(f"{prefix} rate limited by the provider, pausing for {retry_after} s")
+        self.rate_governor.pause(prefix, retry_after)
+    
+    def degraded_answer(self, user_message):
+        """Answer when the LLM quota is exhausted: the closest FAQ entry, or a busy notice"""
+        if self.faq_index:
+            language = self.detect_language(user_message).split('-')[0].lower()
+            match = self.faq_index.lookup(user_message, language, min_score=DEGRADED_FAQ_MIN_SCORE)
+            if match:
+                logger.info(f"LLM quota exhausted, degraded to FAQ {match['id']} (score {match['score']})")
+                return match['answer']
+        return BUSY_MESSAGE
+    
+    def faq_answer(self, text, language_code='en-IN'):
+        """Curated answer for a common question, or None when no FAQ entry matches well enough"""
+        if not self.faq_index:
+            return None
+        
+        with tracing.span('compute:faq_lookup'):
+            match = self.faq_index.lookup(text, language_code.split('-')[0].lower())
+        metrics.record_cache('faq', 'hit' if match else 'miss')
+        if match:
+            logger.info(f"FAQ hit: {match['id']} (score {match['score']})")
+            return match['answer']
+        return None
+    
+    def generate_response(self, user_message, context=None, session=None):
+        """
+        Generate AI response using Groq with farming context
+        Context includes: location, soil, season, recommended crops
+        """
+        if not self.client or not self.model:
+            return "AI service not available. Please configure GROQ_API_KEY in the .env file."
+        
+        # Follow-up questions depend on the conversation, so only fresh ones are cached
+        use_cache = self.answer_cache and not (session and session.has_history)
+        if use_cache:
+            cached_answer = self.answer_cache.get(user_message, context)
+            metrics.record_cache('answer', 'miss' if cached_answer is None else 'hit')
+            if cached_answer is not None:
+                logger.info(f"Answer cache hit: {cached_answer[:100]}...")
+                self.remember_turn(session, user_message, cached_answer)
+                return cached_answer
+        
+        messages = self._build_messages(user_message, context, session)
+        if not self._llm_quota(messages, 300):
+            return self.degraded_answer(user_message)
+        
+        try:
+            with metrics.upstream('groq'):
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    max_tokens=300,
+                    temperature=0.7
+                )
             
             answer = response.choices[0].message.content.strip()
             logger.info(f"Generated response: {answer[:100]}...")
+            if use_cache and answer:
+                self.answer_cache.put(user_message, context, answer)
+            self.remember_turn(session, user_message, answer)
             return answer
             
         except Exception as e:
             logger.error(f"Response generation error: {e}")
+            self._provider_rate_limited(e, 'groq')
             return f"I'm having trouble generating a response. Error: {str(e)}"
     
+    def stream_response(self, user_message, context=None, session=None):
+        """
+        Generate AI response as a stream of text chunks
+        Uses Groq streaming completions so tokens can be forwarded as they arrive
+        """
+        if not self.client or not self.model:
+            yield "AI service not available. Please configure GROQ_API_KEY in the .env file."
+            return
+        
+        use_cache = self.answer_cache and not (session and session.has_history)
+        if use_cache:
+            cached_answer = self.answer_cache.get(user_message, context)
+            metrics.record_cache('answer', 'miss' if cached_answer is None else 'hit')
+            if cached_answer is not None:
+                logger.info(f"Answer cache hit: {cached_answer[:100]}...")
+                self.remember_turn(session, user_message, cached_answer)
+                yield cached_answer
+                return
+        
+        messages = self._build_messages(user_message, context, session)
+        if not self._llm_quota(messages, 300):
+            yield self.degraded_answer(user_message)
+            return
+        
+        try:
+            chunks = []
+            with metrics.upstream('groq_stream'):  # time to the last token
+                stream = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    max_tokens=300,
+                    temperature=0.7,
+                    stream=True
+                )
+                for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        chunks.append(chunk.choices[0].delta.content)
+                        yield chunk.choices[0].delta.content
+            
+            answer = ''.join(chunks).strip()
+            if use_cache and answer:
+                self.answer_cache.put(user_message, context, answer)
+            self.remember_turn(session, user_message, answer)
+                    
+        except Exception as e:
+            logger.error(f"Streaming response error: {e}")
+            self._provider_rate_limited(e, 'groq')
+            yield f"I'm having trouble generating a response. Error: {str(e)}"
+    
     def text_to_speech(self, text, language_code='en-IN'):
-        """Convert text to speech using Google Cloud Text-to-Speech"""
+        """Convert text to speech using Google Cloud Text-to-Speech (served from the TTS cache when possible)"""
+        voice_name = self.voice_mapping.get(language_code, 'en-IN-Wavenet-D')
+        
+        cache_key = None
+        if self.tts_cache:
+            cache_key = self.tts_cache.make_key(text, language_code, voice_name, TTS_AUDIO_SETTINGS)
+            cached_audio = self.tts_cache.get(cache_key)
+            metrics.record_cache('tts', 'miss' if cached_audio is None else 'hit')
+            if cached_audio is not None:
+                logger.info(f"TTS cache hit for language: {language_code}")
+                return cached_audio, None
+        
+        return self._synthesize(text, language_code, voice_name, cache_key)
+    
+    def text_to_speech_key(self, text, language_code='en-IN'):
+        """
+        Synthesize into the TTS cache and return the cache key instead of the bytes,
+        so the audio can be streamed from disk by the audio endpoint
+        """
+        if not self.tts_cache:
+            return None, "TTS cache not configured"
+        
+        voice_name = self.voice_mapping.get(language_code, 'en-IN-Wavenet-D')
+        cache_key = self.tts_cache.make_key(text, language_code, voice_name, TTS_AUDIO_SETTINGS)
+        cached_path = self.tts_cache.get_path(cache_key)
+        metrics.record_cache('tts', 'hit' if cached_path else 'miss')
+        if cached_path:
+            logger.info(f"TTS cache hit for language: {language_code}")
+            return cache_key, None
+        
+        _, error = self._synthesize(text, language_code, voice_name, cache_key)
+        return (None, error) if error else (cache_key, None)
+    
+    def _synthesize(self, text, language_code, voice_name, cache_key=None):
+        """Call Google Cloud Text-to-Speech and store the MP3 under cache_key"""
         if not self.tts_client:
             return None, "TTS client not initialized"
         
+        if self.rate_governor and not self.rate_governor.acquire({'google:tts:requests': 1}):
+            return None, "Text-to-speech is busy, please try again shortly"
+        
+        from google.cloud import texttospeech
         try:
             synthesis_input = texttospeech.SynthesisInput(text=text)
             
             # Select voice for the language
-            voice_name = self.voice_mapping.get(language_code, 'en-IN-Wavenet-D')
             voice = texttospeech.VoiceSelectionParams(
                 language_code=language_code,
                 name=voice_name
@@ -197,29 +504,34 @@ User Question: {user_message}"""
             # Configure audio output
             audio_config = texttospeech.AudioConfig(
                 audio_encoding=texttospeech.AudioEncoding.MP3,
-                speaking_rate=0.9,  # Slightly slower for clarity
-                pitch=0.0,
-                volume_gain_db=0.0
+                **TTS_AUDIO_SETTINGS
             )
             
             # Generate speech
-            response = self.tts_client.synthesize_speech(
-                input=synthesis_input,
-                voice=voice,
-                audio_config=audio_config
-            )
+            with metrics.upstream('google_tts'):
+                response = self.tts_client.synthesize_speech(
+                    input=synthesis_input,
+                    voice=voice,
+                    audio_config=audio_config,
+                    timeout=TTS_TIMEOUT
+                )
+            
+            if cache_key:
+                self.tts_cache.put(cache_key, response.audio_content)
             
             logger.info(f"Generated TTS audio for language: {language_code}")
             return response.audio_content, None
             
         except Exception as e:
             logger.error(f"Text-to-speech error: {e}")
+            self._provider_rate_limited(e, 'google:tts')
             return None, str(e)
     
-    def process_voice_query(self, audio_content, context=None):
+    def process_voice_query(self, audio_content, context=None, audio_as_key=False):
         """
         Complete voice processing pipeline:
         Voice Input → Text → AI Response → Voice Output
+        With audio_as_key the result carries a TTS cache key instead of the audio bytes
         """
         logger.info("Processing voice query...")
         
@@ -228,11 +540,16 @@ User Question: {user_message}"""
         if not text:
             return {"success": False, "error": f"Could not transcribe audio: {language_code}"}
         
-        # Step 2: Generate AI response with context
-        response_text = self.generate_response(text, context)
+        # Step 2: Answer from the FAQ, or generate AI response with context
+        response_text = self.faq_answer(text, language_code) or self.generate_response(text, context)
         
         # Step 3: Convert response to speech
-        audio_response, error = self.text_to_speech(response_text, language_code)
+        audio_key = None
+        if audio_as_key:
+            audio_response = None
+            audio_key, error = self.text_to_speech_key(response_text, language_code)
+        else:
+            audio_response, error = self.text_to_speech(response_text, language_code)
         if error:
             return {
                 "success": True,
@@ -248,23 +565,164 @@ User Question: {user_message}"""
             "user_text": text,
             "language": language_code,
             "response_text": response_text,
-            "audio_response": audio_response
+            "audio_response": audio_response,
+            "audio_key": audio_key
         }
     
-    def process_text_query(self, text, context=None):
-        """Process text-only query (no voice)"""
+    def process_voice_query_stream(self, audio_content, context=None, tts_workers=2, audio_as_key=False):
+        """
+        Pipelined voice processing as (event, data) pairs:
+        the response is split into sentences while it streams from the LLM and
+        each sentence is synthesized while the next is still being generated.
+        Emits 'transcript', then 'audio' per sentence in order, then 'done'
+        """
+        synthesize = self.text_to_speech_key if audio_as_key else self.text_to_speech
+        logger.info("Processing streamed voice query...")
+        start = time.perf_counter()
+        
+        # Step 1: Convert speech to text
+        text, language_code = self.speech_to_text(audio_content)
+        if not text:
+            yield 'error', {"success": False, "error": f"Could not transcribe audio: {language_code}"}
+            return
+        
+        transcript_ms = round((time.perf_counter() - start) * 1000, 1)
+        yield 'transcript', {"user_text": text, "language": language_code}
+        
+        # Steps 2 + 3: a producer thread splits the streamed response into sentences
+        # and queues their TTS jobs; audio is forwarded in order as each job finishes
+        sentences = []
+        jobs = queue.Queue()
+        stopped = threading.Event()
+        first_audio_ms = None
+        
+        def until_stopped(chunks):
+            for chunk in chunks:
+                if stopped.is_set():
+                    break
+                yield chunk
+        
+        def produce(executor):
+            answer = None
+            try:
+                faq_answer = self.faq_answer(text, language_code)
+                answer = [faq_answer] if faq_answer else self.stream_response(text, context)
+                for sentence in iter_sentences(until_stopped(answer)):
+                    sentences.append(sentence)
+                    jobs.put((sentence, executor.submit(synthesize, sentence, language_code)))
+            except Exception as e:
+                logger.error(f"Voice stream producer error: {e}", exc_info=True)
+                jobs.put(e)
+            finally:
+                if hasattr(answer, 'close'):
+                    answer.close()  # ends the Groq stream early when the client has gone
+                jobs.put(None)
+        
+        executor = ThreadPoolExecutor(max_workers=tts_workers + 1, thread_name_prefix='voice')
+        try:
+            executor.submit(produce, executor)
+            for index, item in enumerate(iter(jobs.get, None)):
+                if isinstance(item, Exception):
+                    yield 'error', {"success": False, "error": f"Could not generate the answer: {item}"}
+                    return
+                sentence, job = item
+                audio, error = job.result()
+                if first_audio_ms is None:
+                    first_audio_ms = round((time.perf_counter() - start) * 1000, 1)
+                
+                event = {"index": index, "text": sentence}
+                if audio_as_key:
+                    event["audio_key"] = audio
+                else:
+                    event["audio"] = base64.b64encode(audio).decode('utf-8') if audio else None
+                if error:
+                    event["error"] = f"TTS error: {error}"
+                yield 'audio', event
+        finally:
+            # Normally everything has finished; on an error or a client disconnect
+            # (GeneratorExit) stop the LLM stream and drop TTS jobs not yet started
+            stopped.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        yield 'done', {
+            "success": True,
+            "user_text": text,
+            "language": language_code,
+            "response_text": ' '.join(sentences),
+            "chunks": len(sentences),
+            "timing": {
+                "transcript_ms": transcript_ms,
+                "first_audio_ms": first_audio_ms,
+                "total_ms": round((time.perf_counter() - start) * 1000, 1)
+            }
+        }
+    
+    def process_text_query(self, text, context=None, session=None):
+        """Process text-only query (no voice); with a session, history and context come from it"""
         logger.info(f"Processing text query: {text[:50]}...")
+        if session:
+            context = session.context
         
         # Detect language
         language_code = self.detect_language(text)
         
+        # Common questions are answered from the FAQ without calling the LLM
+        response_text = self.faq_answer(text, language_code)
+        source = 'faq' if response_text else 'llm'
+        
         # Generate response
-        response_text = self.generate_response(text, context)
+        if response_text:
+            self.remember_turn(session, text, response_text)
+        else:
+            response_text = self.generate_response(text, context, session)
         
         return {
             "success": True,
             "language": language_code,
-            "response_text": response_text
+            "response_text": response_text,
+            "source": source,
+            "session_id": session.id if session else None
+        }
+
+    def stream_text_query(self, text, context=None, session=None):
+        """
+        Stream a text-only query as (event, data) pairs:
+        'token' events carry response chunks, a closing 'done' event carries
+        the language, full response and timings in milliseconds
+        """
+        logger.info(f"Streaming text query: {text[:50]}...")
+        start = time.perf_counter()
+        if session:
+            context = session.context
+        
+        language_code = self.detect_language(text)
+        
+        faq_answer = self.faq_answer(text, language_code)
+        if faq_answer:
+            self.remember_turn(session, text, faq_answer)
+        answer = [faq_answer] if faq_answer else self.stream_response(text, context, session)
+        
+        chunks = []
+        first_token_ms = None
+        for chunk in answer:
+            if first_token_ms is None:
+                first_token_ms = round((time.perf_counter() - start) * 1000, 1)
+            chunks.append(chunk)
+            yield 'token', {"text": chunk}
+        
+        response_text = ''.join(chunks).strip()
+        logger.info(f"Streamed response: {response_text[:100]}...")
+        
+        yield 'done', {
+            "success": True,
+            "language": language_code,
+            "response_text": response_text,
+            "source": 'faq' if faq_answer else 'llm',
+            "session_id": session.id if session else None,
+            "timing": {
+                "first_token_ms": first_token_ms,
+                "total_ms": round((time.perf_counter() - start) * 1000, 1)
+            }
         }
 
 # Global chatbot instance
@@ -0,0 +1,76 @@
+"""
+Lazily created, shared provider clients (and other slow-to-build resources)
+Each client is built by its factory on first use and then reused by every
+thread: Google's gRPC clients and Groq's HTTP client are thread-safe and keep
+their connections open, so one instance per process is all a worker needs
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class ClientPool:
+    """Named clients built on first get(); failed builds are retried after retry_after seconds"""
+
+    def __init__(self, factories, retry_after=60, configured=None):
+        self.factories = dict(factories)  # name -> callable returning a client or None
+        self.configured = dict(configured or {})  # name -> cheap check that a build could succeed
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.clients = {}
+        self.failed_at = {}
+
+    def get(self, name):
+        """The client, built now if needed; None when unconfigured or its build failed"""
+        client = self.clients.get(name)
+        if client is not None or name in self.clients:
+            return client
+
+        with self.lock:
+            if name in self.clients:
+                return self.clients[name]
+            if time.monotonic() - self.failed_at.get(name, float('-inf')) < self.retry_after:
+                return None
+
+            start = time.perf_counter()
+            try:
+                client = self.factories[name]()
+            except Exception as e:
+                logger.error(f"Failed to initialize {name} client: {e}")
+                self.failed_at[name] = time.monotonic()
+                return None
+            self.clients[name] = client
+            if client is not None:
+                logger.info(f"{name} client initialized in {(time.perf_counter() - start) * 1000:.0f} ms")
+            return client
+
+    def peek(self, name):
+        """The client if it has already been built, never building it"""
+        return self.clients.get(name)
+
+    def available(self, name):
+        """Whether the client is (or, from its configuration, should be) usable, without building it"""
+        with self.lock:
+            if name in self.clients:
+                return self.clients[name] is not None
+            if name in self.failed_at:
+                return False
+        check = self.configured.get(name)
+        return bool(check()) if check else False
+
+    def set(self, name, client):
+        """Use an existing client (e.g. a local stand-in) instead of the factory"""
+        with self.lock:
+            self.clients[name] = client
+            self.failed_at.pop(name, None)
+
+    def status(self):
+        """'ready', 'unavailable' or 'not_started' for every client"""
+        with self.lock:
+            return {
+                name: ('ready' if self.clients[name] is not None else 'unavailable') if name in self.clients
+                else 'unavailable' if name in self.failed_at else 'not_started'
+                for name in self.factories
+            }
@@ -6,7 +6,7 @@ load_dotenv()
 
 class Config:
     # Bhuvan API Configuration
-    BHUVAN_BASE_URL = "https://bhuvan-app1.nrsc.gov.in/api"
+    BHUVAN_BASE_URL = os.getenv("BHUVAN_BASE_URL", "https://bhuvan-app1.nrsc.gov.in/api")
     VILLAGE_GEOCODE_KEY = os.getenv("VILLAGE_GEOCODE_KEY", "17b3489fd6d3f21ab7dbb742b5895a7992c82408")
     VILLAGE_REVERSE_KEY = os.getenv("VILLAGE_REVERSE_KEY", "841161352a10474f450a93489cee0d62caceaa25")
     LULC_STATS_KEY = os.getenv("LULC_STATS_KEY", "9d7052346513404b8f4c4dee78f5ed3204c5846b")
@@ -14,10 +14,14 @@ class Config:
     
     # OpenWeatherMap Configuration
     OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY")
-    OPENWEATHER_BASE_URL = "https://api.openweathermap.org/data/2.5"
+    OPENWEATHER_BASE_URL = os.getenv("OPENWEATHER_BASE_URL", "https://api.openweathermap.org/data/2.5")
     
     # Mandi API Configuration
     MANDI_API_KEY = os.getenv("MANDI_API_KEY", "579b464db66ec23bdd000001765e5653dd0a49c3603fa05bf7aa5f6c")
+    DATA_GOV_BASE_URL = os.getenv("DATA_GOV_BASE_URL", "https://api.data.gov.in/resource")
+    
+    # SoilGrids Configuration
+    SOILGRIDS_BASE_URL = os.getenv("SOILGRIDS_BASE_URL", "https://rest.isric.org/soilgrids/v2.0")
     
     # Application Configuration
     DEBUG = True
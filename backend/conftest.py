@@ -0,0 +1,11 @@
+"""
+Send the logs written during test runs (app.log and the logs/<module>.log
+files routed at import time) and the chat session database to a temporary
+directory, not the tracked logs/ or the local cache/
+"""
+import os
+import tempfile
+
+TEST_DIR = tempfile.mkdtemp(prefix='crop-backend-test-')
+os.environ.setdefault('LOG_DIR', TEST_DIR)
+os.environ.setdefault('CHAT_SESSION_DB', os.path.join(TEST_DIR, 'chat_sessions.db'))
@@ -0,0 +1,136 @@
+"""
+Local FAQ retrieval for common farming questions
+TF-IDF over character n-grams of every question variant in data/faq.json,
+held as a sparse matrix so a lookup is one sparse dot product
+"""
+
+import json
+import logging
+import os
+
+import numpy as np
+
+from response_cache import is_negated, normalize_question
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_FAQ_PATH = os.path.join(BASE_DIR, 'data', 'faq.json')
+
+class FAQIndex:
+    """Answers questions that closely match a curated FAQ entry"""
+
+    def __init__(self, path=DEFAULT_FAQ_PATH, min_score=0.5, candidates=5):
+        self.min_score = min_score
+        self.candidates = candidates
+
+        with open(path, encoding='utf-8') as f:
+            corpus = json.load(f)
+        self.entries = corpus['entries']
+
+        # One row per question variant, remembering its entry and language
+        questions, self.row_entry, self.row_language = [], [], []
+        for i, entry in enumerate(self.entries):
+            for language, variants in entry['questions'].items():
+                for question in variants:
+                    questions.append(normalize_question(question))
+                    self.row_entry.append(i)
+                    self.row_language.append(language)
+        self.row_entry = np.array(self.row_entry)
+
+        # char_wb n-grams work across scripts and tolerate spelling variants
+        from sklearn.feature_extraction.text import TfidfVectorizer  # slow import, only once built
+        self.vectorizer = TfidfVectorizer(analyzer='char_wb', ngram_range=(2, 4), sublinear_tf=True)
+        self.matrix = self.vectorizer.fit_transform(questions).tocsr()
+
+        # Crop names decide whether a crop-specific answer applies to a question
+        self.entry_keywords = [
+            frozenset(normalize_question(k) for k in entry.get('keywords', [])) for entry in self.entries
+        ]
+        self.crop_terms = frozenset(normalize_question(t) for t in corpus.get('crop_terms', []))
+        self.crop_terms |= frozenset().union(*self.entry_keywords)
+
+        # Likewise the action ("sow", "harvest", "sell") decides whether a same-crop answer applies:
+        # an entry needs one of its intents, and the question may only name actions its variants name
+        self.entry_intents = [
+            frozenset(normalize_question(t) for t in entry.get('intents', [])) for entry in self.entries
+        ]
+        self.intent_terms = frozenset(normalize_question(t) for t in corpus.get('intent_terms', []))
+        self.intent_terms |= frozenset().union(*self.entry_intents)
+        self.entry_actions = [set() for _ in self.entries]
+        self.row_negated = []
+        for entry_index, question in zip(self.row_entry, questions):
+            self.entry_actions[entry_index] |= self._mentioned(self.intent_terms, question.split())
+            self.row_negated.append(is_negated(question.split()))
+        logger.info(f"FAQ index built: {len(self.entries)} entries, {len(questions)} questions")
+
+    @staticmethod
+    def configured():
+        """Whether from_env() would build an index, without loading the FAQ file"""
+        return float(os.getenv('FAQ_MIN_SCORE', '0.5')) > 0 and os.path.exists(os.getenv('FAQ_PATH', DEFAULT_FAQ_PATH))
+
+    @classmethod
+    def from_env(cls):
+        """Build the index from FAQ_PATH / FAQ_MIN_SCORE (FAQ_MIN_SCORE=0 disables it)"""
+        if not cls.configured():
+            return None
+        return cls(os.getenv('FAQ_PATH', DEFAULT_FAQ_PATH), float(os.getenv('FAQ_MIN_SCORE', '0.5')))
+
+    @staticmethod
+    def _mentioned(terms, tokens):
+        # Prefix match so inflected forms count ("వరికి" mentions "వరి", "sowing" mentions "sow")
+        return {t for t in terms if any(token.startswith(t) for token in tokens)}
+
+    def lookup(self, question, language=None, min_score=None):
+        """
+        Best matching entry as {'id', 'answer', 'language', 'score'}, or None
+        The answer is in the requested language when available, otherwise in
+        the language of the matched question variant; min_score overrides the
+        index threshold for this lookup
+        """
+        min_score = self.min_score if min_score is None else min_score
+        question = normalize_question(question)
+        if not question:
+            return None
+
+        scores = (self.matrix @ self.vectorizer.transform([question]).T).toarray().ravel()
+        tokens = question.split()
+        mentioned = self._mentioned(self.crop_terms, tokens)
+        actions = self._mentioned(self.intent_terms, tokens)
+        negated = is_negated(tokens)
+
+        seen = set()
+        for row in np.argsort(scores)[::-1][:self.candidates]:
+            score = scores[row]
+            if score < min_score:
+                break
+            entry_index = self.row_entry[row]
+            if entry_index in seen:
+                continue
+            seen.add(entry_index)
+
+            # Crop-specific answers only apply when the question names that crop
+            keywords = self.entry_keywords[entry_index]
+            if keywords and not mentioned & keywords:
+                continue
+            # ...and only to the action they answer ("when to harvest wheat" is not sowing time)
+            intents = self.entry_intents[entry_index]
+            if intents and not actions & intents:
+                continue
+            if not actions <= self.entry_actions[entry_index]:
+                continue
+            # "when should I not sow wheat" is not asking for the sowing time
+            if negated and not self.row_negated[row]:
+                continue
+
+            entry = self.entries[entry_index]
+            answer_language = language if language in entry['answers'] else self.row_language[row]
+            if answer_language not in entry['answers']:
+                continue
+            return {
+                'id': entry['id'],
+                'answer': entry['answers'][answer_language],
+                'language': answer_language,
+                'score': round(float(score), 3)
+            }
+        return None
@@ -0,0 +1,98 @@
+"""
+Script-based language detection for the chatbot's supported languages
+One pass over the text counts letters per Unicode script block; the script
+decides the language except for Devanagari (Hindi vs Marathi) and Latin
+(English vs romanized Hindi), which are settled by marker words and, for
+Devanagari ties only, the langdetect n-gram model
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Indic blocks are 128 code points wide and aligned, so ord(ch) >> 7 indexes them
+INDIC_BLOCKS = {
+    0x0900 >> 7: 'deva',  # Devanagari: Hindi / Marathi
+    0x0980 >> 7: 'bn',    # Bengali
+    0x0A00 >> 7: 'pa',    # Gurmukhi: Punjabi
+    0x0A80 >> 7: 'gu',    # Gujarati
+    0x0B00 >> 7: 'or',    # Odia (not supported: answered in English)
+    0x0B80 >> 7: 'ta',    # Tamil
+    0x0C00 >> 7: 'te',    # Telugu
+    0x0C80 >> 7: 'kn',    # Kannada
+    0x0D00 >> 7: 'ml',    # Malayalam
+}
+
+HINDI_MARKERS = frozenset(
+    'है हैं था थी थे में की का के को से क्या कैसे कितना कितनी कितने चाहिए नहीं और '
+    'मेरे मेरा मेरी मुझे करें करना होगी होगा कौन कौनसी कब'.split()
+)
+MARATHI_MARKERS = frozenset(
+    'आहे आहेत होते काय कसे कशी किती नाही आणि माझ्या माझा माझी माझे मला तुम्ही '
+    'कोणते कोणता कोणती येईल करावे द्यावे पाहिजे कधी'.split()
+)
+MARATHI_SUFFIXES = ('ावे', 'ायला', 'च्या', 'मध्ये')
+
+# Romanized Hindi as typed on phones ("gehu mein kitna pani dena chahiye")
+HINGLISH_MARKERS = frozenset(
+    'hai hain kya kaise kab kitna kitni kitne mein mai nahi nahin chahiye karna kare karein '
+    'kaun konsi kaunsi mera meri mere mujhe aur bhi ko se wala wali hoga hogi fasal kheti '
+    'khet pani khad beej bhav barish kisan'.split()
+)
+
+def _script_counts(text):
+    """Letters per script in one pass: ({script: count}, latin_count)"""
+    counts = {}
+    latin = 0
+    for ch in text:
+        cp = ord(ch)
+        if cp < 0x250:
+            if ch.isalpha():
+                latin += 1
+        elif 0x0900 <= cp < 0x0D80:
+            script = INDIC_BLOCKS[cp >> 7]
+            counts[script] = counts.get(script, 0) + 1
+    return counts, latin
+
+def _devanagari_language(text):
+    words = text.split()
+    hindi = sum(w in HINDI_MARKERS for w in words)
+    marathi = sum(w in MARATHI_MARKERS or w.endswith(MARATHI_SUFFIXES) for w in words)
+    marathi += text.count('ळ')  # common in Marathi, essentially absent in Hindi
+
+    if hindi != marathi:
+        return 'hi' if hindi > marathi else 'mr'
+    return _ngram_fallback(text, ('hi', 'mr'), default='hi')
+
+def _latin_language(text):
+    words = [w.strip('?!.,;:').lower() for w in text.split()]
+    markers = sum(w in HINGLISH_MARKERS for w in words)
+    if markers >= 2 and markers >= 0.25 * len(words):
+        return 'hi'
+    return 'en'
+
+def _ngram_fallback(text, candidates, default):
+    """Pick among candidates with langdetect's character n-gram profiles"""
+    try:
+        from langdetect import DetectorFactory, detect_langs
+        DetectorFactory.seed = 0  # deterministic results
+        for guess in detect_langs(text):
+            if guess.lang in candidates:
+                return guess.lang
+    except Exception as e:
+        logger.debug(f"n-gram language fallback failed: {e}")
+    return default
+
+def detect_language(text, default='en'):
+    """ISO 639-1 code of the text's language, e.g. 'hi', 'te', 'en'"""
+    counts, latin = _script_counts(text)
+    if counts:
+        script, letters = max(counts.items(), key=lambda item: item[1])
+        # A few English words inside an Indic sentence don't change its language
+        if letters >= 0.3 * latin:
+            if script == 'deva':
+                return _devanagari_language(text)
+            return script
+    if latin:
+        return _latin_language(text)
+    return default
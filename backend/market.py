@@ -1,5 +1,6 @@
 import requests
 from config import Config
+import metrics
 from utils import safe_api_request, retry_api_call, APILogger, cache
 from typing import Dict, Optional, List
 import json
@@ -9,12 +10,13 @@ logger = APILogger("logs/market.log")
 class MarketService:
     def __init__(self):
         self.api_key = Config.MANDI_API_KEY
-        self.base_url = "https://api.data.gov.in/resource"
+        self.base_url = Config.DATA_GOV_BASE_URL
     
     @retry_api_call(max_retries=3)
     def get_mandi_prices(self, state: str = None, district: str = None) -> Optional[Dict]:
         cache_key = f"mandi_prices_{state}_{district}"
         cached_result = cache.get(cache_key)
+        metrics.record_cache("mandi_prices", "hit" if cached_result else "miss")
         if cached_result:
             return cached_result
         
@@ -34,7 +36,7 @@ class MarketService:
             params["filters[district]"] = district
         
         try:
-            response = safe_api_request(url, params)
+            response = safe_api_request(url, params, provider="datagov")
             if response:
                 logger.log_api_call("mandi_prices", params, 200)
                 cache.set(cache_key, response)
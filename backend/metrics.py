@@ -0,0 +1,128 @@
+"""
+Prometheus metrics for the backend
+Histograms of /predict pipeline stages and of outbound provider calls (by
+outcome: ok/error/timeout), cache lookups by result and log volume per
+endpoint, served from /metrics through prometheus-flask-exporter. The same timers add spans to the request's
+trace when tracing is on (see tracing.py). Without prometheus_client installed
+every helper is a no-op, so call sites never need to check.
+
+Cache hit ratio, e.g. for the weather cache:
+    sum(rate(cache_lookups_total{cache="weather",result="hit"}[5m]))
+      / sum(rate(cache_lookups_total{cache="weather"}[5m]))
+"""
+
+import logging
+import os
+import time
+
+import tracing
+
+logger = logging.getLogger(__name__)
+
+try:
+    from prometheus_client import Counter, Histogram
+except ImportError:  # optional dependency
+    Counter = Histogram = None
+
+ENABLED = Histogram is not None and os.getenv('METRICS_ENABLED', 'True').lower() == 'true'
+
+if ENABLED:
+    STAGE_SECONDS = Histogram('predict_stage_seconds', "Time spent in each /predict pipeline stage", ['stage'])
+    UPSTREAM_SECONDS = Histogram('upstream_request_seconds', "Outbound provider call latency",
+                                 ['provider', 'outcome'],
+                                 buckets=(.01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30))
+    CACHE_LOOKUPS = Counter('cache_lookups_total', "Cache lookups by result", ['cache', 'result'])
+    LOG_RECORDS = Counter('log_records_total', "Log records written, by request endpoint", ['endpoint', 'level'])
+    LOG_BYTES = Counter('log_bytes_total', "Log message bytes written, by request endpoint", ['endpoint'])
+
+def is_timeout(error):
+    """requests, Groq and Google client timeouts share no base class, only naming"""
+    name = type(error).__name__
+    return isinstance(error, TimeoutError) or 'Timeout' in name or name == 'DeadlineExceeded'
+
+class _Timer:
+    __slots__ = ('histogram', 'labels', 'with_outcome', 'span', 'trace', 'outcome', 'started')
+
+    def __init__(self, histogram, labels, span, trace, with_outcome=False):
+        self.histogram = histogram  # None when only tracing
+        self.labels = labels
+        self.with_outcome = with_outcome
+        self.span = span
+        self.trace = trace
+        self.outcome = 'ok'  # callers set 'error' for failed calls that don't raise
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.started
+        if exc is not None and not isinstance(exc, GeneratorExit):  # a closed stream isn't a failure
+            self.outcome = 'timeout' if is_timeout(exc) else 'error'
+        if self.histogram is not None:
+            labels = (*self.labels, self.outcome) if self.with_outcome else self.labels
+            self.histogram.labels(*labels).observe(elapsed)
+        if self.trace is not None:
+            self.trace.add(self.span, self.started, elapsed, self.outcome if self.with_outcome else None)
+        return False
+
+class _NoOpTimer:
+    __slots__ = ('outcome',)
+
+    def __enter__(self):
+        self.outcome = 'ok'
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+def stage(name):
+    """with stage('weather'): ... times one /predict pipeline stage"""
+    trace = tracing.current()
+    if not ENABLED and trace is None:
+        return _NoOpTimer()
+    return _Timer(STAGE_SECONDS if ENABLED else None, (name,), f'stage:{name}', trace)
+
+def upstream(provider):
+    """
+    with upstream('openweather') as call: ... times an outbound call; raised
+    exceptions count as error/timeout, set call.outcome = 'error' for bad responses
+    """
+    trace = tracing.current()
+    if not ENABLED and trace is None:
+        return _NoOpTimer()
+    return _Timer(UPSTREAM_SECONDS if ENABLED else None, (provider,), f'upstream:{provider}', trace,
+                  with_outcome=True)
+
+def record_cache(cache, result):
+    """result is 'hit', 'miss' (or e.g. 'near_hit' for the answer cache)"""
+    if ENABLED:
+        CACHE_LOOKUPS.labels(cache, result).inc()
+
+class LogVolumeHandler(logging.Handler):
+    """Counts records and message bytes per endpoint; runs on the log listener thread"""
+
+    def emit(self, record):
+        endpoint = getattr(record, 'endpoint', None) or 'none'
+        LOG_RECORDS.labels(endpoint, record.levelname).inc()
+        LOG_BYTES.labels(endpoint).inc(len(record.getMessage().encode('utf-8')))
+
+def init_app(app):
+    """
+    Serve /metrics (plus per-endpoint request metrics) from the Flask app; with
+    PROMETHEUS_MULTIPROC_DIR set, gunicorn workers' metrics are aggregated
+    """
+    if not ENABLED:
+        logger.info("Metrics disabled (prometheus_client not installed or METRICS_ENABLED=False)")
+        return None
+    from src.utils.log_pipeline import add_handler
+    add_handler(LogVolumeHandler())
+    try:
+        if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+            from prometheus_flask_exporter.multiprocess import GunicornInternalPrometheusMetrics
+            return GunicornInternalPrometheusMetrics(app, group_by='endpoint')
+        from prometheus_flask_exporter import PrometheusMetrics
+        return PrometheusMetrics(app, group_by='endpoint')
+    except ImportError:
+        logger.warning("prometheus-flask-exporter not installed, /metrics not served")
+        return None
@@ -4,12 +4,15 @@ import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
 from typing import Dict, List
 import os
+import time
 from utils import APILogger
+from src.ml.registry import HotSwapMixin, ModelRegistry
 
 logger = APILogger("logs/model.log")
 
-class CropRecommendationModel:
-    def __init__(self, model_path: str = None):
+class CropRecommendationModel(HotSwapMixin):
+    def __init__(self, model_path: str = None, registry: ModelRegistry = None,
+                 refresh_interval: float = 30.0):
         self.model_path = model_path or "models/crop_recommendation_model.pkl"
         self.model = None
         self.feature_columns = [
@@ -19,7 +22,8 @@ class CropRecommendationModel:
             'rice': 'Rice', 'maize': 'Maize', 'chickpea': 'Chickpea',
             'cotton': 'Cotton', 'wheat': 'Wheat'
         }
-        self.load_model()
+        if registry is None or not self.attach_registry(registry, refresh_interval):
+            self.load_model()
     
     def load_model(self):
         try:
@@ -34,28 +38,36 @@ class CropRecommendationModel:
             logger.log_error("Failed to load model", e)
             self.create_default_model()
     
-    def create_default_model(self):
+    def create_default_model(self, samples_per_crop: int = 100, n_jobs: int = -1):
         logger.logger.info("Creating default Random Forest model")
         self.model = RandomForestClassifier(
             n_estimators=100,
             max_depth=10,
-            random_state=42
+            random_state=42,
+            n_jobs=n_jobs
         )
         
         # Create dummy training data
-        dummy_data = self.generate_dummy_training_data()
-        X_dummy = pd.DataFrame(dummy_data['features'], columns=self.feature_columns)
+        dummy_data = self.generate_dummy_training_data(samples_per_crop)
+        X_dummy = pd.DataFrame(dummy_data['features'], columns=self.feature_columns, copy=False)
         y_dummy = dummy_data['labels']
         
         self.model.fit(X_dummy, y_dummy)
+        # Only training benefits from parallel workers; keep predictions single-threaded
+        self.model.n_jobs = None
         
         # Save the model
         os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
         joblib.dump(self.model, self.model_path)
         logger.logger.info(f"Default model saved to {self.model_path}")
+        
+        if self.registry is not None:
+            version = self.registry.publish(self.model, self.feature_columns,
+                                            {'n_samples': int(len(y_dummy))})
+            self.swap_model(self.model, version, self.registry.metadata(version))
     
-    def generate_dummy_training_data(self) -> Dict:
-        np.random.seed(42)
+    def generate_dummy_training_data(self, samples_per_crop: int = 100, random_state: int = 42) -> Dict:
+        rng = np.random.default_rng(random_state)
         
         crop_profiles = {
             'Rice': {'N': [80, 120], 'P': [40, 60], 'K': [40, 60], 'temp': [20, 35], 
@@ -67,24 +79,19 @@ class CropRecommendationModel:
             'Cotton': {'N': [70, 110], 'P': [45, 65], 'K': [45, 65], 'temp': [21, 30], 
                       'humidity': [70, 85], 'ph': [6.5, 8.0], 'rainfall': [80, 150]}
         }
+        params_order = ['N', 'P', 'K', 'temp', 'humidity', 'ph', 'rainfall']
         
-        features = []
-        labels = []
-        
-        for crop, params in crop_profiles.items():
-            for _ in range(100):
-                feature_row = []
-                for param in ['N', 'P', 'K']:
-                    feature_row.append(np.random.uniform(params[param][0], params[param][1]))
-                
-                feature_row.append(np.random.uniform(params['temp'][0], params['temp'][1]))
-                feature_row.append(np.random.uniform(params['humidity'][0], params['humidity'][1]))
-                feature_row.append(np.random.uniform(params['ph'][0], params['ph'][1]))
-                feature_row.append(np.random.uniform(params['rainfall'][0], params['rainfall'][1]))
-                
-                features.append(feature_row)
-                labels.append(crop)
+        # One vectorized draw per crop, written into a preallocated float32 matrix
+        features = np.empty((samples_per_crop * len(crop_profiles), len(params_order)), dtype=np.float32)
+        for i, params in enumerate(crop_profiles.values()):
+            low = np.array([params[p][0] for p in params_order], dtype=np.float32)
+            high = np.array([params[p][1] for p in params_order], dtype=np.float32)
+            block = features[i * samples_per_crop:(i + 1) * samples_per_crop]
+            block[:] = rng.random(block.shape, dtype=np.float32)
+            block *= high - low
+            block += low
         
+        labels = np.repeat(np.array(list(crop_profiles)), samples_per_crop)
         return {'features': features, 'labels': labels}
     
     def extract_features(self, soil_data: Dict, weather_data: Dict) -> np.ndarray:
@@ -109,11 +116,16 @@ class CropRecommendationModel:
         try:
             features = self.extract_features(soil_data, weather_data)
             
-            if self.model:
-                predictions = self.model.predict(features)
-                probabilities = self.model.predict_proba(features)
+            self.refresh_model()
+            model = self.model
+            if model:
+                start = time.perf_counter()
+                probabilities = model.predict_proba(features)
                 
-                classes = self.model.classes_
+                classes = model.classes_
+                if self.shadow is not None:
+                    self.shadow.observe(features, classes[np.argmax(probabilities[0])],
+                                        time.perf_counter() - start)
                 
                 recommendations = []
                 for i, (crop, prob) in enumerate(zip(classes, probabilities[0])):
@@ -0,0 +1,130 @@
+"""
+Client-side rate governor for provider quotas
+One token bucket per quota (Groq requests and tokens per minute for a model,
+Google STT/TTS requests per minute). A call reserves capacity in all of its
+buckets and waits for it if that is within its deadline; otherwise the
+caller gets False straight away and can fall back to a cached/FAQ answer.
+"""
+
+from collections import deque
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """per_minute capacity refilled continuously, holding at most burst_seconds worth"""
+
+    def __init__(self, per_minute, burst_seconds=10):
+        self.per_minute = per_minute
+        self.rate = per_minute / 60
+        self.capacity = max(per_minute * burst_seconds / 60, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.recent = deque()  # (time, cost) granted in the last minute
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.rejected = 0
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, cost, now):
+        """Seconds until cost can be taken (reservations may drive tokens below zero)"""
+        self._refill(now)
+        cost = min(cost, self.capacity)  # one oversized call must still fit eventually
+        return max((cost - self.tokens) / self.rate, self.blocked_until - now, 0.0)
+
+    def take(self, cost, now, wait):
+        self.tokens -= min(cost, self.capacity)
+        self.recent.append((now, cost))
+        if wait > 0:
+            self.waits += 1
+            self.wait_seconds += wait
+
+    def utilization(self, now):
+        """Share of the per-minute quota granted over the last minute"""
+        while self.recent and self.recent[0][0] < now - 60:
+            self.recent.popleft()
+        return sum(cost for _, cost in self.recent) / self.per_minute
+
+class RateGovernor:
+    """Named token buckets shared by every chatbot thread in the process"""
+
+    def __init__(self, limits, burst_seconds=10, max_wait=3.0):
+        self.max_wait = max_wait  # default deadline for a call to get its capacity
+        self.lock = threading.Lock()
+        self.buckets = {name: TokenBucket(per_minute, burst_seconds)
+                        for name, per_minute in limits.items() if per_minute > 0}
+
+    @classmethod
+    def from_env(cls, llm_model='default'):
+        """
+        Buckets from RATE_LIMIT_* per-minute quotas, split across RATE_LIMIT_WORKERS
+        processes (RATE_LIMIT_ENABLED=False disables the governor)
+        """
+        if os.getenv('RATE_LIMIT_ENABLED', 'True').lower() != 'true':
+            return None
+        workers = max(int(os.getenv('RATE_LIMIT_WORKERS', '1')), 1)
+
+        def quota(name, default):
+            return float(os.getenv(name, default)) / workers
+
+        return cls({
+            f'groq:{llm_model}:requests': quota('RATE_LIMIT_GROQ_RPM', '30'),
+            f'groq:{llm_model}:tokens': quota('RATE_LIMIT_GROQ_TPM', '12000'),
+            'google:stt:requests': quota('RATE_LIMIT_STT_RPM', '900'),
+            'google:tts:requests': quota('RATE_LIMIT_TTS_RPM', '1000')
+        }, max_wait=float(os.getenv('RATE_LIMIT_MAX_WAIT', '3')))
+
+    def acquire(self, costs, max_wait=None):
+        """
+        Reserve {bucket name: cost} in every bucket and sleep until it is available;
+        False, with nothing reserved, when that would take longer than max_wait
+        """
+        max_wait = self.max_wait if max_wait is None else max_wait
+        costs = {name: cost for name, cost in costs.items() if name in self.buckets}
+        if not costs:
+            return True
+
+        with self.lock:
+            now = time.monotonic()
+            wait = max(self.buckets[name].wait_time(cost, now) for name, cost in costs.items())
+            if wait > max_wait:
+                for name in costs:
+                    self.buckets[name].rejected += 1
+                logger.warning(f"Rate governor: {', '.join(costs)} needs {wait:.1f} s, over the {max_wait} s deadline")
+                return False
+            for name, cost in costs.items():
+                self.buckets[name].take(cost, now, wait)
+
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    def pause(self, prefix, seconds):
+        """Hold every bucket starting with prefix, e.g. after the provider answered 429"""
+        with self.lock:
+            until = time.monotonic() + seconds
+            for name, bucket in self.buckets.items():
+                if name.startswith(prefix):
+                    bucket.blocked_until = max(bucket.blocked_until, until)
+
+    def stats(self):
+        with self.lock:
+            now = time.monotonic()
+            return {
+                name: {
+                    "per_minute": round(bucket.per_minute, 1),
+                    "utilization": round(bucket.utilization(now), 3),
+                    "available": round(max(min(bucket.capacity, bucket.tokens + (now - bucket.updated) * bucket.rate), 0), 1),
+                    "waits": bucket.waits,
+                    "mean_wait_ms": round(bucket.wait_seconds / bucket.waits * 1000, 1) if bucket.waits else 0.0,
+                    "rejected": bucket.rejected
+                }
+                for name, bucket in self.buckets.items()
+            }
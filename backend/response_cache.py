@@ -0,0 +1,168 @@
+"""
+Chatbot answer cache keyed by the normalized question and the farm context
+used in the prompt, with optional near-duplicate matching on character n-grams
+"""
+
+from collections import OrderedDict
+import logging
+import os
+import threading
+import time
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+def normalize_question(text):
+    """Casefold, drop punctuation and collapse whitespace (works for any script)"""
+    text = unicodedata.normalize('NFC', text).casefold()
+    text = ''.join(' ' if unicodedata.category(ch).startswith('P') else ch for ch in text)
+    return ' '.join(text.split())
+
+# Negations flip a question's meaning however similar the rest of it is; "t" is
+# what's left of "don't"/"can't" after normalize_question() drops the apostrophe
+NEGATIONS = frozenset({
+    'not', 'no', 'never', 'dont', 'cant', 'cannot', 'without', 'avoid', 't',
+    'नहीं', 'नही', 'न', 'मत', 'बिना',
+    'వద్దు', 'కాదు', 'లేదు'
+})
+NEGATION_SUFFIXES = ('కూడదు', 'వద్దు')  # Telugu attaches them to the verb
+
+def is_negated(words):
+    return any(w in NEGATIONS or w.endswith(NEGATION_SUFFIXES) for w in words)
+
+def char_ngrams(text, n=3):
+    padded = f" {text} "
+    return frozenset(padded[i:i + n] for i in range(max(len(padded) - n + 1, 1)))
+
+def same_terms(words, other_words, min_length=4, variant_similarity=0.5):
+    """
+    True when the questions differ only in short words or spelling/inflection
+    variants ("fertilizer"/"fertiliser", "soil"/"soils"), so that questions about
+    different crops are never treated as duplicates however similar the rest is.
+    Short words are ignored except negations ("not", "no"), which flip the question
+    """
+    if is_negated(words) != is_negated(other_words):
+        return False
+    extra = [w for w in words ^ other_words if len(w) >= min_length]
+    for word in extra:
+        counterparts = (other_words - words) if word in words else (words - other_words)
+        grams = char_ngrams(word)
+        if not any(len(grams & char_ngrams(c)) / len(grams | char_ngrams(c)) >= variant_similarity
+                   for c in counterparts):
+            return False
+    return True
+
+def context_key(context):
+    """The context fields that appear in the prompt, coarsened so nearby readings share answers"""
+    context = context or {}
+
+    def text(field):
+        return str(context.get(field) or '').strip().casefold()
+
+    def rounded(field, step):
+        try:
+            return int(round(float(context.get(field)) / step) * step)
+        except (TypeError, ValueError):
+            return None
+
+    return (
+        text('state'), text('district'), text('soil_type'), text('season'),
+        tuple(sorted(str(crop).casefold() for crop in context.get('top_crops') or [])),
+        rounded('temperature', 2), rounded('humidity', 5)
+    )
+
+class ResponseCache:
+    """Bounded TTL cache of chatbot answers, least-recently-used evicted first"""
+
+    def __init__(self, max_entries=2000, ttl=6 * 3600, similarity=0.75, ngram=3):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity = similarity  # 0 disables near-duplicate matching
+        self.ngram = ngram
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # (question, context) -> (answer, expires_at, ngrams, words)
+        self.by_context = {}          # context -> keys, to search near-duplicates
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls):
+        """Build the cache from ANSWER_CACHE_* settings (ANSWER_CACHE_MAX_ENTRIES=0 disables it)"""
+        max_entries = int(os.getenv('ANSWER_CACHE_MAX_ENTRIES', '2000'))
+        if max_entries <= 0:
+            return None
+        return cls(max_entries,
+                   ttl=float(os.getenv('ANSWER_CACHE_TTL', str(6 * 3600))),
+                   similarity=float(os.getenv('ANSWER_CACHE_SIMILARITY', '0.75')))
+
+    def get(self, question, context=None):
+        """Cached answer for this question and context, or None"""
+        question = normalize_question(question)
+        ctx = context_key(context)
+        key = (question, ctx)
+        now = time.time()
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry[1] > now:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry:
+                self._remove(key)
+
+            if self.similarity > 0:
+                match = self._nearest(question, ctx, now)
+                if match:
+                    self.entries.move_to_end(match)
+                    self.near_hits += 1
+                    return self.entries[match][0]
+
+            self.misses += 1
+            return None
+
+    def _nearest(self, question, ctx, now):
+        """Most similar live question with the same context, if similar enough"""
+        grams = char_ngrams(question, self.ngram)
+        words = frozenset(question.split())
+        best_key, best_score = None, self.similarity
+        for key in self.by_context.get(ctx, ()):
+            answer, expires_at, other_grams, other_words = self.entries[key]
+            if expires_at <= now:
+                continue
+            score = len(grams & other_grams) / len(grams | other_grams)
+            if score >= best_score and same_terms(words, other_words):
+                best_key, best_score = key, score
+        return best_key
+
+    def put(self, question, context, answer):
+        question = normalize_question(question)
+        ctx = context_key(context)
+        key = (question, ctx)
+
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (answer, time.time() + self.ttl, char_ngrams(question, self.ngram),
+                                 frozenset(question.split()))
+            self.by_context.setdefault(ctx, set()).add(key)
+            while len(self.entries) > self.max_entries:
+                self._remove(next(iter(self.entries)))
+
+    def _remove(self, key):
+        del self.entries[key]
+        keys = self.by_context.get(key[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.by_context[key[1]]
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "near_hits": self.near_hits,
+            "misses": self.misses
+        }
@@ -0,0 +1,78 @@
+"""
+Compact, compressed JSON responses
+/predict bodies are serialised with orjson when it is installed (falling back
+to the standard library), compressed once with brotli or gzip according to
+the client's Accept-Encoding, and sent with an explicit Content-Length.
+compact_predictions() is the opt-in ?schema=compact form of the predictions
+block, where top_recommendations are indexes into all_crops.
+
+Bodies below COMPRESS_MIN_BYTES, and requests asking for X-Debug-Timings
+(whose "timings" block is added after the response is built), go out
+uncompressed.
+"""
+
+import gzip
+import json
+import os
+
+from flask import Response, request
+
+import tracing
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+COMPRESS_MIN_BYTES = int(os.getenv('COMPRESS_MIN_BYTES', '1024'))
+GZIP_LEVEL = int(os.getenv('GZIP_LEVEL', '6'))
+BROTLI_QUALITY = int(os.getenv('BROTLI_QUALITY', '5'))
+
+def dumps(obj):
+    """Serialise to compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=str, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def choose_encoding(accept_encodings):
+    """br or gzip, whichever the client accepts with the higher quality (br on ties); None for identity"""
+    candidates = ['br', 'gzip'] if brotli is not None else ['gzip']
+    best = max(candidates, key=lambda encoding: accept_encodings[encoding])
+    return best if accept_encodings[best] > 0 else None
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+def json_response(obj, status=200):
+    """The JSON response for obj, compressed when the client allows it"""
+    body = dumps(obj)
+    response = Response(body, status=status, mimetype='application/json')
+    response.vary.add('Accept-Encoding')
+    if len(body) >= COMPRESS_MIN_BYTES and not request.headers.get(tracing.DEBUG_HEADER):
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding:
+            response.set_data(compress(body, encoding))
+            response.headers['Content-Encoding'] = encoding
+    return response
+
+def compact_predictions(predictions):
+    """
+    ?schema=compact form of generate_crop_predictions() output: top_recommendations
+    become indexes into all_crops, and each crop drops the season (given once at
+    the top) and its rank (its position in all_crops plus one)
+    """
+    position = {id(crop): i for i, crop in enumerate(predictions['all_crops'])}
+    return {
+        **predictions,
+        'schema': 'compact',
+        'top_recommendations': [position[id(crop)] for crop in predictions['top_recommendations']],
+        'all_crops': [{key: value for key, value in crop.items() if key not in ('season', 'rank')}
+                      for crop in predictions['all_crops']]
+    }
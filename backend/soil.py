@@ -1,5 +1,6 @@
 import requests
 from config import Config
+import metrics
 from utils import safe_api_request, retry_api_call, APILogger, cache
 from typing import Dict, Optional
 
@@ -15,6 +16,7 @@ class SoilService:
     def get_lulc_statistics(self, district: str, state: str = None) -> Optional[Dict]:
         cache_key = f"lulc_stats_{district}_{state}"
         cached_result = cache.get(cache_key)
+        metrics.record_cache("lulc", "hit" if cached_result else "miss")
         if cached_result:
             return cached_result
         
@@ -28,7 +30,7 @@ class SoilService:
             params["state"] = state
         
         try:
-            response = safe_api_request(url, params)
+            response = safe_api_request(url, params, provider="bhuvan")
             if response:
                 logger.log_api_call("lulc_statistics", params, 200)
                 cache.set(cache_key, response)
@@ -43,6 +45,7 @@ class SoilService:
     def get_soilgrids_data(self, latitude: float, longitude: float) -> Optional[Dict]:
         cache_key = f"soilgrids_{latitude}_{longitude}"
         cached_result = cache.get(cache_key)
+        metrics.record_cache("soilgrids", "hit" if cached_result else "miss")
         if cached_result:
             return cached_result
         
@@ -50,7 +53,7 @@ class SoilService:
         soil_data = {}
         
         for prop in properties:
-            url = f"https://rest.isric.org/soilgrids/v2.0/properties/query"
+            url = f"{Config.SOILGRIDS_BASE_URL}/properties/query"
             params = {
                 "lon": longitude,
                 "lat": latitude,
@@ -59,7 +62,7 @@ class SoilService:
             }
             
             try:
-                response = safe_api_request(url, params, timeout=10)
+                response = safe_api_request(url, params, timeout=10, provider="soilgrids")
                 if response and "properties" in response:
                     soil_data[prop] = response
                     logger.log_api_call("soilgrids", params, 200)
@@ -6,7 +6,7 @@ from flask import Flask, request, jsonify
 from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
-import logging
+import math
 from logging.handlers import RotatingFileHandler
 import os
 from dotenv import load_dotenv
@@ -14,14 +14,17 @@ from typing import Dict, Any, Optional
 
 from .config import Config
 from .utils import APILogger, format_error_response, format_success_response, validate_coordinates
+from .utils.log_pipeline import configure_logging
 from .services import WeatherService, SoilService, MarketService
 from .ml import EnhancedCropRecommendationModel
+from .ml.registry import ModelRegistry
+from .ml.feedback import FeedbackLog, IncrementalTrainer, feedback_features
 
 # Load environment variables
 load_dotenv()
 
 # Configure logging
-logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
+configure_logging(Config.LOG_LEVEL, Config.LOG_FILE)
 logger = APILogger(Config.LOG_FILE)
 
 app = Flask(__name__)
@@ -51,7 +54,29 @@ limiter = Limiter(
 weather_service = WeatherService()
 soil_service = SoilService()
 market_service = MarketService()
-crop_model = EnhancedCropRecommendationModel()
+model_registry = ModelRegistry(Config.MODEL_REGISTRY_DIR)
+crop_model = EnhancedCropRecommendationModel(
+    Config.MODEL_PATH,
+    registry=model_registry,
+    refresh_interval=Config.MODEL_REFRESH_INTERVAL
+)
+feedback_log = FeedbackLog(Config.FEEDBACK_LOG_PATH, len(crop_model.feature_columns))
+
+if Config.SHADOW_MODEL_VERSION:
+    try:
+        crop_model.enable_shadow(Config.SHADOW_MODEL_VERSION, Config.SHADOW_SAMPLE_RATE)
+    except Exception as e:
+        logger.log_error("Failed to enable shadow model", e)
+
+if Config.ONLINE_LEARNING_ENABLED:
+    IncrementalTrainer(
+        crop_model, feedback_log, model_registry,
+        interval=Config.ONLINE_LEARNING_INTERVAL,
+        min_feedback=Config.ONLINE_LEARNING_MIN_FEEDBACK,
+        trees_per_round=Config.ONLINE_LEARNING_TREES_PER_ROUND,
+        max_estimators=Config.ONLINE_LEARNING_MAX_TREES,
+        activate=Config.ONLINE_LEARNING_AUTO_ACTIVATE
+    ).start()
 
 @app.before_request
 def before_request():
@@ -109,6 +134,11 @@ def validate_config():
     config_status = Config.validate()
     return format_success_response(config_status)
 
+@app.route('/api/model/info', methods=['GET'])
+def model_info():
+    """Live model version, metadata and shadow scoring report"""
+    return format_success_response(crop_model.model_info())
+
 @app.route('/api/weather', methods=['GET'])
 @limiter.limit("10 per minute")
 def get_weather():
@@ -227,6 +257,49 @@ def get_crop_recommendations():
         logger.log_error("Crop recommendations endpoint error", e)
         return format_error_response("Failed to generate recommendations", "RECOMMENDATION_ERROR", 500)
 
+@app.route('/api/feedback', methods=['POST'])
+@limiter.limit("30 per minute")
+def submit_feedback():
+    """Record the crop a farmer planted and its yield against the request features"""
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return format_error_response("JSON data is required", "MISSING_DATA", 400)
+        
+        features = data.get('features')
+        if not isinstance(features, dict):
+            return format_error_response("'features' object is required", "MISSING_PARAMS", 400)
+        
+        crop = str(data.get('planted_crop', '')).strip()
+        crop = crop_model.reverse_crop_mapping.get(crop, crop.lower())
+        if crop not in crop_model.crop_mapping:
+            return format_error_response(f"Unknown crop: {data.get('planted_crop')}", "INVALID_CROP", 400)
+        
+        missing = [name for name in crop_model.feature_columns if name not in features]
+        if missing:
+            return format_error_response(f"Missing features: {', '.join(missing)}", "MISSING_PARAMS", 400)
+        
+        try:
+            reported_yield = float(data.get('reported_yield'))
+            values = feedback_features(crop_model, features)
+        except (TypeError, ValueError):
+            return format_error_response("Features and reported_yield must be numeric", "INVALID_PARAMS", 400)
+        
+        # float() accepts "nan"/"inf", and one such row would stop every later training round
+        if not math.isfinite(reported_yield) or not all(math.isfinite(v) for v in values):
+            return format_error_response("Features and reported_yield must be finite numbers", "INVALID_PARAMS", 400)
+        
+        if reported_yield < 0:
+            return format_error_response("reported_yield must not be negative", "INVALID_PARAMS", 400)
+        
+        total = feedback_log.append(values, crop, reported_yield)
+        return format_success_response({'recorded': True, 'total_feedback': total}, status_code=202)
+        
+    except Exception as e:
+        logger.log_error("Feedback endpoint error", e)
+        return format_error_response("Failed to record feedback", "FEEDBACK_ERROR", 500)
+
 @app.route('/api/analysis/comprehensive', methods=['POST'])
 @limiter.limit("10 per minute")
 def comprehensive_analysis():
@@ -22,8 +22,8 @@ class Config:
     MANDI_API_KEY = os.getenv('MANDI_API_KEY')
     
     # API URLs
-    OPENWEATHER_BASE_URL = "https://api.openweathermap.org/data/2.5"
-    BHUVAN_BASE_URL = "https://bhuvan-app1.nrsc.gov.in/api"
+    OPENWEATHER_BASE_URL = os.getenv('OPENWEATHER_BASE_URL', "https://api.openweathermap.org/data/2.5")
+    BHUVAN_BASE_URL = os.getenv('BHUVAN_BASE_URL', "https://bhuvan-app1.nrsc.gov.in/api")
     
     # LULC API Keys
     LULC_STATS_KEY = os.getenv('LULC_STATS_KEY', 'default_stats_key')
@@ -38,9 +38,25 @@ class Config:
     
     # Rate Limiting
     RATE_LIMIT_STORAGE_URL = os.getenv('RATE_LIMIT_STORAGE_URL', 'memory://')
+    RATELIMIT_ENABLED = os.getenv('RATELIMIT_ENABLED', 'True').lower() == 'true'  # read by flask-limiter
     
     # Model Paths
     MODEL_PATH = os.getenv('MODEL_PATH', 'models/crop_recommendation_model.pkl')
+    MODEL_REGISTRY_DIR = os.getenv('MODEL_REGISTRY_DIR', 'models/registry')
+    MODEL_REFRESH_INTERVAL = float(os.getenv('MODEL_REFRESH_INTERVAL', '30'))
+    
+    # Shadow scoring of a candidate model version (disabled when unset)
+    SHADOW_MODEL_VERSION = os.getenv('SHADOW_MODEL_VERSION')
+    SHADOW_SAMPLE_RATE = float(os.getenv('SHADOW_SAMPLE_RATE', '0.1'))
+    
+    # Farmer outcome feedback and incremental retraining
+    FEEDBACK_LOG_PATH = os.getenv('FEEDBACK_LOG_PATH', 'models/feedback.bin')
+    ONLINE_LEARNING_ENABLED = os.getenv('ONLINE_LEARNING_ENABLED', 'False').lower() == 'true'
+    ONLINE_LEARNING_INTERVAL = float(os.getenv('ONLINE_LEARNING_INTERVAL', '3600'))
+    ONLINE_LEARNING_MIN_FEEDBACK = int(os.getenv('ONLINE_LEARNING_MIN_FEEDBACK', '50'))
+    ONLINE_LEARNING_TREES_PER_ROUND = int(os.getenv('ONLINE_LEARNING_TREES_PER_ROUND', '10'))
+    ONLINE_LEARNING_MAX_TREES = int(os.getenv('ONLINE_LEARNING_MAX_TREES', '300'))
+    ONLINE_LEARNING_AUTO_ACTIVATE = os.getenv('ONLINE_LEARNING_AUTO_ACTIVATE', 'True').lower() == 'true'
     
     # Logging
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
@@ -6,18 +6,22 @@ import joblib
 import numpy as np
 import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, classification_report
+from sklearn.metrics import classification_report
 from typing import Dict, List, Optional, Tuple
 import os
+import time
 from ..utils import APILogger
+from .compact import CompactForest, export_compact
+from .evaluation import accuracy_report, load_holdout
+from .registry import HotSwapMixin, ModelRegistry
 
 logger = APILogger()
 
-class EnhancedCropRecommendationModel:
+class EnhancedCropRecommendationModel(HotSwapMixin):
     """Enhanced crop recommendation model with more crops and features"""
     
-    def __init__(self, model_path: str = None):
+    def __init__(self, model_path: str = None, registry: ModelRegistry = None,
+                 refresh_interval: float = 30.0):
         self.model_path = model_path or "models/crop_recommendation_model.pkl"
         self.model = None
         self.feature_columns = [
@@ -41,12 +45,18 @@ class EnhancedCropRecommendationModel:
         }
         
         self.reverse_crop_mapping = {v: k for k, v in self.crop_mapping.items()}
-        self.load_model()
+        
+        # Prefer the registry's active version; fall back to the legacy model file
+        if registry is None or not self.attach_registry(registry, refresh_interval):
+            self.load_model()
     
     def load_model(self):
         """Load existing model or create enhanced default model"""
         try:
-            if os.path.exists(self.model_path):
+            if os.path.exists(self.model_path) and self.model_path.endswith('.npz'):
+                self.model = CompactForest.load(self.model_path)
+                logger.log_info(f"Compact model loaded from {self.model_path}")
+            elif os.path.exists(self.model_path):
                 self.model = joblib.load(self.model_path)
                 logger.log_info(f"Model loaded from {self.model_path}")
             else:
@@ -57,7 +67,7 @@ class EnhancedCropRecommendationModel:
             logger.log_error("Failed to load model", e)
             self.create_enhanced_model()
     
-    def create_enhanced_model(self):
+    def create_enhanced_model(self, n_samples: int = 5000, n_jobs: int = -1):
         """Create enhanced default model with more realistic data"""
         logger.log_info("Creating enhanced Random Forest model")
         
@@ -67,28 +77,48 @@ class EnhancedCropRecommendationModel:
             min_samples_split=5,
             min_samples_leaf=2,
             random_state=42,
-            class_weight='balanced'
+            class_weight='balanced',
+            n_jobs=n_jobs
         )
         
         # Generate enhanced training data
-        enhanced_data = self.generate_enhanced_training_data()
-        X_train = pd.DataFrame(enhanced_data['features'], columns=self.feature_columns)
+        enhanced_data = self.generate_enhanced_training_data(n_samples)
+        X_train = pd.DataFrame(enhanced_data['features'], columns=self.feature_columns, copy=False)
         y_train = enhanced_data['labels']
         
+        start = time.perf_counter()
         self.model.fit(X_train, y_train)
+        training_stats = {
+            'n_samples': int(len(y_train)),
+            'n_estimators': self.model.n_estimators,
+            'fit_seconds': round(time.perf_counter() - start, 3),
+            'feature_means': dict(zip(self.feature_columns, X_train.mean().round(3).tolist()))
+        }
+        # Parallelism only pays off for training; single-row predictions are
+        # faster without the joblib dispatch overhead.
+        self.model.n_jobs = None
         
         # Save the enhanced model
         os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
-        joblib.dump(self.model, self.model_path)
+        if self.model_path.endswith('.npz'):
+            export_compact(self.model, self.model_path)
+            self.model = CompactForest.load(self.model_path)
+        else:
+            joblib.dump(self.model, self.model_path)
         logger.log_info(f"Enhanced model saved to {self.model_path}")
+        
+        if self.registry is not None:
+            version = self.registry.publish(self.model, self.feature_columns, training_stats)
+            self.swap_model(self.model, version, self.registry.metadata(version))
     
-    def generate_enhanced_training_data(self) -> Dict:
-        """Generate realistic training data for Indian agriculture"""
-        np.random.seed(42)
+    def generate_enhanced_training_data(self, n_samples: int = 5000, random_state: int = 42) -> Dict:
+        """Generate realistic training data for Indian agriculture
         
-        n_samples = 5000
-        features = []
-        labels = []
+        Rows are drawn in one block per crop from a seeded ``np.random.Generator``
+        and written straight into a preallocated float32 matrix, so millions of
+        rows can be generated without per-sample Python overhead.
+        """
+        rng = np.random.default_rng(random_state)
         
         # Crop-specific parameter ranges based on real agricultural data
         crop_parameters = {
@@ -103,38 +133,36 @@ class EnhancedCropRecommendationModel:
                      'rainfall': (600, 1200), 'elevation': (0, 1500)},
             # Add parameters for other crops...
         }
+        default_parameters = {
+            'N': (80, 160), 'P': (40, 80), 'K': (40, 80),
+            'temp': (15, 35), 'humidity': (40, 90), 'ph': (5.5, 8.0),
+            'rainfall': (400, 2000), 'elevation': (0, 2000)
+        }
+        continuous = ['N', 'P', 'K', 'temp', 'humidity', 'ph', 'rainfall', 'elevation']
         
-        for crop_name in self.crop_mapping.keys():
-            params = crop_parameters.get(crop_name, {
-                'N': (80, 160), 'P': (40, 80), 'K': (40, 80),
-                'temp': (15, 35), 'humidity': (40, 90), 'ph': (5.5, 8.0),
-                'rainfall': (400, 2000), 'elevation': (0, 2000)
-            })
+        crops = list(self.crop_mapping.keys())
+        per_crop = n_samples // len(crops)
+        features = np.empty((per_crop * len(crops), len(self.feature_columns)), dtype=np.float32)
+        
+        for i, crop_name in enumerate(crops):
+            params = crop_parameters.get(crop_name, default_parameters)
+            low = np.array([params[name][0] for name in continuous], dtype=np.float32)
+            span = np.array([params[name][1] for name in continuous], dtype=np.float32) - low
             
-            for _ in range(n_samples // len(self.crop_mapping)):
-                # Generate features based on crop parameters
-                N = np.random.uniform(*params['N'])
-                P = np.random.uniform(*params['P'])
-                K = np.random.uniform(*params['K'])
-                temperature = np.random.uniform(*params['temp'])
-                humidity = np.random.uniform(*params['humidity'])
-                ph = np.random.uniform(*params['ph'])
-                rainfall = np.random.uniform(*params['rainfall'])
-                elevation = np.random.uniform(*params['elevation'])
-                
-                # Season (0=Winter, 1=Summer, 2=Monsoon, 3=Autumn)
-                season = np.random.randint(0, 4)
-                
-                # Region (0=North, 1=South, 2=East, 3=West, 4=Central)
-                region = np.random.randint(0, 5)
-                
-                features.append([N, P, K, temperature, humidity, ph, rainfall, 
-                               elevation, season, region])
-                labels.append(crop_name)
+            block = features[i * per_crop:(i + 1) * per_crop]
+            block[:, :8] = rng.random((per_crop, 8), dtype=np.float32)
+            block[:, :8] *= span
+            block[:, :8] += low
+            
+            # Season (0=Winter, 1=Summer, 2=Monsoon, 3=Autumn)
+            block[:, 8] = rng.integers(0, 4, size=per_crop)
+            
+            # Region (0=North, 1=South, 2=East, 3=West, 4=Central)
+            block[:, 9] = rng.integers(0, 5, size=per_crop)
         
         return {
             'features': features,
-            'labels': labels
+            'labels': np.repeat(np.array(crops), per_crop)
         }
     
     def predict(self, features: Dict) -> List[Dict]:
@@ -154,14 +182,23 @@ class EnhancedCropRecommendationModel:
                 features.get('region', 0)
             ]
             
+            self.refresh_model()
+            # Read the live model once so a concurrent hot swap can't mix versions
+            model = self.model
+            
             # Get predictions with probabilities
-            if hasattr(self.model, 'predict_proba'):
-                probabilities = self.model.predict_proba([input_features])[0]
+            if hasattr(model, 'predict_proba'):
+                start = time.perf_counter()
+                probabilities = model.predict_proba([input_features])[0]
                 class_indices = np.argsort(probabilities)[::-1]
                 
+                if self.shadow is not None:
+                    self.shadow.observe([input_features], model.classes_[class_indices[0]],
+                                        time.perf_counter() - start)
+                
                 predictions = []
                 for idx in class_indices[:5]:  # Top 5 predictions
-                    crop_class = self.model.classes_[idx]
+                    crop_class = model.classes_[idx]
                     confidence = probabilities[idx]
                     
                     predictions.append({
@@ -173,7 +210,7 @@ class EnhancedCropRecommendationModel:
                 return predictions
             else:
                 # Fallback for models without predict_proba
-                prediction = self.model.predict([input_features])[0]
+                prediction = model.predict([input_features])[0]
                 return [{
                     'crop': self.crop_mapping.get(prediction, prediction),
                     'confidence': 0.8,
@@ -196,33 +233,23 @@ class EnhancedCropRecommendationModel:
         else:
             return [{'crop': 'Maize', 'confidence': 0.6, 'scientific_name': 'maize'}]
     
-    def evaluate_model(self, test_size: float = 0.2) -> Dict:
-        """Evaluate model performance"""
+    def evaluate_model(self, holdout_path: str = "models/holdout.npz", holdout_rows: int = 5000) -> Dict:
+        """Evaluate the live model on a cached holdout set
+        
+        The holdout is generated once with its own seed and reused, so repeated
+        calls only cost a batch prediction instead of a full retrain.
+        """
         try:
-            data = self.generate_enhanced_training_data()
-            X = pd.DataFrame(data['features'], columns=self.feature_columns)
-            y = data['labels']
-            
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=test_size, random_state=42, stratify=y
-            )
-            
-            # Train temporary model for evaluation
-            temp_model = RandomForestClassifier(
-                n_estimators=100,
-                max_depth=10,
-                random_state=42
-            )
-            temp_model.fit(X_train, y_train)
-            
-            y_pred = temp_model.predict(X_test)
-            accuracy = accuracy_score(y_test, y_pred)
+            model = self.model
+            X, y = load_holdout(self.generate_enhanced_training_data, holdout_path,
+                                holdout_rows, self.feature_columns)
             
-            return {
-                'accuracy': round(accuracy, 3),
-                'report': classification_report(y_test, y_pred, output_dict=True)
-            }
+            report = accuracy_report(model, X, y)
+            y_pred = np.asarray(model.predict(X)).astype(str)
+            report['version'] = self.model_version
+            report['report'] = classification_report(y, y_pred, output_dict=True, zero_division=0)
+            return report
             
         except Exception as e:
             logger.log_error("Model evaluation failed", e)
-            return {'accuracy': 0.0, 'error': str(e)}
\ No newline at end of file
+            return {'accuracy': 0.0, 'error': str(e)}
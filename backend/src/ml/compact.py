@@ -0,0 +1,247 @@
+"""
+Compact array-backed random forest for low-memory inference
+"""
+
+import json
+from typing import Dict
+
+import numpy as np
+
+LEAF_DTYPES = {'uint8': np.uint8, 'uint16': np.uint16}
+
+
+class CompactForest:
+    """Inference-only random forest stored as flat numpy arrays
+
+    All trees share one node table in pre-order, so a split's left child is
+    always the next node and only right children are stored. Thresholds are
+    float32, leaf class distributions are quantized probabilities (uint8 or
+    uint16) and only leaves carry a distribution. Leaves have a ``-inf``
+    threshold and point right at themselves, so a batch can be routed through
+    every tree at once in ``max_depth`` vectorized steps.
+    Exposes the subset of the scikit-learn classifier API the model wrappers
+    use: ``classes_``, ``predict_proba`` and ``predict``.
+    """
+
+    __slots__ = ('classes_', 'n_features_in_', 'feature', 'threshold', 'right',
+                 'leaf_row', 'leaf_proba', 'roots', 'max_depth', 'scale')
+
+    def __init__(self, classes, n_features: int, feature: np.ndarray, threshold: np.ndarray,
+                 right: np.ndarray, leaf_row: np.ndarray, leaf_proba: np.ndarray,
+                 roots: np.ndarray, max_depth: int):
+        self.classes_ = np.asarray(classes)
+        self.n_features_in_ = n_features
+        self.feature = feature
+        self.threshold = threshold
+        self.right = right
+        self.leaf_row = leaf_row
+        self.leaf_proba = leaf_proba
+        self.roots = roots
+        self.max_depth = max_depth
+        self.scale = np.iinfo(leaf_proba.dtype).max
+
+    @classmethod
+    def from_sklearn(cls, forest, leaf_dtype: str = 'uint8', max_trees: int = None,
+                     prune_tolerance: float = 0.0) -> 'CompactForest':
+        """Convert a fitted ``RandomForestClassifier``
+
+        ``max_trees`` keeps only the first N trees. Sibling leaves whose class
+        probabilities differ by at most ``prune_tolerance`` (0 merges only
+        leaves that are equal at the quantized precision) are merged into their
+        parent, bottom-up, so redundant subtrees fold away.
+        """
+        dtype = LEAF_DTYPES[leaf_dtype]
+        scale = np.iinfo(dtype).max
+        estimators = forest.estimators_[:max_trees] if max_trees else forest.estimators_
+
+        features, thresholds, rights, leaf_rows, roots = [], [], [], [], []
+        leaf_blocks = []
+        node_offset = 0
+        leaf_offset = 0
+        max_depth = 0
+
+        for estimator in estimators:
+            tree = estimator.tree_
+            value = tree.value[:, 0, :]
+            proba = value / np.maximum(value.sum(axis=1, keepdims=True), 1e-12)
+            weights = tree.weighted_n_node_samples.copy()
+
+            nodes = _flatten_tree(tree.children_left, tree.children_right, proba, weights,
+                                  max(prune_tolerance, 0.5 / scale))
+            quantized = np.rint(proba * scale).astype(dtype)
+            index = {old: new for new, (old, _, _, _) in enumerate(nodes)}
+            n_nodes = len(nodes)
+
+            feature = np.zeros(n_nodes, dtype=np.int16)
+            threshold = np.full(n_nodes, -np.inf, dtype=np.float32)
+            right = np.empty(n_nodes, dtype=np.int32)
+            leaf_row = np.full(n_nodes, -1, dtype=np.int32)
+            leaves = []
+
+            for new, (old, is_leaf, _, old_right) in enumerate(nodes):
+                if is_leaf:
+                    right[new] = node_offset + new
+                    leaf_row[new] = leaf_offset + len(leaves)
+                    leaves.append(quantized[old])
+                else:
+                    feature[new] = tree.feature[old]
+                    threshold[new] = tree.threshold[old]
+                    right[new] = node_offset + index[old_right]
+
+            features.append(feature)
+            thresholds.append(threshold)
+            rights.append(right)
+            leaf_rows.append(leaf_row)
+            leaf_blocks.append(np.vstack(leaves))
+            roots.append(node_offset)
+            max_depth = max(max_depth, _depth(nodes, index))
+
+            node_offset += n_nodes
+            leaf_offset += len(leaves)
+
+        return cls(
+            forest.classes_, forest.n_features_in_,
+            np.concatenate(features), np.concatenate(thresholds), np.concatenate(rights),
+            np.concatenate(leaf_rows), np.vstack(leaf_blocks),
+            np.asarray(roots, dtype=np.int32), max_depth
+        )
+
+    def _leaves(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        rows = np.arange(X.shape[0])[:, None]
+        nodes = np.repeat(self.roots[None, :], X.shape[0], axis=0)
+
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, nodes + 1, self.right[nodes])
+
+        return self.leaf_row[nodes]
+
+    def predict_proba(self, X) -> np.ndarray:
+        leaf_rows = self._leaves(X)
+        totals = self.leaf_proba[leaf_rows].sum(axis=1, dtype=np.uint32)
+        return totals / float(self.scale * len(self.roots))
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in
+                   ('feature', 'threshold', 'right', 'leaf_row', 'leaf_proba', 'roots'))
+
+    def save(self, path: str):
+        """Write an uncompressed ``.npz`` artifact (loads without pickle)"""
+        meta = {'n_features': self.n_features_in_, 'max_depth': self.max_depth}
+        np.savez(
+            path,
+            classes=self.classes_.astype(str), feature=self.feature, threshold=self.threshold,
+            right=self.right, leaf_row=self.leaf_row,
+            leaf_proba=self.leaf_proba, roots=self.roots, meta=np.array(json.dumps(meta))
+        )
+
+    @classmethod
+    def load(cls, path: str) -> 'CompactForest':
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            return cls(
+                data['classes'], meta['n_features'], data['feature'], data['threshold'],
+                data['right'], data['leaf_row'], data['leaf_proba'], data['roots'],
+                meta['max_depth']
+            )
+
+
+def _flatten_tree(children_left: np.ndarray, children_right: np.ndarray,
+                  proba: np.ndarray, weights: np.ndarray, tolerance: float):
+    """Return ``(old_id, is_leaf, old_left, old_right)`` tuples in pre-order
+
+    A split whose two children are leaves with class probabilities within
+    ``tolerance`` of each other becomes a leaf carrying their sample-weighted
+    average; this is applied bottom-up so whole redundant subtrees fold away.
+    ``proba`` is updated in place for collapsed nodes.
+    """
+    order = []
+    stack = [0]
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        if children_left[node] != -1:
+            stack.append(children_right[node])
+            stack.append(children_left[node])
+
+    is_leaf = children_left == -1
+    # Reverse pre-order visits children before their parent
+    for node in reversed(order):
+        if is_leaf[node]:
+            continue
+        left, right = children_left[node], children_right[node]
+        if (is_leaf[left] and is_leaf[right]
+                and np.abs(proba[left] - proba[right]).max() <= tolerance):
+            w_left, w_right = weights[left], weights[right]
+            proba[node] = (proba[left] * w_left + proba[right] * w_right) / (w_left + w_right)
+            weights[node] = w_left + w_right
+            is_leaf[node] = True
+
+    nodes = []
+    stack = [0]
+    while stack:
+        node = stack.pop()
+        if is_leaf[node]:
+            nodes.append((node, True, -1, -1))
+        else:
+            nodes.append((node, False, children_left[node], children_right[node]))
+            stack.append(children_right[node])
+            stack.append(children_left[node])
+    return nodes
+
+
+def _depth(nodes, index) -> int:
+    """Longest root-to-leaf path in a flattened tree"""
+    depth = {nodes[0][0]: 0}
+    deepest = 0
+    for old, is_leaf, old_left, old_right in nodes:
+        d = depth[old]
+        deepest = max(deepest, d)
+        if not is_leaf:
+            depth[old_left] = depth[old_right] = d + 1
+    return deepest
+
+
+def export_compact(forest, path: str, leaf_dtype: str = 'uint8', max_trees: int = None,
+                   prune_tolerance: float = 0.0) -> Dict:
+    """Convert a fitted forest, save it and return size statistics"""
+    compact = CompactForest.from_sklearn(forest, leaf_dtype, max_trees, prune_tolerance)
+    compact.save(path)
+    original_nodes = sum(e.tree_.node_count for e in forest.estimators_)
+    return {
+        'trees': compact.n_trees,
+        'nodes': int(len(compact.feature)),
+        'original_nodes': int(original_nodes),
+        'leaves': int(len(compact.leaf_proba)),
+        'max_depth': compact.max_depth,
+        'array_bytes': compact.nbytes,
+        'leaf_dtype': leaf_dtype
+    }
+
+
+if __name__ == '__main__':
+    import argparse
+
+    import joblib
+
+    parser = argparse.ArgumentParser(description="Export a fitted forest to the compact format")
+    parser.add_argument('source', help="joblib file with a fitted RandomForestClassifier")
+    parser.add_argument('target', help="Output .npz path (use as MODEL_PATH)")
+    parser.add_argument('--leaf-dtype', choices=sorted(LEAF_DTYPES), default='uint8')
+    parser.add_argument('--max-trees', type=int)
+    parser.add_argument('--prune-tolerance', type=float, default=0.0)
+    args = parser.parse_args()
+
+    print(json.dumps(export_compact(joblib.load(args.source), args.target, args.leaf_dtype,
+                                    args.max_trees, args.prune_tolerance), indent=2))
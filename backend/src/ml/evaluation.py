@@ -0,0 +1,126 @@
+"""
+Evaluation and benchmark harness for the served crop model
+"""
+
+import json
+import os
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterable, Tuple
+
+import numpy as np
+
+HOLDOUT_SEED = 2024
+
+
+def load_holdout(generator: Callable[..., Dict], path: str, n_rows: int = 5000,
+                 feature_columns: Iterable[str] = ()) -> Tuple[np.ndarray, np.ndarray]:
+    """Return a cached holdout set, generating it on first use
+
+    ``generator`` is a training-data generator such as
+    ``EnhancedCropRecommendationModel.generate_enhanced_training_data``. The
+    holdout uses its own seed so rows are not shared with the training data.
+    The cache is regenerated when the row count or feature columns change.
+    """
+    signature = json.dumps({'rows': n_rows, 'seed': HOLDOUT_SEED, 'features': list(feature_columns)})
+
+    if os.path.exists(path):
+        with np.load(path, allow_pickle=False) as cached:
+            if str(cached['signature']) == signature:
+                return cached['features'], cached['labels']
+
+    data = generator(n_rows, random_state=HOLDOUT_SEED)
+    features = np.asarray(data['features'], dtype=np.float32)
+    labels = np.asarray(data['labels']).astype(str)
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    np.savez(path, features=features, labels=labels, signature=np.array(signature))
+    return features, labels
+
+
+def accuracy_report(model, X: np.ndarray, y: np.ndarray, top_k: Iterable[int] = (1, 3, 5)) -> Dict:
+    """Top-k accuracy of a fitted classifier"""
+    probabilities = model.predict_proba(X)
+    ranked = np.argsort(probabilities, axis=1)[:, ::-1]
+    classes = np.asarray(model.classes_).astype(str)
+    truth = (classes[ranked] == y[:, None])
+
+    report = {}
+    for k in top_k:
+        report['accuracy' if k == 1 else f'top_{k}_accuracy'] = round(float(truth[:, :k].any(axis=1).mean()), 4)
+    return report
+
+
+def single_row_latency(model, X: np.ndarray, rows: int = 500, warmup: int = 20) -> Dict:
+    """p50/p99 latency of one-row ``predict_proba`` calls, as served per request"""
+    for i in range(min(warmup, len(X))):
+        model.predict_proba(X[i:i + 1])
+
+    timings = np.empty(min(rows, len(X)))
+    for i in range(len(timings)):
+        start = time.perf_counter()
+        model.predict_proba(X[i:i + 1])
+        timings[i] = time.perf_counter() - start
+
+    timings *= 1000
+    return {
+        'p50_ms': round(float(np.percentile(timings, 50)), 4),
+        'p99_ms': round(float(np.percentile(timings, 99)), 4),
+        'rows': len(timings)
+    }
+
+
+def batch_throughput(model, X: np.ndarray, batch_size: int = 1000, repeats: int = 3) -> Dict:
+    """Rows per second for batched ``predict_proba`` plus its peak allocation"""
+    batch = X[:batch_size]
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict_proba(batch)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        model.predict_proba(batch)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'batch_size': len(batch),
+        'rows_per_second': round(len(batch) / best, 1),
+        'peak_memory_bytes': int(peak)
+    }
+
+
+def benchmark_model(model, X: np.ndarray, y: np.ndarray, version: str = None) -> Dict:
+    """Full report for one model artifact"""
+    return {
+        'version': version,
+        'model_type': type(model).__name__,
+        'holdout_rows': int(len(y)),
+        'timestamp': time.time(),
+        'quality': accuracy_report(model, X, y),
+        'latency': single_row_latency(model, X),
+        'throughput': batch_throughput(model, X)
+    }
+
+
+def compare(current: Dict, baseline: Dict) -> Dict:
+    """Relative change of the headline metrics against a baseline report"""
+    def delta(section: str, key: str):
+        old, new = baseline[section].get(key), current[section].get(key)
+        if not old or new is None:
+            return None
+        return round((new - old) / old * 100, 2)
+
+    return {
+        'baseline_version': baseline.get('version'),
+        'accuracy_pct': delta('quality', 'accuracy'),
+        'top_3_accuracy_pct': delta('quality', 'top_3_accuracy'),
+        'p50_ms_pct': delta('latency', 'p50_ms'),
+        'p99_ms_pct': delta('latency', 'p99_ms'),
+        'rows_per_second_pct': delta('throughput', 'rows_per_second'),
+        'peak_memory_pct': delta('throughput', 'peak_memory_bytes')
+    }
+
@@ -0,0 +1,215 @@
+"""
+Farmer outcome feedback log and bounded incremental retraining
+"""
+
+import copy
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..utils import APILogger
+from .registry import ModelRegistry
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+logger = APILogger()
+
+
+class FeedbackLog:
+    """Append-only binary log of fixed-size feedback records
+
+    Each record holds the timestamp, the request features as float32, the crop
+    that was actually planted and the reported yield. Records are small enough
+    that ``O_APPEND`` writes from several workers do not interleave, and the
+    log is read back with ``np.fromfile`` without parsing.
+    """
+
+    CROP_BYTES = 16
+
+    def __init__(self, path: str, n_features: int):
+        self.path = path
+        self.dtype = np.dtype([
+            ('timestamp', '<f8'),
+            ('features', '<f4', (n_features,)),
+            ('crop', f'S{self.CROP_BYTES}'),
+            ('yield', '<f4')
+        ])
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    def append(self, features: List[float], crop: str, reported_yield: float) -> int:
+        """Append one record and return the number of records in the log"""
+        record = np.zeros(1, dtype=self.dtype)
+        record['timestamp'] = time.time()
+        record['features'] = features
+        record['crop'] = crop.encode('ascii')[:self.CROP_BYTES]
+        record['yield'] = reported_yield
+
+        with self._lock:
+            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, record.tobytes())
+            finally:
+                os.close(fd)
+        return len(self)
+
+    def __len__(self) -> int:
+        try:
+            return os.path.getsize(self.path) // self.dtype.itemsize
+        except FileNotFoundError:
+            return 0
+
+    def read(self, start: int = 0, count: int = -1) -> np.ndarray:
+        if not os.path.exists(self.path):
+            return np.zeros(0, dtype=self.dtype)
+        return np.fromfile(self.path, dtype=self.dtype, count=count,
+                           offset=start * self.dtype.itemsize)
+
+
+class IncrementalTrainer:
+    """Periodically grows the live forest with trees fitted on new feedback
+
+    Each round copies the live ``RandomForestClassifier``, adds
+    ``trees_per_round`` warm-start trees fitted on the unseen feedback (mixed
+    with a synthetic replay sample so every class keeps its examples) and
+    publishes the result as a new registry version; when ``activate`` is set,
+    serving workers pick it up through their normal registry polling. Work is bounded: at most
+    ``max_rows`` feedback rows and one job per round, the oldest trees are
+    dropped beyond ``max_estimators``, the thread runs at lowered OS priority,
+    and a lock file keeps concurrent workers from training at the same time.
+    """
+
+    def __init__(self, wrapper, feedback_log: FeedbackLog, registry: ModelRegistry,
+                 interval: float = 3600, min_feedback: int = 50, trees_per_round: int = 10,
+                 max_estimators: int = 300, max_rows: int = 20000, replay_rows: int = 2000,
+                 activate: bool = True):
+        self.wrapper = wrapper
+        self.feedback_log = feedback_log
+        self.registry = registry
+        self.interval = interval
+        self.min_feedback = min_feedback
+        self.trees_per_round = trees_per_round
+        self.max_estimators = max_estimators
+        self.max_rows = max_rows
+        self.replay_rows = replay_rows
+        self.activate = activate
+
+        self.state_path = feedback_log.path + '.state'
+        self.lock_path = feedback_log.path + '.lock'
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name='online-learning', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        try:
+            # Linux applies niceness per thread, keeping request threads ahead of training
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+        except (AttributeError, OSError):
+            pass
+
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.log_error("Incremental training round failed", e)
+
+    def _read_offset(self) -> int:
+        try:
+            with open(self.state_path) as f:
+                return json.load(f).get('offset', 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def _write_offset(self, offset: int):
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'offset': offset, 'updated_at': time.time()}, f)
+        os.replace(tmp_path, self.state_path)
+
+    def run_once(self) -> Optional[str]:
+        """Train one round if enough new feedback arrived; returns the new version"""
+        with open(self.lock_path, 'a') as lock_file:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return None  # another worker is training
+            return self._train_round()
+
+    def _train_round(self) -> Optional[str]:
+        offset = self._read_offset()
+        total = len(self.feedback_log)
+        if total - offset < self.min_feedback:
+            return None
+
+        base_model = self.wrapper.model
+        base_version = self.wrapper.model_version
+        if not hasattr(base_model, 'estimators_'):
+            logger.log_warning("Live model does not support warm-start training; skipping feedback round")
+            return None
+
+        start = max(offset, total - self.max_rows)
+        records = self.feedback_log.read(start, total - start)
+        known = set(str(c) for c in base_model.classes_)
+        crops = np.char.decode(records['crop'], 'ascii')
+        # Non-finite rows (logged before the API rejected them) would make every fit fail
+        finite = np.isfinite(records['features']).all(axis=1) & np.isfinite(records['yield'])
+        mask = np.isin(crops, list(known)) & finite
+        if not mask.any():
+            self._write_offset(total)
+            return None
+
+        X_feedback = records['features'][mask]
+        y_feedback = crops[mask]
+        # Better-than-typical yields count as stronger evidence for the planted crop
+        yields = records['yield'][mask].astype(np.float64)
+        median_yield = np.median(yields[yields > 0]) if (yields > 0).any() else 1.0
+        w_feedback = np.clip(yields / median_yield, 0.25, 4.0)
+
+        replay = self.wrapper.generate_enhanced_training_data(self.replay_rows, random_state=total)
+        X = np.vstack([X_feedback, replay['features']])
+        y = np.concatenate([y_feedback, replay['labels']])
+        weights = np.concatenate([w_feedback, np.ones(len(replay['labels']))])
+
+        fit_start = time.perf_counter()
+        model = copy.deepcopy(base_model)
+        model.set_params(warm_start=True, n_jobs=1,
+                         n_estimators=len(model.estimators_) + self.trees_per_round)
+        model.fit(X, y, sample_weight=weights)
+        model.set_params(warm_start=False, n_jobs=None)
+
+        excess = len(model.estimators_) - self.max_estimators
+        if excess > 0:
+            model.estimators_ = model.estimators_[excess:]
+            model.n_estimators = len(model.estimators_)
+
+        version = self.registry.publish(model, self.wrapper.feature_columns, {
+            'base_version': base_version,
+            'feedback_rows': int(mask.sum()),
+            'replay_rows': int(len(replay['labels'])),
+            'trees_added': self.trees_per_round,
+            'n_estimators': model.n_estimators,
+            'fit_seconds': round(time.perf_counter() - fit_start, 3)
+        }, activate=self.activate)
+        self._write_offset(total)
+        logger.log_info(f"Published feedback-trained model {version} from {int(mask.sum())} records")
+        return version
+
+
+def feedback_features(wrapper, features: Dict) -> List[float]:
+    """Order a request's feature dict the way the model expects (every feature is required)"""
+    return [float(features[name]) for name in wrapper.feature_columns]
@@ -0,0 +1,345 @@
+"""
+Versioned model registry with atomic hot swap and shadow scoring
+"""
+
+import json
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+
+from ..utils import APILogger
+
+logger = APILogger()
+
+
+class ModelRegistry:
+    """File-based store of versioned model artifacts
+
+    Layout::
+
+        <root>/<version>/model.joblib
+        <root>/<version>/metadata.json
+        <root>/CURRENT              (name of the active version)
+
+    Versions are written to a temporary directory and renamed into place, and
+    ``CURRENT`` is replaced with ``os.replace``, so readers never observe a
+    partially written artifact.
+    """
+
+    ARTIFACT_FILE = 'model.joblib'
+    METADATA_FILE = 'metadata.json'
+    CURRENT_FILE = 'CURRENT'
+
+    def __init__(self, root: str = 'models/registry'):
+        self.root = root
+
+    def publish(self, model, feature_columns: List[str], training_stats: Dict = None,
+                activate: bool = True) -> str:
+        """Store a fitted model as a new version and optionally make it live"""
+        os.makedirs(self.root, exist_ok=True)
+        version = f"{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+        staging = tempfile.mkdtemp(prefix='.staging-', dir=self.root)
+        try:
+            joblib.dump(model, os.path.join(staging, self.ARTIFACT_FILE))
+            metadata = {
+                'version': version,
+                'created_at': time.time(),
+                'model_type': type(model).__name__,
+                'feature_columns': list(feature_columns),
+                'classes': [str(c) for c in getattr(model, 'classes_', [])],
+                'training_stats': training_stats or {}
+            }
+            with open(os.path.join(staging, self.METADATA_FILE), 'w') as f:
+                json.dump(metadata, f, indent=2)
+            os.rename(staging, os.path.join(self.root, version))
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        logger.log_info(f"Published model version {version}")
+        if activate:
+            self.activate(version)
+        return version
+
+    def activate(self, version: str):
+        """Atomically point ``CURRENT`` at an existing version"""
+        if not os.path.isdir(os.path.join(self.root, version)):
+            raise ValueError(f"Unknown model version: {version}")
+
+        fd, tmp_path = tempfile.mkstemp(prefix='.current-', dir=self.root)
+        with os.fdopen(fd, 'w') as f:
+            f.write(version)
+        os.replace(tmp_path, os.path.join(self.root, self.CURRENT_FILE))
+        logger.log_info(f"Activated model version {version}")
+
+    def current_version(self) -> Optional[str]:
+        try:
+            with open(os.path.join(self.root, self.CURRENT_FILE)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def list_versions(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root)
+            if not name.startswith('.') and os.path.isdir(os.path.join(self.root, name))
+        )
+
+    def metadata(self, version: str) -> Dict:
+        with open(os.path.join(self.root, version, self.METADATA_FILE)) as f:
+            return json.load(f)
+
+    def load(self, version: str = None) -> Tuple[object, Dict]:
+        """Load a version (the active one by default) with its metadata"""
+        version = version or self.current_version()
+        if not version:
+            raise LookupError("Model registry has no active version")
+
+        model = joblib.load(os.path.join(self.root, version, self.ARTIFACT_FILE))
+        return model, self.metadata(version)
+
+
+class LatencyStats:
+    """Rolling latency window reported as percentiles"""
+
+    def __init__(self, window: int = 1000):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+
+    def add(self, seconds: float):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def summary(self) -> Dict:
+        if not self.samples:
+            return {'count': self.count, 'p50_ms': None, 'p99_ms': None}
+        values = np.fromiter(self.samples, dtype=np.float64) * 1000
+        return {
+            'count': self.count,
+            'p50_ms': round(float(np.percentile(values, 50)), 3),
+            'p99_ms': round(float(np.percentile(values, 99)), 3)
+        }
+
+
+class ShadowScorer:
+    """Scores a sampled fraction of live traffic with a candidate model
+
+    Candidate predictions run on a single background thread so they never add
+    latency to the request path. When the backlog exceeds ``max_pending`` new
+    samples are dropped rather than queued.
+    """
+
+    def __init__(self, candidate, version: str, sample_rate: float = 0.1,
+                 max_pending: int = 64):
+        self.candidate = candidate
+        self.version = version
+        self.sample_rate = sample_rate
+        self.max_pending = max_pending
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='shadow-model')
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.live_latency = LatencyStats()
+        self.candidate_latency = LatencyStats()
+        self.compared = 0
+        self.agreed = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def observe(self, features: np.ndarray, live_label: str, live_seconds: float):
+        """Record a live prediction and maybe schedule the candidate on it"""
+        if random.random() >= self.sample_rate:
+            return
+
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.dropped += 1
+                return
+            self._pending += 1
+
+        self._executor.submit(self._score, features, live_label, live_seconds)
+
+    def _score(self, features: np.ndarray, live_label: str, live_seconds: float):
+        try:
+            start = time.perf_counter()
+            candidate_label = self.candidate.predict(features)[0]
+            elapsed = time.perf_counter() - start
+
+            with self._lock:
+                self.live_latency.add(live_seconds)
+                self.candidate_latency.add(elapsed)
+                self.compared += 1
+                if str(candidate_label) == str(live_label):
+                    self.agreed += 1
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+            logger.log_error(f"Shadow model {self.version} failed to score", e)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def report(self) -> Dict:
+        with self._lock:
+            return {
+                'candidate_version': self.version,
+                'sample_rate': self.sample_rate,
+                'compared': self.compared,
+                'agreement_rate': round(self.agreed / self.compared, 4) if self.compared else None,
+                'dropped': self.dropped,
+                'errors': self.errors,
+                'live_latency': self.live_latency.summary(),
+                'candidate_latency': self.candidate_latency.summary()
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+class HotSwapMixin:
+    """Lets a model wrapper replace its live model while serving requests
+
+    Request handlers must read ``self.model`` once per call; attribute
+    assignment is atomic, so in-flight predictions keep using the model they
+    started with while new requests pick up the swapped one. Registry polling
+    happens at most every ``refresh_interval`` seconds and new versions are
+    loaded on a background thread.
+    """
+
+    registry: Optional[ModelRegistry] = None
+    model_version: Optional[str] = None
+    model_metadata: Optional[Dict] = None
+    shadow: Optional[ShadowScorer] = None
+    refresh_interval: float = 30.0
+
+    def attach_registry(self, registry: ModelRegistry, refresh_interval: float = 30.0) -> bool:
+        """Use the registry's active version as the live model if there is one"""
+        self.registry = registry
+        self.refresh_interval = refresh_interval
+        self._swap_lock = threading.Lock()
+        self._loading = False
+        self._last_refresh = time.monotonic()
+
+        version = registry.current_version()
+        if not version:
+            return False
+        try:
+            self._load_version(version)
+            return True
+        except Exception as e:
+            logger.log_error(f"Failed to load registry version {version}", e)
+            return False
+
+    def swap_model(self, model, version: str = None, metadata: Dict = None):
+        """Atomically replace the live model"""
+        self.model_metadata = metadata
+        self.model_version = version
+        self.model = model
+        logger.log_info(f"Live model swapped to version {version}")
+
+    def refresh_model(self):
+        """Cheap per-request check for a newly activated registry version"""
+        if self.registry is None:
+            return
+
+        now = time.monotonic()
+        if now - self._last_refresh < self.refresh_interval:
+            return
+        self._last_refresh = now
+
+        version = self.registry.current_version()
+        with self._swap_lock:
+            # Checked and set together so concurrent requests start at most one load
+            if not version or version == self.model_version or self._loading:
+                return
+            self._loading = True
+        threading.Thread(target=self._background_load, args=(version,),
+                         name='model-hot-swap', daemon=True).start()
+
+    def _background_load(self, version: str):
+        try:
+            self._load_version(version)
+        except Exception as e:
+            logger.log_error(f"Hot swap to model version {version} failed", e)
+        finally:
+            with self._swap_lock:
+                self._loading = False
+
+    def _load_version(self, version: str):
+        model, metadata = self.registry.load(version)
+        if metadata.get('feature_columns') != list(self.feature_columns):
+            raise ValueError(
+                f"Model version {version} expects features {metadata.get('feature_columns')}, "
+                f"not {list(self.feature_columns)}"
+            )
+        with self._swap_lock:
+            self.swap_model(model, version, metadata)
+
+    def enable_shadow(self, version: str, sample_rate: float = 0.1):
+        """Score a sampled fraction of traffic with a candidate registry version"""
+        if self.registry is None:
+            raise RuntimeError("Shadow scoring needs a model registry")
+
+        candidate, metadata = self.registry.load(version)
+        if metadata.get('feature_columns') != list(self.feature_columns):
+            raise ValueError(f"Shadow version {version} has incompatible feature columns")
+
+        self.disable_shadow()
+        self.shadow = ShadowScorer(candidate, version, sample_rate)
+        logger.log_info(f"Shadow scoring enabled for version {version} at {sample_rate:.0%}")
+
+    def disable_shadow(self):
+        if self.shadow:
+            self.shadow.shutdown()
+            self.shadow = None
+
+    def model_info(self) -> Dict:
+        model = self.model
+        return {
+            'version': self.model_version,
+            'model_type': type(model).__name__ if model is not None else None,
+            'feature_columns': list(self.feature_columns),
+            'classes': [str(c) for c in getattr(model, 'classes_', [])],
+            'training_stats': (self.model_metadata or {}).get('training_stats', {}),
+            'shadow': self.shadow.report() if self.shadow else None
+        }
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage versioned crop recommendation models")
+    parser.add_argument('--root', default=os.getenv('MODEL_REGISTRY_DIR', 'models/registry'))
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help="List versions and show the active one")
+    publish_cmd = commands.add_parser('publish', help="Publish a joblib model file as a new version")
+    publish_cmd.add_argument('path')
+    publish_cmd.add_argument('--features', required=True, help="Comma-separated feature columns")
+    publish_cmd.add_argument('--no-activate', action='store_true')
+    activate_cmd = commands.add_parser('activate', help="Make an existing version live")
+    activate_cmd.add_argument('version')
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.root)
+    if args.command == 'list':
+        current = registry.current_version()
+        for name in registry.list_versions():
+            print(f"{'*' if name == current else ' '} {name}")
+    elif args.command == 'publish':
+        print(registry.publish(joblib.load(args.path), args.features.split(','),
+                               activate=not args.no_activate))
+    elif args.command == 'activate':
+        registry.activate(args.version)
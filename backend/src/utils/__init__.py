@@ -10,6 +10,8 @@ import requests
 from requests.exceptions import RequestException
 from flask import jsonify
 
+from .log_pipeline import route
+
 class APILogger:
     """Enhanced API logging with structured logging"""
     
@@ -17,10 +19,8 @@ class APILogger:
         self.logger = logging.getLogger(__name__)
         
         if log_file:
-            handler = logging.FileHandler(log_file)
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            handler.setFormatter(formatter)
-            self.logger.addHandler(handler)
+            # One shared file handler on the queue pipeline, however many instances
+            route(__name__, log_file)
     
     def log_info(self, message: str, extra: Dict = None):
         """Log info message with structured data"""
@@ -37,6 +37,8 @@ class APILogger:
         """Log warning message"""
         self.logger.warning(message, extra=extra)
 
+logger = APILogger()
+
 def safe_api_request(url: str, params: Dict = None, headers: Dict = None, 
                      timeout: int = 30, method: str = 'GET') -> Optional[Dict]:
     """
@@ -54,7 +56,6 @@ def safe_api_request(url: str, params: Dict = None, headers: Dict = None,
         return response.json()
         
     except RequestException as e:
-        logger = APILogger()
         logger.log_error(f"API request failed to {url}", e, {
             'url': url,
             'params': params,
@@ -80,10 +81,8 @@ def retry_api_call(max_retries: int = 3, delay: float = 1.0, backoff: float = 2.
                     if retries == max_retries:
                         raise e
                     
-                    logger = APILogger()
                     logger.log_warning(
-                        f"Retry {retries}/{max_retries} for {func.__name__}",
-                        e,
+                        f"Retry {retries}/{max_retries} for {func.__name__}: {e}",
                         {'retry_count': retries, 'delay': current_delay}
                     )
                     
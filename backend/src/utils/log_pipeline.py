@@ -0,0 +1,188 @@
+"""
+Process-wide, non-blocking logging pipeline
+
+configure_logging() puts a single QueueHandler on the root logger, so request
+threads only enqueue records; a QueueListener thread writes them as JSON lines
+to per-module log files (see route()) and to the console. It is idempotent and
+shared by both backends, so APILogger instances no longer open handlers of
+their own.
+
+Upstream response bodies go through log_payload(): only a sampled fraction
+(LOG_PAYLOAD_SAMPLE_RATE) is logged, serialised when the record is actually
+emitted and truncated to LOG_PAYLOAD_MAX_BYTES.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import threading
+from typing import Callable, Dict, Optional
+
+_lock = threading.Lock()
+_listener = None
+_router = None
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Set from LOG_PAYLOAD_SAMPLE_RATE / LOG_PAYLOAD_MAX_BYTES by configure_logging()
+payload_sample_rate = 0.01
+payload_max_bytes = 1024
+
+# LogRecord attributes; anything else on a record came in through extra=
+_RECORD_FIELDS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message and any extra= fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': f"{self.formatTime(record, '%Y-%m-%dT%H:%M:%S')}.{int(record.msecs):03d}",
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS and value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class RoutingHandler(logging.Handler):
+    """Writes each record to the file routed for its logger name (or the nearest parent)"""
+
+    def __init__(self, default_file: str, base_dir: str = ''):
+        super().__init__()
+        self.base_dir = base_dir  # relative paths are resolved against it
+        self.files: Dict[str, logging.Handler] = {}
+        self.routes: Dict[str, logging.Handler] = {}
+        self.default = self._file_handler(default_file)
+
+    def _file_handler(self, path: str) -> logging.Handler:
+        path = os.path.abspath(os.path.join(self.base_dir, path))
+        if path not in self.files:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            handler = logging.FileHandler(path, encoding='utf-8')
+            handler.setFormatter(JsonFormatter())
+            self.files[path] = handler
+        return self.files[path]
+
+    def route(self, name: str, path: str):
+        with self.lock:
+            self.routes[name] = self._file_handler(path)
+
+    def emit(self, record: logging.LogRecord):
+        name = record.name
+        while name and name not in self.routes:
+            name = name.rpartition('.')[0]
+        self.routes.get(name, self.default).handle(record)
+
+    def close(self):
+        for handler in self.files.values():
+            handler.close()
+        super().close()
+
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that stamps records with caller-thread context (e.g. the request id)"""
+
+    def __init__(self, log_queue, context: Optional[Callable[[], Dict]] = None):
+        super().__init__(log_queue)
+        self.context = context
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if self.context:
+            for key, value in self.context().items():
+                setattr(record, key, value)
+        return super().prepare(record)
+
+
+class Payload:
+    """Log argument that serialises a response body only when formatted, capped at max_bytes"""
+    __slots__ = ('value', 'max_bytes')
+
+    def __init__(self, value, max_bytes: int = None):
+        self.value = value
+        self.max_bytes = max_bytes or payload_max_bytes
+
+    def __str__(self) -> str:
+        text = self.value if isinstance(self.value, str) else json.dumps(self.value, default=str, ensure_ascii=False)
+        data = text.encode('utf-8')
+        if len(data) <= self.max_bytes:
+            return text
+        return f"{data[:self.max_bytes].decode('utf-8', 'ignore')}... [{len(data)} bytes]"
+
+
+def log_payload(logger: logging.Logger, label: str, value, level: int = logging.INFO,
+                sample_rate: float = None) -> bool:
+    """Log `label: value` for a sampled fraction of calls; returns whether it was logged"""
+    rate = payload_sample_rate if sample_rate is None else sample_rate
+    if rate <= 0 or not logger.isEnabledFor(level):
+        return False
+    if rate < 1 and random.random() >= rate:
+        return False
+    logger.log(level, '%s: %s', label, Payload(value))
+    return True
+
+
+def configure_logging(level: str = None, default_file: str = None,
+                      context: Optional[Callable[[], Dict]] = None) -> None:
+    """
+    Install the queue pipeline once per process (later calls only adjust the level)
+    LOG_LEVEL, LOG_FILE and LOG_CONSOLE_FORMAT (text/json) provide the defaults;
+    relative log file paths are resolved against LOG_DIR (the working directory if unset)
+    """
+    global _listener, _router, payload_sample_rate, payload_max_bytes
+    root = logging.getLogger()
+    with _lock:
+        if level or _listener is None:
+            root.setLevel((level or os.getenv('LOG_LEVEL', 'INFO')).upper())
+        if _listener is not None:
+            if context:
+                for handler in root.handlers:
+                    if isinstance(handler, ContextQueueHandler):
+                        handler.context = context
+            return
+
+        payload_sample_rate = float(os.getenv('LOG_PAYLOAD_SAMPLE_RATE', str(payload_sample_rate)))
+        payload_max_bytes = int(os.getenv('LOG_PAYLOAD_MAX_BYTES', str(payload_max_bytes)))
+        _router = RoutingHandler(default_file or os.getenv('LOG_FILE', 'logs/app.log'), os.getenv('LOG_DIR', ''))
+        console = logging.StreamHandler()
+        console.setFormatter(JsonFormatter() if os.getenv('LOG_CONSOLE_FORMAT', 'text') == 'json'
+                             else logging.Formatter(TEXT_FORMAT))
+
+        log_queue = queue.Queue(-1)
+        # Handlers from an earlier basicConfig would write synchronously (and twice)
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(ContextQueueHandler(log_queue, context))
+
+        _listener = logging.handlers.QueueListener(log_queue, _router, console, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)  # drain the queue on shutdown
+
+
+def route(name: str, path: str) -> None:
+    """Send records of logger `name` (and its children) to the file at path"""
+    configure_logging()
+    _router.route(name, path)
+
+
+def add_handler(handler: logging.Handler) -> None:
+    """Also pass every record to handler on the listener thread (e.g. log volume metrics)"""
+    configure_logging()
+    with _lock:
+        if handler not in _listener.handlers:
+            _listener.handlers = (*_listener.handlers, handler)
+
+
+def flush() -> None:
+    """Block until every record queued so far has been written"""
+    if _listener is not None:
+        _listener.queue.join()
@@ -0,0 +1,92 @@
+"""
+Test silence trimming, duration capping and resampling of voice recordings
+Uses synthetic recordings; the WEBM/Opus test runs only where ffmpeg (or
+imageio-ffmpeg) is available, and no Google Cloud access is needed
+"""
+import io
+import wave
+
+import numpy as np
+import pytest
+
+from audio_preprocess import AudioPreprocessor, find_ffmpeg
+
+
+def make_wav(segments, rate=48000, channels=1):
+    """WAV bytes from (seconds, amplitude) segments: 0 is near-silence, >0 a 220 Hz tone"""
+    rng = np.random.default_rng(0)
+    parts = []
+    for seconds, amplitude in segments:
+        t = np.arange(int(seconds * rate)) / rate
+        noise = rng.normal(0, 0.002, len(t))
+        parts.append(amplitude * np.sin(2 * np.pi * 220 * t) + noise)
+    samples = np.concatenate(parts)
+    frames = np.repeat(samples[:, None], channels, axis=1)
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes((frames * 32767).astype('<i2').tobytes())
+    return buffer.getvalue()
+
+
+def test_trims_leading_and_trailing_silence():
+    preprocessor = AudioPreprocessor(output='linear16')
+    prepared = preprocessor.process(make_wav([(2.0, 0), (1.5, 0.3), (3.0, 0)], channels=2))
+    stats = prepared['stats']
+
+    assert prepared['encoding'] == 'LINEAR16'
+    assert prepared['sample_rate'] == 16000
+    assert stats['input_seconds'] == 6.5
+    # 1.5 s of speech plus 300 ms padding either side (to frame precision)
+    assert 2.0 <= stats['output_seconds'] <= 2.2
+    assert stats['output_bytes'] == len(prepared['content'])
+    assert stats['bytes_saved'] > 0.8 * stats['input_bytes']
+    print(f"✅ {stats['input_seconds']} s → {stats['output_seconds']} s, saved {stats['bytes_saved']} bytes")
+
+
+def test_caps_duration():
+    preprocessor = AudioPreprocessor(output='linear16', max_seconds=2)
+    prepared = preprocessor.process(make_wav([(0.5, 0), (5.0, 0.3)], rate=16000))
+    assert prepared['stats']['output_seconds'] <= 2.0
+
+
+def test_keeps_recording_without_clear_speech():
+    preprocessor = AudioPreprocessor(output='linear16')
+    prepared = preprocessor.process(make_wav([(2.0, 0)], rate=16000))
+    assert prepared['stats']['output_seconds'] == prepared['stats']['input_seconds']
+
+
+def test_undecodable_audio_passes_through():
+    preprocessor = AudioPreprocessor(ffmpeg=None)
+    preprocessor.ffmpeg = None  # even if ffmpeg is installed here
+    prepared = preprocessor.process(b'\x1aE\xdf\xa3not-really-webm')
+    assert prepared['encoding'] == 'WEBM_OPUS'
+    assert prepared['sample_rate'] == 48000
+    assert prepared['content'] == b'\x1aE\xdf\xa3not-really-webm'
+    assert preprocessor.stats()['passthrough'] == 1
+
+
+@pytest.mark.skipif(find_ffmpeg() is None, reason="ffmpeg not available")
+def test_browser_webm_is_trimmed_with_ffmpeg():
+    preprocessor = AudioPreprocessor()
+    # What MediaRecorder uploads: Opus in WEBM at 48 kHz
+    webm = preprocessor._ffmpeg(['-f', 'wav', '-i', 'pipe:0', '-c:a', 'libopus', '-f', 'webm', 'pipe:1'],
+                                make_wav([(2.0, 0), (1.5, 0.3), (2.0, 0)]))
+    prepared = preprocessor.process(webm)
+    assert prepared['encoding'] == 'OGG_OPUS' and prepared['sample_rate'] == 16000
+    assert prepared['stats']['output_seconds'] < 2.5
+    assert preprocessor.stats()['passthrough'] == 0
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            skip = [m for m in getattr(test, 'pytestmark', []) if m.name == 'skipif' and m.args[0]]
+            if skip:
+                print(f"⏭️  {name} ({skip[0].kwargs['reason']})")
+                continue
+            test()
+            print(f"✅ {name}")
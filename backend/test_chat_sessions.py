@@ -0,0 +1,130 @@
+"""
+Test server-side chat sessions: history in the prompt, compaction under the
+token budget, expiry and unknown session ids at /chatbot/text. Uses a
+recording stand-in LLM; runs with pytest or directly
+"""
+import time
+from types import SimpleNamespace
+
+from chat_sessions import SessionStore, estimate_tokens
+from chatbot_service import MultilingualChatbot
+
+CONTEXT = {'state': 'Punjab', 'district': 'Ludhiana', 'top_crops': ['wheat', 'rice']}
+
+
+class RecordingLLM:
+    """Answers with a fixed paragraph and keeps the messages of every call"""
+    def __init__(self):
+        self.calls = []
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, model, messages, stream=False, **kwargs):
+        self.calls.append(messages)
+        answer = f"Answer {len(self.calls)}: " + "sow after the first good rain and keep the field weed free. " * 3
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=answer))])
+
+
+def prompt_tokens(messages):
+    return sum(estimate_tokens(m['content']) for m in messages)
+
+
+def test_follow_up_sees_earlier_turn():
+    llm = RecordingLLM()
+    sessions = SessionStore()
+    chatbot = MultilingualChatbot(llm_client=llm, llm_model='stand-in', sessions=sessions)
+    session = sessions.create(CONTEXT)
+
+    chatbot.process_text_query("When should I sow wheat?", session=session)
+    result = chatbot.process_text_query("And how much seed per acre?", session=session)
+
+    messages = llm.calls[-1]
+    assert result['session_id'] == session.id
+    assert [m['role'] for m in messages] == ['system', 'user', 'assistant', 'user']
+    assert messages[1]['content'] == "When should I sow wheat?"
+    assert 'Ludhiana' in messages[-1]['content']  # context comes from the session
+
+
+def test_prompt_size_stays_bounded():
+    llm = RecordingLLM()
+    sessions = SessionStore(history_tokens=200, summary_tokens=60)
+    chatbot = MultilingualChatbot(llm_client=llm, llm_model='stand-in', sessions=sessions)
+    session = sessions.create(CONTEXT)
+
+    for i in range(30):
+        chatbot.process_text_query(f"Question number {i} about my wheat field irrigation schedule?", session=session)
+
+    sizes = [prompt_tokens(messages) for messages in llm.calls]
+    assert max(sizes[10:]) - min(sizes[10:]) < 40
+    assert session.history_tokens <= 200
+    assert session.summary and session.summary[-1].startswith("Question number")
+    print(f"✅ Prompt tokens: first {sizes[0]}, max {max(sizes)}, last {sizes[-1]}")
+
+
+def test_expired_session_is_gone():
+    sessions = SessionStore(ttl=0.05)
+    session = sessions.create(CONTEXT)
+    assert sessions.get(session.id).id == session.id
+    time.sleep(0.1)
+    assert sessions.get(session.id) is None
+    assert sessions.stats()['expired'] == 1
+
+
+def test_store_evicts_least_recently_used():
+    sessions = SessionStore(max_sessions=2)
+    first, second = sessions.create(CONTEXT), sessions.create(CONTEXT)
+    sessions.get(first.id)
+    sessions.create(CONTEXT)
+    assert sessions.get(first.id).id == first.id
+    assert sessions.get(second.id) is None
+
+
+def test_workers_share_sessions():
+    import os
+    import tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        # One store per gunicorn worker, over the same file
+        path = os.path.join(directory, 'sessions.db')
+        worker_a, worker_b = SessionStore(path=path), SessionStore(path=path)
+        llm = RecordingLLM()
+        chatbot_a = MultilingualChatbot(llm_client=llm, llm_model='stand-in', sessions=worker_a)
+        chatbot_b = MultilingualChatbot(llm_client=llm, llm_model='stand-in', sessions=worker_b)
+
+        session = worker_a.create(CONTEXT)
+        chatbot_a.process_text_query("When should I sow wheat?", session=session)
+        follow_up = worker_b.get(session.id)
+        assert follow_up.context == CONTEXT
+        chatbot_b.process_text_query("And how much seed per acre?", session=follow_up)
+
+        assert llm.calls[-1][1]['content'] == "When should I sow wheat?"
+        assert [q for q, _ in worker_a.get(session.id).turns] == ["When should I sow wheat?",
+                                                                  "And how much seed per acre?"]
+
+        # Expiry and the LRU bound apply across workers too
+        worker_a.ttl = worker_b.ttl = 0.05
+        time.sleep(0.1)
+        assert worker_b.get(session.id) is None and worker_a.get(session.id) is None
+        worker_a.max_sessions = 1
+        first, second = worker_a.create(CONTEXT), worker_b.create(CONTEXT)
+        worker_a.create(CONTEXT)
+        assert worker_b.get(first.id) is None and worker_b.get(second.id) is None
+
+
+def test_unknown_session_id_is_rejected():
+    import app as backend
+    client = backend.app.test_client()
+    sessions_before = backend.chatbot.sessions.stats()['sessions']
+    # e.g. expired or evicted: the client must resend its context
+    response = client.post('/chatbot/text', json={'message': "And how much seed?", 'session_id': 'unknown'})
+    assert response.status_code == 410 and response.get_json()['session_expired']
+    assert backend.chatbot.sessions.stats()['sessions'] == sessions_before
+
+    started = client.post('/chatbot/text', json={'message': "When to sow wheat?", 'session': True, **CONTEXT})
+    session = backend.chatbot.sessions.get(started.get_json()['session_id'])
+    assert session.context['district'] == 'Ludhiana'
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"✅ {name}")
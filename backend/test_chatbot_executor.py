@@ -0,0 +1,62 @@
+"""
+Test admission control of the bounded chatbot executor
+Runs with pytest or directly
+"""
+import threading
+import time
+
+import pytest
+
+from chatbot_executor import ChatbotExecutor, ChatbotOverloaded
+
+
+def test_rejects_beyond_workers_and_queue():
+    executor = ChatbotExecutor(workers=2, queue_limit=1)
+    release = threading.Event()
+    futures = [executor.submit(release.wait) for _ in range(3)]
+
+    with pytest.raises(ChatbotOverloaded) as error:
+        executor.submit(release.wait)
+    assert error.value.retry_after >= 1
+    assert executor.stats()['in_flight'] == 3
+
+    release.set()
+    for future in futures:
+        future.result(timeout=1)
+    time.sleep(0.05)
+    assert executor.stats()['in_flight'] == 0
+    executor.submit(time.sleep, 0).result(timeout=1)  # slots are free again
+
+
+def test_stream_holds_a_slot_until_finished():
+    executor = ChatbotExecutor(workers=1, queue_limit=0)
+
+    def events():
+        for i in range(3):
+            time.sleep(0.01)
+            yield 'token', {'text': str(i)}
+
+    stream = executor.stream(events())
+    with pytest.raises(ChatbotOverloaded):
+        executor.submit(time.sleep, 0)
+    assert [data['text'] for _, data in stream] == ['0', '1', '2']
+    time.sleep(0.05)
+    assert executor.stats()['in_flight'] == 0
+
+
+def test_stream_times_out_without_output():
+    executor = ChatbotExecutor(workers=1, queue_limit=0, item_timeout=0.05)
+
+    def stalled():
+        time.sleep(0.2)
+        yield 'token', {'text': 'late'}
+
+    with pytest.raises(TimeoutError):
+        list(executor.stream(stalled()))
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,57 @@
+"""
+Accuracy of the script-based language detector on sample farmer questions
+Runs with pytest or directly
+"""
+from language_detect import detect_language
+
+# (text, expected ISO 639-1 code)
+SAMPLES = [
+    ("मेरे खेत में कौन सी फसल अच्छी होगी?", 'hi'),
+    ("गेहूं में कितना पानी देना चाहिए?", 'hi'),
+    ("इस साल बारिश कम हुई है, क्या करें?", 'hi'),
+    ("PM Kisan का पैसा कब आएगा?", 'hi'),
+    ("धान की रोपाई", 'hi'),
+    ("माझ्या शेतात कोणते पीक चांगले येईल?", 'mr'),
+    ("कापसाला किती पाणी द्यावे?", 'mr'),
+    ("यावर्षी पाऊस कमी झाला आहे, काय करावे?", 'mr'),
+    ("सोयाबीनवर अळी पडली आहे", 'mr'),
+    ("నా పొలంలో ఏ పంట బాగా పండుతుంది?", 'te'),
+    ("వరికి ఏ ఎరువు వేయాలి", 'te'),
+    ("என் வயலில் எந்த பயிர் நன்றாக வளரும்?", 'ta'),
+    ("ನನ್ನ ಹೊಲದಲ್ಲಿ ಯಾವ ಬೆಳೆ ಚೆನ್ನಾಗಿ ಬೆಳೆಯುತ್ತದೆ?", 'kn'),
+    ("আমার জমিতে কোন ফসল ভালো হবে?", 'bn'),
+    ("મારા ખેતરમાં કયો પાક સારો થશે?", 'gu'),
+    ("എന്റെ വയലിൽ ഏത് വിള നന്നായി വളരും?", 'ml'),
+    ("ਮੇਰੇ ਖੇਤ ਵਿੱਚ ਕਿਹੜੀ ਫਸਲ ਚੰਗੀ ਹੋਵੇਗੀ?", 'pa'),
+    ("Which crop is best for my field?", 'en'),
+    ("How much water does wheat need in December?", 'en'),
+    ("When is the right time to sow cotton in Punjab", 'en'),
+    ("Is DAP better than urea for paddy?", 'en'),
+    ("gehu mein kitna pani dena chahiye", 'hi'),
+    ("kapas ki buvai kab kare", 'hi'),
+    ("meri fasal mein keede lag gaye hain kya karu", 'hi'),
+]
+
+
+def test_sample_accuracy():
+    wrong = [(text, expected, detect_language(text)) for text, expected in SAMPLES
+             if detect_language(text) != expected]
+    assert not wrong, wrong
+
+
+def test_default_for_text_without_letters():
+    assert detect_language("") == 'en'
+    assert detect_language("42 ?!") == 'en'
+    assert detect_language("", default='hi') == 'hi'
+
+
+def test_indic_script_wins_over_embedded_english():
+    assert detect_language("Drip irrigation के लिए subsidy कैसे मिलेगी?") == 'hi'
+    assert detect_language("DAP యూరియా ఎంత వేయాలి") == 'te'
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,110 @@
+"""
+Test the queue-based logging pipeline: one handler per file however many
+loggers are created, JSON records routed per module, and request threads
+not waiting on disk writes. Runs with pytest or directly
+"""
+import json
+import logging
+import os
+import tempfile
+import time
+
+from src.utils import log_pipeline
+from utils import APILogger
+
+
+def read_records(path):
+    log_pipeline.flush()
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_loggers_share_one_handler_per_file():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'pipeline_share.log')
+        handlers_before = len(logging.getLogger().handlers)
+        loggers = [APILogger(path) for _ in range(50)]
+        loggers[7].log_error("upstream failed", ValueError("boom"))
+
+        assert len(logging.getLogger().handlers) == handlers_before
+        assert sum(os.path.basename(p) == 'pipeline_share.log' for p in log_pipeline._router.files) == 1
+        [record] = read_records(path)
+        assert record['logger'] == 'pipeline_share' and record['level'] == 'ERROR'
+        assert 'boom' in record['message']
+
+
+def test_records_routed_with_extra_fields():
+    with tempfile.TemporaryDirectory() as directory:
+        weather, market = os.path.join(directory, 'w.log'), os.path.join(directory, 'm.log')
+        log_pipeline.route('pipeline_weather', weather)
+        log_pipeline.route('pipeline_market', market)
+        logging.getLogger('pipeline_weather.client').info("fetched", extra={'provider': 'openweather', 'ms': 41})
+        logging.getLogger('pipeline_market').warning("stale prices")
+
+        [record] = read_records(weather)
+        assert record['logger'] == 'pipeline_weather.client'
+        assert record['provider'] == 'openweather' and record['ms'] == 41
+        assert [r['message'] for r in read_records(market)] == ["stale prices"]
+
+
+def test_request_threads_do_not_wait_for_disk():
+    class SlowDisk(logging.Handler):
+        def emit(self, record):
+            time.sleep(0.05)
+
+    slow = SlowDisk()
+    log_pipeline._router.routes['pipeline_slow'] = slow
+    logger = logging.getLogger('pipeline_slow')
+
+    start = time.perf_counter()
+    for i in range(20):
+        logger.info("request %d", i)
+    elapsed = time.perf_counter() - start
+    assert elapsed < 0.05  # 20 writes take a second on the listener thread
+    log_pipeline.flush()
+
+
+def test_payloads_sampled_capped_and_lazy():
+    class Response(dict):
+        renders = 0
+
+        def __str__(self):
+            Response.renders += 1
+            return super().__str__()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'pipeline_payload.log')
+        log_pipeline.route('pipeline_payload', path)
+        logger = logging.getLogger('pipeline_payload')
+        body = {'address': {'village': 'Dugri', 'state': 'Punjab'}, 'tiles': ['x' * 100] * 50}
+
+        logged = [log_pipeline.log_payload(logger, "Nominatim response", body, sample_rate=0.25) for _ in range(400)]
+        assert 50 < sum(logged) < 150
+        assert not log_pipeline.log_payload(logger, "skipped", Response(), logging.DEBUG, sample_rate=1)
+        assert Response.renders == 0  # below the logger level, never formatted
+
+        records = read_records(path)
+        assert len(records) == sum(logged)
+        message = records[0]['message']
+        assert message.startswith('Nominatim response: {"address": {"village": "Dugri"')
+        assert len(message.encode()) < log_pipeline.payload_max_bytes + 100
+        assert message.endswith(f'... [{len(json.dumps(body))} bytes]')
+
+
+def test_relative_paths_resolve_against_log_dir():
+    with tempfile.TemporaryDirectory() as directory:
+        router = log_pipeline.RoutingHandler('logs/app.log', directory)
+        router.route('pipeline_soil', 'logs/soil.log')
+        router.route('pipeline_abs', os.path.join(directory, 'abs.log'))
+        try:
+            assert set(router.files) == {os.path.join(directory, 'logs', name) for name in ('app.log', 'soil.log')} \
+                | {os.path.join(directory, 'abs.log')}
+        finally:
+            router.close()
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,69 @@
+"""
+Test the Prometheus instrumentation: upstream outcomes, cache lookups and the
+/predict stage histograms and per-endpoint log volume served from /metrics. Upstream calls are stubbed;
+runs with pytest or directly
+"""
+import pytest
+import requests
+
+import metrics
+from src.utils import log_pipeline
+
+pytestmark = pytest.mark.skipif(not metrics.ENABLED, reason="prometheus_client not installed")
+
+
+def sample(name, **labels):
+    from prometheus_client import REGISTRY
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_upstream_outcomes():
+    before = {outcome: sample('upstream_request_seconds_count', provider='stand-in', outcome=outcome)
+              for outcome in ('ok', 'error', 'timeout')}
+
+    with metrics.upstream('stand-in'):
+        pass
+    with metrics.upstream('stand-in') as call:
+        call.outcome = 'error'  # e.g. a 503 answer
+    for error in (requests.Timeout(), ConnectionError()):
+        try:
+            with metrics.upstream('stand-in'):
+                raise error
+        except (requests.Timeout, ConnectionError):
+            pass
+
+    for outcome, expected in (('ok', 1), ('error', 2), ('timeout', 1)):
+        count = sample('upstream_request_seconds_count', provider='stand-in', outcome=outcome)
+        assert count - before[outcome] == expected
+
+
+def test_predict_stages_on_metrics_endpoint():
+    import app as backend
+    stand_ins = {
+        'get_location_info': lambda lat, lon: {'state': 'Punjab', 'district': 'Ludhiana', 'area': 'Dugri'},
+        'get_weather_data': lambda lat, lon: {'success': True},
+        'get_current_price': lambda crop, state, district: backend.get_fallback_price(crop)
+    }
+    originals = {name: getattr(backend, name) for name in stand_ins}
+    vars(backend).update(stand_ins)
+    try:
+        client = backend.app.test_client()
+        assert client.post('/predict', json={'latitude': 30.9, 'longitude': 75.85}).status_code == 200
+    finally:
+        vars(backend).update(originals)
+    log_pipeline.flush()  # log volume is counted on the listener thread
+    metrics.record_cache('weather', 'hit')
+
+    body = client.get('/metrics').get_data(as_text=True)
+    for stage in ('geocoding', 'weather', 'soil', 'scoring'):
+        assert f'predict_stage_seconds_count{{stage="{stage}"}}' in body
+    assert 'cache_lookups_total{cache="weather",result="hit"}' in body
+    assert 'log_records_total{endpoint="predict_crop",level="INFO"}' in body
+    assert 'log_bytes_total{endpoint="predict_crop"}' in body
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"✅ {name}")
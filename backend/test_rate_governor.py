@@ -0,0 +1,71 @@
+"""
+Test the provider rate governor: burst smoothing, deadlines and degraded answers
+Runs with pytest or directly
+"""
+import time
+from types import SimpleNamespace
+
+from chatbot_service import BUSY_MESSAGE, MultilingualChatbot
+from faq_index import FAQIndex
+from rate_governor import RateGovernor
+
+
+class CountingLLM:
+    def __init__(self):
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, model, messages, stream=False, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="LLM answer"))])
+
+
+def test_burst_then_smoothed_to_rate():
+    governor = RateGovernor({'api': 600}, burst_seconds=0.5, max_wait=1)  # 10/s, burst of 5
+    start = time.perf_counter()
+    for _ in range(10):
+        assert governor.acquire({'api': 1})
+    elapsed = time.perf_counter() - start
+    # 5 go straight through, the other 5 are spaced 100 ms apart
+    assert 0.4 <= elapsed < 0.8
+    stats = governor.stats()['api']
+    assert stats['waits'] == 5 and stats['rejected'] == 0
+
+
+def test_rejects_when_wait_exceeds_deadline():
+    governor = RateGovernor({'requests': 60, 'tokens': 600}, burst_seconds=1, max_wait=0.2)
+    assert governor.acquire({'requests': 1, 'tokens': 5})
+    # One request fits, but not 100 tokens within 0.2 s; nothing is reserved then
+    assert not governor.acquire({'requests': 1, 'tokens': 100})
+    stats = governor.stats()
+    assert stats['tokens']['rejected'] == 1
+    assert stats['requests']['utilization'] == round(1 / 60, 3)
+
+
+def test_pause_after_provider_429():
+    governor = RateGovernor({'groq:m:requests': 600}, max_wait=0.1)
+    governor.pause('groq', 1)
+    assert not governor.acquire({'groq:m:requests': 1})
+
+
+def test_exhausted_llm_quota_degrades_to_faq():
+    llm = CountingLLM()
+    governor = RateGovernor({'groq:stand-in:requests': 1}, burst_seconds=60, max_wait=0.1)
+    chatbot = MultilingualChatbot(llm_client=llm, llm_model='stand-in', faq_index=FAQIndex(),
+                                  rate_governor=governor)
+
+    assert chatbot.generate_response("what is the weather tomorrow") == "LLM answer"
+    assert llm.calls == 1
+    # Quota used up: a loose FAQ match, else a busy notice, without calling the LLM
+    assert chatbot.generate_response("when is the best time to sow my wheat seeds") != "LLM answer"
+    assert chatbot.generate_response("what is the weather tomorrow") == BUSY_MESSAGE
+    # Same crop, different action: never the sowing-time answer
+    assert chatbot.generate_response("when should I harvest my wheat") == BUSY_MESSAGE
+    assert llm.calls == 1
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,33 @@
+"""
+Test near-duplicate matching in the chatbot answer cache: spelling variants
+share an answer, questions about other crops or negated questions never do.
+Runs with pytest or directly
+"""
+from response_cache import ResponseCache
+
+CONTEXT = {'state': 'Punjab', 'district': 'Ludhiana', 'season': 'Rabi'}
+
+
+def test_near_duplicates_share_an_answer():
+    cache = ResponseCache()
+    cache.put("Which fertilizer should I use for wheat?", CONTEXT, "DAP at sowing, urea later")
+    assert cache.get("which fertiliser should i use for wheat", CONTEXT) == "DAP at sowing, urea later"
+    assert cache.get("Which fertilizer should I use for cotton?", CONTEXT) is None
+
+
+def test_negation_is_never_a_near_duplicate():
+    cache = ResponseCache()
+    cache.put("Should I irrigate wheat before sowing?", CONTEXT, "Yes, a pre-sowing irrigation")
+    for question in ("Should I not irrigate wheat before sowing?", "Should I no irrigate wheat before sowing?",
+                     "Shouldn't I irrigate wheat before sowing?"):
+        assert cache.get(question, CONTEXT) is None
+
+    cache.put("Why should I not burn wheat stubble?", CONTEXT, "It kills soil life")
+    assert cache.get("Why should I burn wheat stubble?", CONTEXT) is None
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"✅ {name}")
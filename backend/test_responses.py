@@ -0,0 +1,65 @@
+"""
+Test the /predict response encoding: Accept-Encoding negotiation, the compact
+schema (top recommendations as indexes into all_crops) and small bodies left
+uncompressed. Upstream calls are stubbed; runs with pytest or directly
+"""
+import gzip
+import json
+
+import app as backend
+import responses
+
+STAND_INS = {
+    'get_location_info': lambda lat, lon: {'state': 'Maharashtra', 'district': 'Vidarbha', 'area': 'Nagpur'},
+    'get_weather_data': lambda lat, lon: {'success': True},
+    'get_current_price': lambda crop, state, district: backend.get_fallback_price(crop)
+}
+
+
+def predict(query='', **headers):
+    originals = {name: getattr(backend, name) for name in STAND_INS}
+    vars(backend).update(STAND_INS)
+    try:
+        return backend.app.test_client().post(f'/predict{query}', headers=headers,
+                                              json={'latitude': 21.15, 'longitude': 79.09})
+    finally:
+        vars(backend).update(originals)
+
+
+def test_gzip_negotiated():
+    plain = predict()
+    assert 'Content-Encoding' not in plain.headers
+    assert 'Accept-Encoding' in plain.headers['Vary']
+
+    packed = predict(**{'Accept-Encoding': 'br;q=0, gzip, deflate'})
+    assert packed.headers['Content-Encoding'] == 'gzip'
+    assert int(packed.headers['Content-Length']) < len(plain.data) / 3
+    body = json.loads(gzip.decompress(packed.data))
+    assert body['predictions']['all_crops'][0]['crop'] == plain.get_json()['predictions']['all_crops'][0]['crop']
+
+
+def test_compact_schema_references_all_crops():
+    full = predict().get_json()['predictions']
+    compact = predict('?schema=compact').get_json()['predictions']
+
+    assert compact['schema'] == 'compact'
+    assert compact['top_recommendations'] == list(range(len(full['top_recommendations'])))
+    for index, crop in zip(compact['top_recommendations'], full['top_recommendations']):
+        expanded = {**compact['all_crops'][index], 'season': compact['season'], 'rank': index + 1}
+        assert expanded == crop
+    assert len(responses.dumps(compact)) < len(responses.dumps(full))
+
+
+def test_small_bodies_not_compressed():
+    with backend.app.test_request_context(headers={'Accept-Encoding': 'gzip'}):
+        assert 'Content-Encoding' not in responses.json_response({'success': True}).headers
+        assert responses.json_response({'pad': 'x' * 2000}).headers['Content-Encoding'] == 'gzip'
+    with backend.app.test_request_context(headers={'Accept-Encoding': 'identity'}):
+        assert 'Content-Encoding' not in responses.json_response({'pad': 'x' * 2000}).headers
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"✅ {name}")
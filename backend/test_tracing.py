@@ -0,0 +1,90 @@
+"""
+Test request tracing: the X-Debug-Timings breakdown, request ids, spans from
+chatbot worker threads and the trace-event export. Uses a small Flask app with
+stand-in stages; runs with pytest or directly
+"""
+import json
+import os
+import tempfile
+import time
+
+from flask import Flask, jsonify
+
+import metrics
+import tracing
+from chatbot_executor import ChatbotExecutor
+
+
+def traced_app(export_path=None):
+    os.environ['TRACING_ENABLED'] = 'True'
+    if export_path:
+        os.environ['TRACE_EXPORT_PATH'] = export_path
+    try:
+        app = Flask(__name__)
+        tracing.init_app(app)
+    finally:
+        os.environ.pop('TRACING_ENABLED')
+        os.environ.pop('TRACE_EXPORT_PATH', None)
+    executor = ChatbotExecutor(workers=1, queue_limit=1)
+
+    def llm_call():
+        with metrics.upstream('groq'):
+            time.sleep(0.02)
+        return tracing.request_id()
+
+    @app.route('/predict', methods=['POST'])
+    def predict():
+        with metrics.stage('weather'):
+            with metrics.upstream('openweather') as call:
+                time.sleep(0.01)
+                call.outcome = 'error'
+        # Spans recorded on the chatbot pool land in the same trace
+        worker_request_id = executor.submit(llm_call).result()
+        return jsonify({'success': True, 'worker_request_id': worker_request_id})
+
+    return app
+
+
+def test_debug_header_adds_timings():
+    client = traced_app().test_client()
+    response = client.post('/predict', headers={'X-Debug-Timings': '1', 'X-Request-ID': 'farm-42'})
+    body = response.get_json()
+
+    assert response.headers['X-Request-ID'] == 'farm-42'
+    assert body['worker_request_id'] == 'farm-42'
+    timings = body['timings']
+    names = [s['name'] for s in timings['spans']]
+    assert names == ['upstream:openweather', 'stage:weather', 'upstream:groq']
+    assert timings['spans'][0]['outcome'] == 'error'
+    assert timings['by_name_ms']['upstream:groq'] >= 20
+    assert 'stage-weather;dur=' in response.headers['Server-Timing']
+
+
+def test_untraced_request_is_unchanged():
+    client = traced_app().test_client()
+    response = client.post('/predict')
+    assert 'timings' not in response.get_json()
+    assert 'Server-Timing' not in response.headers
+    assert response.headers['X-Request-ID']  # generated
+    assert tracing.current() is None
+
+
+def test_export_is_valid_trace_event_json():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'traces.json')
+        client = traced_app(path).test_client()
+        for _ in range(2):
+            client.post('/predict', headers={'X-Debug-Timings': '1'})
+        with open(path) as f:
+            events = json.loads(f.read().rstrip().rstrip(',') + ']')
+
+    assert len(events) == 8  # request plus three spans, twice
+    assert all(e['ph'] == 'X' and e['dur'] > 0 for e in events)
+    assert {e['name'] for e in events} >= {'POST /predict', 'upstream:groq'}
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,39 @@
+"""
+Test the TTS disk cache as gunicorn workers share it: audio stored by one
+instance is served by another, and files removed elsewhere count as misses.
+Runs with pytest or directly
+"""
+import os
+import tempfile
+
+from tts_cache import TTSCache
+
+KEY = TTSCache.make_key("गेहूं की बुवाई नवंबर में करें", 'hi-IN', 'hi-IN-Wavenet-A', {'speaking_rate': 1.0})
+
+
+def test_other_workers_audio_is_served():
+    with tempfile.TemporaryDirectory() as directory:
+        writer, reader = TTSCache(directory), TTSCache(directory)
+        writer.put(KEY, b'mp3 bytes')
+
+        assert reader.get(KEY) == b'mp3 bytes'
+        assert reader.stats()['entries'] == 1 and reader.stats()['bytes'] == len(b'mp3 bytes')
+        assert reader.stats()['hits'] == 1
+
+
+def test_files_removed_elsewhere_are_misses():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = TTSCache(directory)
+        os.remove(cache.put(KEY, b'mp3 bytes'))
+
+        assert cache.get_path(KEY) is None
+        assert cache.stats()['entries'] == 0 and cache.stats()['bytes'] == 0
+        assert cache.get_path('0' * 64) is None
+        assert cache.stats()['misses'] == 2
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"✅ {name}")
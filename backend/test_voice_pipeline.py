@@ -0,0 +1,274 @@
+"""
+Test the pipelined voice chatbot with local stand-ins for STT, LLM and TTS,
+and the binary (raw/multipart) /chatbot/voice answers with a stubbed chatbot
+No Google Cloud or Groq credentials needed; runs with pytest or directly
+"""
+import threading
+import time
+from types import SimpleNamespace
+
+from chatbot_service import MultilingualChatbot, iter_sentences
+
+ANSWER = ("कपास के लिए काली मिट्टी अच्छी है। बुवाई मानसून की पहली बारिश के बाद करें। "
+          "Keep 60 cm between rows. Watch for pink bollworm after 45 days!")
+
+
+class StandInSpeech:
+    """Returns a fixed transcript after a short delay"""
+    def recognize(self, config, audio, **kwargs):
+        time.sleep(0.05)
+        alternative = SimpleNamespace(transcript="कपास कब बोएं?")
+        return SimpleNamespace(results=[SimpleNamespace(alternatives=[alternative], language_code='hi-IN')])
+
+
+class StandInLLM:
+    """Streams ANSWER one word at a time, mimicking Groq chunk objects"""
+    def __init__(self, token_delay=0.02):
+        self.token_delay = token_delay
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, model, messages, stream=False, **kwargs):
+        words = ANSWER.split(' ')
+        if not stream:
+            message = SimpleNamespace(content=ANSWER)
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+        def chunks():
+            for i, word in enumerate(words):
+                time.sleep(self.token_delay)
+                delta = SimpleNamespace(content=word if i == 0 else ' ' + word)
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+        return chunks()
+
+
+class StandInTTS:
+    """Returns the sentence as bytes and records when each call started"""
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.started = []
+        self.lock = threading.Lock()
+
+    def synthesize_speech(self, input, voice, audio_config, **kwargs):
+        with self.lock:
+            self.started.append((time.perf_counter(), input.text))
+        time.sleep(self.delay)
+        return SimpleNamespace(audio_content=input.text.encode('utf-8'))
+
+
+def make_chatbot(tts=None):
+    return MultilingualChatbot(speech_client=StandInSpeech(), tts_client=tts or StandInTTS(),
+                               llm_client=StandInLLM(), llm_model='stand-in')
+
+
+def test_iter_sentences_splits_on_danda_and_punctuation():
+    chunks = [ANSWER[i:i + 7] for i in range(0, len(ANSWER), 7)]
+    sentences = list(iter_sentences(chunks))
+    assert sentences[0] == "कपास के लिए काली मिट्टी अच्छी है।"
+    assert sentences[-1].endswith("after 45 days!")
+    assert ' '.join(sentences) == ANSWER
+
+
+def test_iter_sentences_merges_short_fragments():
+    assert list(iter_sentences(["Yes. ", "Sow cotton after the rains. Ok"])) == \
+        ["Yes. Sow cotton after the rains.", "Ok"]
+
+
+def test_voice_stream_event_order():
+    events = list(make_chatbot().process_voice_query_stream(b'fake-audio'))
+    names = [name for name, _ in events]
+    assert names[0] == 'transcript' and names[-1] == 'done'
+
+    audio = [data for name, data in events if name == 'audio']
+    assert [a['index'] for a in audio] == list(range(len(audio)))
+    assert len(audio) == events[-1][1]['chunks'] == 4
+    assert events[-1][1]['response_text'] == ANSWER
+
+
+def test_tts_overlaps_generation():
+    tts = StandInTTS()
+    chatbot = make_chatbot(tts)
+    start = time.perf_counter()
+    events = chatbot.process_voice_query_stream(b'fake-audio')
+
+    first_audio = None
+    for name, data in events:
+        if name == 'audio' and first_audio is None:
+            first_audio = time.perf_counter() - start
+    total = time.perf_counter() - start
+
+    # The first sentence is synthesized before the LLM finishes the answer
+    llm_seconds = len(ANSWER.split(' ')) * 0.02
+    assert tts.started[0][0] - start < llm_seconds
+    assert first_audio < total / 2
+    print(f"✅ First audio after {first_audio * 1000:.0f} ms of {total * 1000:.0f} ms total")
+
+
+def test_producer_error_becomes_error_event():
+    chatbot = make_chatbot()
+
+    def broken_faq(text, language_code):
+        raise RuntimeError("FAQ index unreadable")
+    chatbot.faq_answer = broken_faq
+
+    events = list(chatbot.process_voice_query_stream(b'fake-audio'))
+    assert [name for name, _ in events] == ['transcript', 'error']
+    assert 'FAQ index unreadable' in events[-1][1]['error']
+
+
+def test_disconnect_stops_llm_and_pending_tts():
+    tts = StandInTTS(delay=0.05)
+    chatbot = MultilingualChatbot(speech_client=StandInSpeech(), tts_client=tts,
+                                  llm_client=StandInLLM(token_delay=0.05), llm_model='stand-in')
+    events = chatbot.process_voice_query_stream(b'fake-audio', tts_workers=1)
+    for name, _ in events:
+        if name == 'audio':
+            break
+
+    start = time.perf_counter()
+    events.close()  # what the server does when the client goes away
+    assert time.perf_counter() - start < 0.1
+    # The whole answer would take about a second and four TTS calls
+    time.sleep(len(ANSWER.split(' ')) * 0.05)
+    assert len(tts.started) < 4
+
+
+def binary_voice_client(response_text, audio=b'ID3 mp3\r\n--bytes', tts_cache=None):
+    """Test client for app.py with process_voice_query stubbed; audio in the TTS cache if one is given"""
+    import app as backend
+    calls = []
+
+    def process_voice_query(audio_content, context, audio_as_key=False):
+        calls.append((audio_content, context))
+        result = {'success': True, 'user_text': "कपास कब बोएं?", 'language': 'hi-IN',
+                  'response_text': response_text}
+        if audio and audio_as_key:
+            result['audio_key'] = tts_cache.make_key(response_text, 'hi-IN', 'hi-IN-Wavenet-D', {})
+            tts_cache.put(result['audio_key'], audio)
+        elif audio:
+            result['audio_response'] = audio
+        else:
+            result['error'] = "TTS failed"
+        return result
+
+    originals = {'process_voice_query': backend.chatbot.process_voice_query, 'tts_cache': backend.chatbot.tts_cache}
+    vars(backend.chatbot).update(process_voice_query=process_voice_query, tts_cache=tts_cache)
+    return backend.app.test_client(), calls, lambda: vars(backend.chatbot).update(originals)
+
+
+def multipart_parts(response):
+    """[(content type, body)] of a multipart/mixed response"""
+    import json
+    boundary = response.mimetype_params['boundary'].encode()
+    assert response.data.endswith(b'--' + boundary + b'--\r\n')
+    assert int(response.headers['Content-Length']) == len(response.data)
+    parts = []
+    for part in response.data.split(b'--' + boundary)[1:-1]:
+        head, body = part[2:].split(b'\r\n\r\n', 1)
+        content_type = head.split(b'\r\n')[0].decode().split(': ')[1]
+        body = body[:-2]
+        parts.append((content_type, json.loads(body) if content_type.startswith('application/json') else body))
+    return parts
+
+
+def test_binary_voice_raw_and_multipart():
+    import io
+    client, calls, restore = binary_voice_client(ANSWER)
+    try:
+        raw = client.post('/chatbot/voice?state=Punjab&district=Ludhiana', data=b'\x1aE\xdf\xa3webm',
+                          content_type='audio/webm')
+        multipart = client.post('/chatbot/voice', content_type='multipart/form-data',
+                                data={'audio': (io.BytesIO(b'\x1aE\xdf\xa3webm'), 'query.webm'),
+                                      'state': 'Gujarat', 'top_crops': 'cotton,groundnut'})
+    finally:
+        restore()
+
+    for response in (raw, multipart):
+        assert response.status_code == 200 and response.mimetype == 'multipart/mixed'
+        assert response.headers['X-Language'] == 'hi-IN'
+        [(json_type, answer), (audio_type, audio)] = multipart_parts(response)
+        assert json_type.startswith('application/json') and audio_type == 'audio/mpeg'
+        assert answer['user_text'] == "कपास कब बोएं?" and answer['response_text'] == ANSWER
+        assert audio == b'ID3 mp3\r\n--bytes'
+    assert [audio for audio, _ in calls] == [b'\x1aE\xdf\xa3webm'] * 2
+    assert calls[0][1]['district'] == 'Ludhiana' and calls[1][1]['top_crops'] == ['cotton', 'groundnut']
+
+
+def test_binary_voice_returns_long_answers_whole():
+    import tempfile
+    from tts_cache import TTSCache
+    long_answer = ANSWER * 40  # far beyond what fits in a header once percent-encoded
+    with tempfile.TemporaryDirectory() as directory:
+        client, _, restore = binary_voice_client(long_answer, audio=b'\xff\xfb' * 50000,
+                                                 tts_cache=TTSCache(directory))
+        try:
+            response = client.post('/chatbot/voice', data=b'\x1aE\xdf\xa3webm', content_type='audio/webm')
+            parts = multipart_parts(response)  # streamed from the cache file
+        finally:
+            restore()
+
+    [(_, answer), (_, audio)] = parts
+    assert answer['response_text'] == long_answer
+    assert audio == b'\xff\xfb' * 50000
+
+
+def test_binary_voice_without_audio_is_json_only():
+    client, _, restore = binary_voice_client(ANSWER, audio=None)
+    try:
+        response = client.post('/chatbot/voice', data=b'\x1aE\xdf\xa3webm', content_type='audio/webm')
+    finally:
+        restore()
+
+    [(_, answer)] = multipart_parts(response)
+    assert answer['response_text'] == ANSWER and answer['tts_error'] == "TTS failed"
+
+
+def test_audio_evicted_after_lookup_is_a_404():
+    import os
+    import tempfile
+    import app as backend
+    from tts_cache import TTSCache
+    with tempfile.TemporaryDirectory() as directory:
+        cache = TTSCache(directory)
+        key = TTSCache.make_key(ANSWER, 'hi-IN', 'hi-IN-Wavenet-D', {})
+        cache.put(key, b'ID3 mp3 bytes')
+        lookup = cache.get_path
+
+        def get_path(key):
+            path = lookup(key)
+            os.remove(path)  # evicted by another worker before the file is opened
+            return path
+
+        original = backend.chatbot.tts_cache
+        cache.get_path = get_path
+        backend.chatbot.tts_cache = cache
+        try:
+            response = backend.app.test_client().get(f'/chatbot/audio/{key}')
+        finally:
+            backend.chatbot.tts_cache = original
+
+    assert response.status_code == 404 and response.get_json()['success'] is False
+
+
+def test_status_does_not_build_clients():
+    import app as backend
+    built = []
+    pool = backend.chatbot.clients
+    originals = {'factories': pool.factories, 'configured': pool.configured, 'clients': pool.clients}
+    vars(pool).update(factories={name: lambda name=name: built.append(name) for name in pool.factories},
+                      configured={'speech': lambda: True, 'tts': lambda: False}, clients={})
+    try:
+        response = backend.app.test_client().get('/chatbot/status')
+    finally:
+        vars(pool).update(originals)
+
+    assert response.status_code == 200 and built == []
+    services = response.get_json()['services']
+    assert services['speech_to_text'] is True and services['text_to_speech'] is False
+    assert set(response.get_json()['clients'].values()) == {'not_started'}
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"✅ {name}")
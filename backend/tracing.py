@@ -0,0 +1,162 @@
+"""
+Optional per-request tracing
+With TRACING_ENABLED=True every request gets a request id (X-Request-ID, taken
+from the client when given) and requests carrying the X-Debug-Timings header,
+or sampled at TRACE_SAMPLE_RATE, record a span for each /predict stage and
+outbound provider call (the metrics.stage/metrics.upstream timers report here).
+Traced responses get a Server-Timing header and, for JSON objects, a "timings"
+block; with TRACE_EXPORT_PATH set, spans are appended to that file in Chrome
+trace-event format (open it in Perfetto, chrome://tracing or speedscope).
+
+When disabled no request hooks are installed at all, and the timers only pay
+for one context variable lookup.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+DEBUG_HEADER = 'X-Debug-Timings'
+REQUEST_ID_HEADER = 'X-Request-ID'
+
+_trace = contextvars.ContextVar('trace', default=None)
+_request_id = contextvars.ContextVar('request_id', default=None)
+
+class Trace:
+    """Spans of one request; threads add to it through copied contexts"""
+
+    def __init__(self, request_id, name):
+        self.request_id = request_id
+        self.name = name
+        self.started = time.perf_counter()
+        self.wall_started = time.time()
+        self.spans = []  # list.append is atomic, so no lock for chatbot worker threads
+
+    def add(self, name, started, duration, outcome=None):
+        self.spans.append((name, started - self.started, duration, outcome, threading.get_ident()))
+
+    def timings(self):
+        """Response "timings" block: total, per-span list and per-name sums in ms"""
+        total = {}
+        for name, _, duration, _, _ in self.spans:
+            total[name] = total.get(name, 0.0) + duration
+        return {
+            'request_id': self.request_id,
+            'total_ms': round((time.perf_counter() - self.started) * 1000, 1),
+            'spans': [{'name': name, 'start_ms': round(start * 1000, 1), 'duration_ms': round(duration * 1000, 1),
+                       **({'outcome': outcome} if outcome else {})}
+                      for name, start, duration, outcome, _ in self.spans],
+            'by_name_ms': {name: round(seconds * 1000, 1) for name, seconds in total.items()}
+        }
+
+    def server_timing(self):
+        """Server-Timing header value, shown by browser dev tools"""
+        by_name = self.timings()['by_name_ms']
+        return ', '.join(f'{name.replace(":", "-")};dur={ms}' for name, ms in by_name.items())
+
+    def events(self):
+        """Chrome trace-event "complete" events, timestamps in microseconds"""
+        base = self.wall_started * 1e6
+        request = {'name': self.name, 'ph': 'X', 'ts': base, 'dur': (time.perf_counter() - self.started) * 1e6,
+                   'pid': os.getpid(), 'tid': 0, 'args': {'request_id': self.request_id}}
+        return [request] + [
+            {'name': name, 'ph': 'X', 'ts': base + start * 1e6, 'dur': duration * 1e6, 'pid': os.getpid(), 'tid': tid,
+             'args': {'request_id': self.request_id, **({'outcome': outcome} if outcome else {})}}
+            for name, start, duration, outcome, tid in self.spans
+        ]
+
+class TraceExporter:
+    """Appends trace events to a JSON array file (the closing bracket is optional in the format)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, 'w') as f:
+                f.write('[\n')
+
+    def export(self, trace):
+        lines = ''.join(json.dumps(event) + ',\n' for event in trace.events())
+        with self.lock, open(self.path, 'a') as f:
+            f.write(lines)
+
+def current():
+    """The active Trace, or None (the common, untraced case)"""
+    return _trace.get()
+
+def request_id():
+    return _request_id.get()
+
+def start(name, request_id=None):
+    """Begin tracing the current context; returns the Trace"""
+    trace = Trace(request_id or uuid.uuid4().hex[:16], name)
+    _trace.set(trace)
+    return trace
+
+class span:
+    """with tracing.span('faq_lookup'): ... records a span when a trace is active"""
+    __slots__ = ('name', 'trace', 'started')
+
+    def __init__(self, name):
+        self.name = name
+        self.trace = _trace.get()
+
+    def __enter__(self):
+        if self.trace is not None:
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.trace is not None:
+            self.trace.add(self.name, self.started, time.perf_counter() - self.started,
+                           'error' if exc is not None else None)
+        return False
+
+def init_app(app):
+    """Install the request hooks when TRACING_ENABLED=True"""
+    if os.getenv('TRACING_ENABLED', 'False').lower() != 'true':
+        return
+    from flask import request
+
+    sample_rate = float(os.getenv('TRACE_SAMPLE_RATE', '0'))
+    export_path = os.getenv('TRACE_EXPORT_PATH')
+    exporter = TraceExporter(export_path) if export_path else None
+    logger.info(f"Tracing enabled (sample rate {sample_rate}, export {export_path or 'off'})")
+
+    @app.before_request
+    def begin_trace():
+        rid = request.headers.get(REQUEST_ID_HEADER, '')[:64] or uuid.uuid4().hex[:16]
+        _request_id.set(rid)
+        if request.headers.get(DEBUG_HEADER) or (sample_rate and random.random() < sample_rate):
+            start(f'{request.method} {request.path}', rid)
+
+    @app.after_request
+    def finish_trace(response):
+        response.headers[REQUEST_ID_HEADER] = _request_id.get() or ''
+        trace = _trace.get()
+        if trace is None:
+            return response
+        if request.headers.get(DEBUG_HEADER):
+            response.headers['Server-Timing'] = trace.server_timing()
+            body = response.get_json(silent=True) if response.is_json and not response.is_streamed else None
+            if isinstance(body, dict):
+                body['timings'] = trace.timings()
+                response.set_data(json.dumps(body))
+        if exporter:
+            try:
+                exporter.export(trace)
+            except OSError as e:
+                logger.warning(f"Trace export failed: {e}")
+        return response
+
+    @app.teardown_request
+    def clear_trace(error=None):
+        _trace.set(None)  # server threads are reused across requests
@@ -0,0 +1,143 @@
+"""
+Content-addressed disk cache for synthesized speech
+Keys are a SHA-256 of the normalized text and every voice/audio setting,
+so a cached MP3 can be served for any identical request without calling TTS
+"""
+
+from collections import OrderedDict
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+class TTSCache:
+    """
+    MP3 bytes on disk, evicted least-recently-used beyond a byte budget
+    The directory is the source of truth: workers sharing it serve each
+    other's files, and each keeps its own LRU index of what it has seen
+    """
+
+    def __init__(self, directory='cache/tts', max_bytes=200 * 1024 * 1024):
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> size, least recently used first
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    @classmethod
+    def from_env(cls):
+        """Build the cache from TTS_CACHE_DIR / TTS_CACHE_MAX_MB (0 disables it)"""
+        max_mb = float(os.getenv('TTS_CACHE_MAX_MB', '200'))
+        if max_mb <= 0:
+            return None
+        return cls(os.getenv('TTS_CACHE_DIR', 'cache/tts'), int(max_mb * 1024 * 1024))
+
+    @staticmethod
+    def make_key(text, language_code, voice_name, audio_config):
+        """Hash of the normalized text and all settings that change the audio"""
+        normalized = ' '.join(unicodedata.normalize('NFC', text).split())
+        payload = json.dumps([normalized, language_code, voice_name, audio_config],
+                             sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.mp3")
+
+    def _load_index(self):
+        """Rebuild the LRU order from file access times left by earlier runs"""
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith('.mp3'):
+                    stat = os.stat(os.path.join(root, name))
+                    files.append((stat.st_atime, name[:-4], stat.st_size))
+
+        for _, key, size in sorted(files):
+            self.entries[key] = size
+            self.total_bytes += size
+        self._evict()
+
+    def get_path(self, key):
+        """Path of a cached MP3, or None on a miss"""
+        path = self._path(key)
+        with self.lock:
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                # Never stored, or removed by another worker sharing the directory
+                self.total_bytes -= self.entries.pop(key, 0)
+                self.misses += 1
+                return None
+            if key not in self.entries:
+                # Written by another worker since this index was built
+                self.entries[key] = size
+                self.total_bytes += size
+            self.entries.move_to_end(key)
+            self.hits += 1
+
+        try:
+            os.utime(path)  # keep recency across restarts
+        except OSError:
+            pass
+        return path
+
+    def open(self, key):
+        """Cached MP3 opened for reading, or None on a miss (also when evicted since the lookup)"""
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            return open(path, 'rb')
+        except OSError:
+            return None
+
+    def get(self, key):
+        """Cached MP3 bytes, or None on a miss"""
+        f = self.open(key)
+        if f is None:
+            return None
+        with f:
+            return f.read()
+
+    def put(self, key, audio):
+        """Store MP3 bytes atomically and evict old entries beyond the budget"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(audio)
+        os.replace(tmp_path, path)
+
+        with self.lock:
+            self.total_bytes += len(audio) - self.entries.pop(key, 0)
+            self.entries[key] = len(audio)
+            self._evict()
+        return path
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and self.entries:
+            key, size = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses
+        }
@@ -10,17 +10,15 @@ import time
 from typing import Dict, Any, Optional
 import json
 
+import metrics
+from src.utils.log_pipeline import route
+
 class APILogger:
     def __init__(self, log_file: str):
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler()
-            ]
-        )
-        self.logger = logging.getLogger(__name__)
+        # Named after its file (weather, soil, ...) and routed there by the shared queue pipeline
+        name = os.path.splitext(os.path.basename(log_file))[0]
+        route(name, log_file)
+        self.logger = logging.getLogger(name)
     
     def log_api_call(self, api_name: str, params: Dict, response_status: int):
         self.logger.info(f"API Call: {api_name} | Params: {params} | Status: {response_status}")
@@ -51,20 +49,21 @@ def retry_api_call(max_retries: int = 3, delay: float = 1.0):
 def validate_coordinates(lat: float, lon: float) -> bool:
     return -90 <= lat <= 90 and -180 <= lon <= 180
 
-def safe_api_request(url: str, params: Dict, timeout: int = 30) -> Optional[Dict]:
+def safe_api_request(url: str, params: Dict, timeout: int = 30, provider: str = "other") -> Optional[Dict]:
     try:
-        response = requests.get(url, params=params, timeout=timeout)
-        response.raise_for_status()
-        return response.json()
+        with metrics.upstream(provider):
+            response = requests.get(url, params=params, timeout=timeout)
+            response.raise_for_status()
+            return response.json()
     except requests.exceptions.RequestException as e:
-        logger = APILogger("logs/api_errors.log")
-        logger.log_error(f"API request failed: {url}", e)
+        api_error_logger.log_error(f"API request failed: {url}", e)
         return None
     except json.JSONDecodeError as e:
-        logger = APILogger("logs/api_errors.log")
-        logger.log_error(f"JSON decode error for: {url}", e)
+        api_error_logger.log_error(f"JSON decode error for: {url}", e)
         return None
 
+api_error_logger = APILogger("logs/api_errors.log")
+
 class DataCache:
     def __init__(self, timeout: int = 300):
         self.cache = {}
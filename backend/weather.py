@@ -1,5 +1,6 @@
 import requests
 from config import Config
+import metrics
 from utils import safe_api_request, retry_api_call, APILogger, cache
 from typing import Dict, Optional
 
@@ -14,6 +15,7 @@ class WeatherService:
     def get_current_weather(self, latitude: float, longitude: float) -> Optional[Dict]:
         cache_key = f"current_weather_{latitude}_{longitude}"
         cached_result = cache.get(cache_key)
+        metrics.record_cache("weather", "hit" if cached_result else "miss")
         if cached_result:
             return cached_result
         
@@ -26,7 +28,7 @@ class WeatherService:
         }
         
         try:
-            response = safe_api_request(url, params)
+            response = safe_api_request(url, params, provider="openweather")
             if response:
                 logger.log_api_call("current_weather", params, 200)
                 cache.set(cache_key, response)